@@ -2,8 +2,8 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Optional
 
 from dotenv import load_dotenv
 
@@ -15,7 +15,51 @@ class AppConfig:
     chat_model: str = "gpt-4o-mini"
     tts_model: str = "gpt-4o-mini-tts"
     moderation_model: str = "omni-moderation-latest"
+    moderation_enabled: bool = True
+    moderation_fail_open: bool = True  # 모더레이션 호출이 실패하면 통과시킴 (False면 차단)
+    moderation_cache_path: str = str(Path(__file__).resolve().parents[1] / ".cache" / "moderation.sqlite3")
+    moderation_cache_ttl_sec: float = 7 * 24 * 3600
+    moderation_cache_max_entries: int = 20000
     max_history_messages: int = 12
+    history_token_budget: int = 1500
+    summary_token_budget: int = 300
+    conversation_store_path: Optional[str] = None  # 지정하면 세션 대화 기록을 SQLite에 보관
+    conversation_max_sessions: int = 1000
+    conversation_ttl_sec: float = 7 * 24 * 3600
+    request_timeout_sec: float = 60.0
+    tts_concurrency: int = 3
+    tts_min_chunk_chars: int = 20
+    tts_cache_enabled: bool = True
+    tts_cache_dir: str = str(Path(__file__).resolve().parents[1] / ".cache" / "tts")
+    tts_cache_max_bytes: int = 200 * 1024 * 1024
+    tts_cache_max_chars: int = 300  # 이보다 긴 문장은 다시 나올 일이 드물어 저장하지 않음
+    tts_cache_warmup: bool = True  # 기동 시 고정 문장을 백그라운드에서 미리 합성
+    tts_warmup_phrases_path: Optional[str] = None  # 추가 워밍업 문장 파일 (한 줄에 한 문장)
+    stt_model: str = "gpt-4o-mini-transcribe"
+    stt_stream_partials: bool = True
+    stt_max_upload_bytes: int = 25 * 1024 * 1024
+    image_max_upload_bytes: int = 20 * 1024 * 1024
+    image_max_side: int = 1536  # 비전 모델에 보낼 긴 변 최대 픽셀
+    image_jpeg_quality: int = 85
+    image_store_max_bytes: int = 64 * 1024 * 1024
+    image_store_max_entries: int = 256
+    image_state_ttl_sec: float = 24 * 3600  # 공유 상태 저장소에 이미지를 보관하는 시간 (워커 여러 개일 때)
+    # 실행 모드: development(자동 리로드, 워커 1개) / production(워커 server_workers개, 리로드 없음)
+    server_mode: str = "development"
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 1
+    server_log_level: str = "info"
+    graceful_shutdown_sec: float = 30.0  # 종료 신호 후 진행 중인 스트림을 기다리는 최대 시간
+    # 세션/이미지/요청 제한을 담는 상태 저장소: memory / sqlite / auto(워커가 2개 이상이면 sqlite)
+    state_backend: str = "auto"
+    state_path: str = str(Path(__file__).resolve().parents[1] / ".cache" / "state.sqlite3")
+    rate_limit_per_minute: int = 0  # 세션(없으면 IP)당 분당 요청 수. 0이면 제한 없음
+    response_cache_enabled: bool = True
+    response_cache_path: str = str(Path(__file__).resolve().parents[1] / ".cache" / "responses.sqlite3")
+    response_cache_ttl_sec: float = 24 * 3600
+    response_cache_max_entries: int = 5000
+    response_cache_max_bytes: int = 50 * 1024 * 1024
 
 
 def load_config() -> AppConfig:
@@ -32,6 +76,33 @@ def load_config() -> AppConfig:
     api_key: Optional[str] = os.getenv("OPENAI_API_KEY")
 
     # 키가 없어도 앱은 기동되도록 하되, 실제 API 호출 시 오류가 발생할 수 있습니다.
-    return AppConfig(openai_api_key=api_key or "")
+    return AppConfig(openai_api_key=api_key or "", **_env_overrides())
+
+
+ENV_PREFIX = "AI_FRIENDS_"
+
+
+def _env_overrides() -> Dict[str, Any]:
+    """``AI_FRIENDS_<필드 이름>`` 환경변수로 기본값을 덮어씀 (예: ``AI_FRIENDS_SERVER_WORKERS=4``).
+
+    워커 프로세스도 같은 환경을 물려받으므로 모든 워커가 같은 설정으로 뜹니다.
+    """
+    overrides: Dict[str, Any] = {}
+    for f in fields(AppConfig):
+        raw = os.getenv(ENV_PREFIX + f.name.upper())
+        if raw is None or f.name == "openai_api_key":
+            continue
+        kind = str(f.type)
+        if kind == "bool":
+            overrides[f.name] = raw.strip().lower() in ("1", "true", "yes", "on")
+        elif kind == "int":
+            overrides[f.name] = int(raw)
+        elif kind == "float":
+            overrides[f.name] = float(raw)
+        elif kind.startswith("Optional"):
+            overrides[f.name] = raw or None
+        else:
+            overrides[f.name] = raw
+    return overrides
 
 
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .state import SQLiteStateStore, StateStore
+
+
+MESSAGE_OVERHEAD_TOKENS = 4
+# 예산을 넘으면 예산의 이 비율까지 한 번에 밀어냄: 요약(과 프롬프트 접두사)이 매 턴 바뀌지 않도록
+EVICT_TO_RATIO = 0.6
+
+SUMMARY_SYSTEM_PROMPT = (
+    "너는 대화 기록을 요약하는 도우미다. 이전 요약과 새로 밀려난 대화를 합쳐 "
+    "사용자의 상황, 감정, 고민, 선호, 이미 나눈 제안을 한국어 몇 문장으로 간결하게 정리한다. "
+    "새로운 조언은 덧붙이지 않는다."
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 쓰는 대략적인 토큰 수 (ASCII 4글자≈1, 한글 등 비 ASCII 1글자≈0.8)"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) * 0.8)
+
+
+def message_tokens(message: Dict[str, Any]) -> int:
+    content = message.get("content")
+    if isinstance(content, list):
+        text = " ".join(str(part.get("text", "")) for part in content if part.get("type") == "text")
+    else:
+        text = str(content or "")
+    return estimate_tokens(text) + MESSAGE_OVERHEAD_TOKENS
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    while text and estimate_tokens(text) > max_tokens:
+        text = text[: int(len(text) * 0.9)]
+    return text.rstrip() + "…"
+
+
+@dataclass
+class Conversation:
+    session_id: str
+    summary: str = ""
+    turns: List[Dict[str, str]] = field(default_factory=list)  # {"role", "content"} 텍스트만 보관
+    pending: List[Dict[str, str]] = field(default_factory=list)  # 밀려났지만 아직 요약에 합쳐지지 않은 턴
+    updated_at: float = 0.0
+
+    @property
+    def history_tokens(self) -> int:
+        return sum(message_tokens(m) for m in self.turns)
+
+
+class ConversationStore:
+    """세션별 대화 기록 (메모리 LRU + 선택적 ``StateStore`` 영속화).
+
+    - 기록은 ``max_messages`` 개, ``token_budget`` 토큰 이하로 유지
+    - 넘치면 오래된 (사용자, 답변) 쌍부터 밀어내 ``pending`` 에 모아 두고,
+      ``summarize()`` 가 이전 요약과 합쳐 ``summary_token_budget`` 이하의 요약으로 갱신
+    - ``state`` 를 주면 세션을 그 저장소에 기록 (``path`` 는 SQLite 저장소를 여는 지름길).
+      공유 저장소(``state.shared``)면 다른 워커가 고쳤을 수 있으므로 매번 저장소에서 다시 읽음
+    - 스레드 간 공유 가능 (비동기 경로에서는 ``asyncio.to_thread`` 로 호출)
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 1500,
+        max_messages: int = 12,
+        summary_token_budget: int = 300,
+        max_sessions: int = 1000,
+        ttl_sec: float = 7 * 24 * 3600,
+        path: Optional[str] = None,
+        state: Optional[StateStore] = None,
+    ) -> None:
+        self.token_budget = token_budget
+        self.max_messages = max_messages
+        self.summary_token_budget = summary_token_budget
+        self.max_sessions = max_sessions
+        self.ttl_sec = ttl_sec
+        self.summaries = 0
+        self._sessions: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._summary_locks: Dict[str, asyncio.Lock] = {}
+        self._summary_users: Dict[str, int] = {}  # 세션별로 잠금을 잡았거나 기다리는 요약 수
+        self._owns_state = state is None and bool(path)
+        self._state: Optional[StateStore] = SQLiteStateStore(path) if self._owns_state else state
+
+    # ---------- 조회/저장 ----------
+    def _load(self, session_id: str) -> Conversation:
+        now = time.time()
+        shared = self._state is not None and self._state.shared
+        conv = None if shared else self._sessions.get(session_id)
+        if conv is None and self._state is not None:
+            raw = self._state.get(f"conv:{session_id}")
+            if raw is not None:
+                data = json.loads(raw)
+                conv = Conversation(session_id, data["summary"], data["turns"], data["pending"], data["updated_at"])
+        if conv is None or now - conv.updated_at > self.ttl_sec:
+            conv = Conversation(session_id, updated_at=now)
+        self._sessions[session_id] = conv
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return conv
+
+    def _save(self, conv: Conversation) -> None:
+        conv.updated_at = time.time()
+        if self._state is None:
+            return
+        payload = {"summary": conv.summary, "turns": conv.turns, "pending": conv.pending, "updated_at": conv.updated_at}
+        self._state.set(
+            f"conv:{conv.session_id}", json.dumps(payload, ensure_ascii=False).encode("utf-8"), ttl_sec=self.ttl_sec
+        )
+
+    def get(self, session_id: str) -> Conversation:
+        """요약과 기록의 스냅샷 (호출 쪽에서 수정해도 저장소에 영향 없음)"""
+        with self._lock:
+            conv = self._load(session_id)
+            return Conversation(conv.session_id, conv.summary, list(conv.turns), list(conv.pending), conv.updated_at)
+
+    def append_turn(self, session_id: str, user_text: str, reply: str) -> bool:
+        """한 턴을 기록하고 예산을 넘으면 오래된 턴을 밀어냄. 요약할 턴이 생기면 True"""
+        with self._lock:
+            conv = self._load(session_id)
+            conv.turns.append({"role": "user", "content": user_text})
+            conv.turns.append({"role": "assistant", "content": reply})
+            if len(conv.turns) > self.max_messages or conv.history_tokens > self.token_budget:
+                max_messages = int(self.max_messages * EVICT_TO_RATIO)
+                budget = int(self.token_budget * EVICT_TO_RATIO)
+                while len(conv.turns) > 2 and (len(conv.turns) > max_messages or conv.history_tokens > budget):
+                    conv.pending.extend(conv.turns[:2])
+                    del conv.turns[:2]
+            self._save(conv)
+            return bool(conv.pending)
+
+    def reset(self, session_id: str) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            if self._state is not None:
+                self._state.delete(f"conv:{session_id}")
+
+    # ---------- 요약 ----------
+    async def summarize(self, session_id: str, client: Any) -> None:
+        """밀려난 턴을 이전 요약에 합침. 요약할 턴이 없으면 아무것도 하지 않음"""
+        with self._lock:
+            if not self._load(session_id).pending:
+                return
+        # 같은 세션의 요약은 한 번에 하나씩 (앞선 요약 결과 위에 이어서 합치도록)
+        # 기다리는 쪽이 남아 있는 동안 잠금을 지우면 새로 온 요약이 다른 잠금으로 동시에 돌 수 있어,
+        # 잡았거나 기다리는 수가 0이 될 때만 지움
+        lock = self._summary_locks.setdefault(session_id, asyncio.Lock())
+        self._summary_users[session_id] = self._summary_users.get(session_id, 0) + 1
+        try:
+            async with lock:
+                await self._summarize_pending(session_id, client)
+        finally:
+            self._summary_users[session_id] -= 1
+            if not self._summary_users[session_id]:
+                del self._summary_users[session_id]
+                self._summary_locks.pop(session_id, None)
+
+    async def _summarize_pending(self, session_id: str, client: Any) -> None:
+        with self._lock:
+            conv = self._load(session_id)
+            evicted, previous = list(conv.pending), conv.summary
+        if not evicted:
+            return
+        try:
+            summary = await client.chat(build_summary_messages(previous, evicted), temperature=0.3, use_cache=False)
+        except Exception:
+            summary = ""
+        summary = truncate_to_tokens(summary.strip() or fallback_summary(previous, evicted), self.summary_token_budget)
+        with self._lock:
+            conv = self._load(session_id)
+            conv.summary = summary
+            del conv.pending[: len(evicted)]
+            self.summaries += 1
+            self._save(conv)
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            sessions = list(self._sessions.values())
+        return {
+            "sessions": len(sessions),
+            "persistent": self._state is not None,
+            "shared": self._state is not None and self._state.shared,
+            "history_tokens": sum(c.history_tokens for c in sessions),
+            "summaries": self.summaries,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owns_state and self._state is not None:
+                self._state.close()
+            self._state = None
+
+
+def build_summary_messages(previous: str, evicted: List[Dict[str, str]]) -> List[Dict[str, Any]]:
+    speaker = {"user": "사용자", "assistant": "AI 친구"}
+    lines = [f"{speaker.get(m['role'], m['role'])}: {m['content']}" for m in evicted]
+    prompt = (f"이전 요약: {previous}\n\n" if previous else "") + "새로 밀려난 대화:\n" + "\n".join(lines)
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt},
+    ]
+
+
+def fallback_summary(previous: str, evicted: List[Dict[str, str]]) -> str:
+    """요약 모델 호출이 실패했을 때: 밀려난 사용자 발화의 앞부분을 이어 붙임"""
+    said = [m["content"][:60] for m in evicted if m["role"] == "user"]
+    return " ".join(filter(None, [previous, "사용자가 했던 말: " + " / ".join(said) if said else ""]))
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from .state import StateStore
+
+try:  # Pillow가 없으면 축소/재인코딩 없이 원본을 그대로 보관
+    from PIL import Image, ImageOps
+except ImportError:  # pragma: no cover - 선택 의존성
+    Image = None  # type: ignore[assignment]
+    ImageOps = None  # type: ignore[assignment]
+
+
+class ImageTooLarge(Exception):
+    pass
+
+
+class InvalidImage(Exception):
+    pass
+
+
+@dataclass
+class StoredImage:
+    image_id: str  # 업로드 원본의 sha256 (같은 사진을 다시 올리면 같은 ID)
+    data: bytes  # 축소/재인코딩된 바이트
+    content_type: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    original_bytes: int = 0
+    _data_url: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.data) + len(self._data_url or "")
+
+    def data_url(self) -> str:
+        """모델 요청에 넣을 data URL (처음 한 번만 base64 인코딩)"""
+        if self._data_url is None:
+            self._data_url = f"data:{self.content_type};base64," + base64.b64encode(self.data).decode("ascii")
+        return self._data_url
+
+
+def normalize_image(data: bytes, content_type: str, max_side: int, quality: int) -> StoredImage:
+    """비전 모델에 충분한 해상도(긴 변 ``max_side``)로 줄이고 JPEG로 재인코딩 (투명 이미지는 PNG)
+
+    Pillow가 없거나 이미 작고 가벼운 이미지면 원본을 그대로 씁니다.
+    """
+    image_id = hashlib.sha256(data).hexdigest()
+    if Image is None:
+        return StoredImage(image_id, data, content_type or "image/png", original_bytes=len(data))
+    try:
+        img = Image.open(io.BytesIO(data))
+        original_format, original_size = img.format, img.size
+        # JPEG는 디코딩 단계에서 1/2, 1/4, 1/8로 줄여 읽어 큰 사진도 빠르게 처리
+        ratio = max_side / max(img.size)
+        img.draft("RGB", (int(img.width * ratio), int(img.height * ratio)))
+        img = ImageOps.exif_transpose(img)
+        img.load()
+    except Exception as e:
+        raise InvalidImage("이미지를 읽을 수 없어요") from e
+    # 모델이 그대로 받을 수 있는 형식이고 충분히 작으면 원본 유지
+    keep_original = max(original_size) <= max_side and original_format in ("JPEG", "PNG", "WEBP")
+    if keep_original and len(data) <= 512 * 1024:
+        return StoredImage(image_id, data, Image.MIME[original_format], img.width, img.height, len(data))
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+    out = io.BytesIO()
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img.convert("RGBA").save(out, "PNG", optimize=True)
+        content_type = "image/png"
+    else:
+        img.convert("RGB").save(out, "JPEG", quality=quality, optimize=True)
+        content_type = "image/jpeg"
+    if keep_original and out.tell() >= len(data):
+        return StoredImage(image_id, data, Image.MIME[original_format], img.width, img.height, len(data))
+    return StoredImage(image_id, out.getvalue(), content_type, img.width, img.height, len(data))
+
+
+class ImageStore:
+    """업로드 이미지를 내용 주소(sha256)로 보관하는 메모리 저장소 (LRU 용량 제한).
+
+    - 업로드 때 한 번만 축소/재인코딩하고, 채팅 요청은 ID로 참조
+    - ``max_entries`` / ``max_bytes`` 를 넘으면 가장 오래 쓰이지 않은 이미지부터 제거
+    - ``state`` 를 주면 처리한 이미지를 그 저장소에도 ``state_ttl_sec`` 동안 보관해,
+      다른 워커가 받은 업로드도 ID로 찾을 수 있음 (내용 주소라 메모리 사본이 낡을 일은 없음)
+    - 스레드 간 공유 가능 (디코딩이 무거우므로 비동기 경로에서는 ``asyncio.to_thread`` 로 호출)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: int = 256,
+        max_side: int = 1536,
+        quality: int = 85,
+        max_upload_bytes: int = 20 * 1024 * 1024,
+        state: Optional[StateStore] = None,
+        state_ttl_sec: float = 24 * 3600,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_side = max_side
+        self.quality = quality
+        self.max_upload_bytes = max_upload_bytes
+        self.state = state
+        self.state_ttl_sec = state_ttl_sec
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._images: "OrderedDict[str, StoredImage]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def put(self, data: bytes, content_type: str = "") -> StoredImage:
+        if len(data) > self.max_upload_bytes:
+            raise ImageTooLarge(f"이미지가 너무 커요 (최대 {self.max_upload_bytes // (1024 * 1024)}MB)")
+        image_id = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            existing = self._images.get(image_id)
+            if existing is not None:
+                self._images.move_to_end(image_id)
+                return existing
+        image = self._load_shared(image_id)
+        if image is None:
+            image = normalize_image(data, content_type, self.max_side, self.quality)
+            self._save_shared(image)
+        return self._remember(image)
+
+    def get(self, image_id: str) -> Optional[StoredImage]:
+        with self._lock:
+            image = self._images.get(image_id)
+            if image is not None:
+                self._images.move_to_end(image_id)
+                self.hits += 1
+                return image
+        # 다른 워커가 받은 업로드일 수 있음
+        image = self._load_shared(image_id)
+        with self._lock:
+            if image is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return self._remember(image)
+
+    def _remember(self, image: StoredImage) -> StoredImage:
+        with self._lock:
+            existing = self._images.get(image.image_id)
+            if existing is not None:
+                return existing
+            self._images[image.image_id] = image
+            self._bytes += image.size
+            self._evict(keep=image.image_id)
+        return image
+
+    # 공유 저장소 형식: JSON 메타데이터 한 줄 + 이미지 바이트
+    def _save_shared(self, image: StoredImage) -> None:
+        if self.state is None:
+            return
+        meta = {
+            "content_type": image.content_type,
+            "width": image.width,
+            "height": image.height,
+            "original_bytes": image.original_bytes,
+        }
+        payload = json.dumps(meta).encode("utf-8") + b"\n" + image.data
+        self.state.set(f"img:{image.image_id}", payload, ttl_sec=self.state_ttl_sec)
+
+    def _load_shared(self, image_id: str) -> Optional[StoredImage]:
+        if self.state is None:
+            return None
+        raw = self.state.get(f"img:{image_id}")
+        if raw is None:
+            return None
+        head, data = raw.split(b"\n", 1)
+        meta = json.loads(head)
+        return StoredImage(image_id, data, meta["content_type"], meta["width"], meta["height"], meta["original_bytes"])
+
+    def data_url(self, image_id: str) -> Optional[str]:
+        image = self.get(image_id)
+        if image is None:
+            return None
+        before = image.size
+        url = image.data_url()
+        with self._lock:
+            if image_id in self._images:
+                self._bytes += image.size - before
+                self._evict(keep=image_id)
+        return url
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        while self._images and (len(self._images) > self.max_entries or self._bytes > self.max_bytes):
+            oldest = next(iter(self._images))
+            if oldest == keep:
+                if len(self._images) == 1:
+                    break
+                self._images.move_to_end(oldest)
+                continue
+            self._bytes -= self._images.pop(oldest).size
+            self.evictions += 1
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "images": len(self._images),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "pillow": Image is not None,
+                "shared": self.state is not None,
+            }
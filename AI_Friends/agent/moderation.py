@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, List, Optional, Tuple
+
+from .cache import ResponseCache, cache_key
+from .openai_client import AsyncOpenAIClient, read_cache, write_cache
+
+
+SELF_HARM_CATEGORIES = ("self-harm", "self-harm/intent", "self-harm/instructions")
+
+SELF_HARM_REPLY = (
+    "지금 많이 힘들구나. 이야기해 줘서 정말 고마워. 혼자 견디지 않아도 돼. "
+    "지금 바로 누군가와 이야기하고 싶다면 자살예방상담전화 109(24시간)나 정신건강위기상담 1577-0199에 전화해 줘. "
+    "위급한 상황이면 112나 119에 바로 연락해 줘. 나도 여기서 계속 네 이야기를 들을게."
+)
+BLOCKED_INPUT_REPLY = (
+    "그 이야기는 내가 도와주기 어려운 내용이야. "
+    "대신 지금 네 마음이 어떤지, 어떤 일이 있었는지 들려줄래?"
+)
+BLOCKED_OUTPUT_REPLY = "미안, 방금 답변에 적절하지 않은 내용이 섞여서 보여줄 수 없어. 다른 방식으로 다시 이야기해 볼까?"
+
+
+@dataclass
+class ModerationVerdict:
+    flagged: bool
+    categories: List[str] = field(default_factory=list)
+    cached: bool = False
+    error: Optional[str] = None  # 모더레이션 호출 실패 시 (fail-open이면 flagged=False)
+
+    @property
+    def self_harm(self) -> bool:
+        return any(c in SELF_HARM_CATEGORIES for c in self.categories)
+
+
+def safe_reply(verdict: ModerationVerdict) -> str:
+    """입력이 걸렸을 때 모델 답변 대신 보낼 문장 (자해 관련이면 상담 창구 안내)"""
+    return SELF_HARM_REPLY if verdict.self_harm else BLOCKED_INPUT_REPLY
+
+
+class Moderator:
+    """``check_policy`` 결과를 판정으로 정리하고, 같은 (정화된) 입력의 판정은 캐시에서 재사용.
+
+    모더레이션 호출이 실패하면 ``fail_open`` 이 True일 때 통과, False일 때 차단으로 봅니다.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenAIClient,
+        cache: Optional[ResponseCache] = None,
+        model: str = "omni-moderation-latest",
+        fail_open: bool = True,
+    ) -> None:
+        self.client = client
+        self.cache = cache
+        self.model = model
+        self.fail_open = fail_open
+
+    async def check(self, text: str) -> ModerationVerdict:
+        if not text.strip():
+            return ModerationVerdict(False)
+        key = cache_key(self.model, "moderation", 0.0, text)
+        if self.cache is not None:
+            cached = await asyncio.to_thread(read_cache, self.cache, key)
+            if cached is not None:
+                data = json.loads(cached)
+                return ModerationVerdict(data["flagged"], data["categories"], cached=True)
+        try:
+            result = await self.client.check_policy(text)
+        except Exception as e:
+            return ModerationVerdict(not self.fail_open, error=f"{type(e).__name__}: {e}"[:200])
+        verdict = _parse_result(result)
+        if self.cache is not None:
+            payload = json.dumps({"flagged": verdict.flagged, "categories": verdict.categories}, ensure_ascii=False)
+            await asyncio.to_thread(write_cache, self.cache, key, payload)
+        return verdict
+
+
+def _parse_result(result: Any) -> ModerationVerdict:
+    results = (result or {}).get("results") or [{}]
+    flagged = any(bool(r.get("flagged")) for r in results)
+    categories = sorted({name for r in results for name, hit in (r.get("categories") or {}).items() if hit})
+    return ModerationVerdict(flagged, categories)
+
+
+def _cancel(task: "asyncio.Future[Any]") -> None:
+    task.cancel()
+    # 취소 전에 끝났다면 결과/예외를 회수해 "never retrieved" 경고를 막음
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+
+async def moderated_chat(
+    moderator: Optional[Moderator],
+    user_text: str,
+    reply: Awaitable[str],
+) -> Tuple[str, Optional[str]]:
+    """입력 모더레이션과 답변 생성을 동시에 돌림. (답변, 차단 사유 "input"/"output"/None)
+
+    입력이 걸리면 생성 중인 답변을 취소하고 안전 문장으로 대체합니다.
+    답변이 나오면 출력도 검사해 걸리면 대체합니다.
+    """
+    if moderator is None:
+        return await reply, None
+    reply_task = asyncio.ensure_future(reply)
+    try:
+        verdict = await moderator.check(user_text)
+    except BaseException:
+        _cancel(reply_task)
+        raise
+    if verdict.flagged:
+        _cancel(reply_task)
+        return safe_reply(verdict), "input"
+    text = await reply_task
+    if (await moderator.check(text)).flagged:
+        return BLOCKED_OUTPUT_REPLY, "output"
+    return text, None
+
+
+_END = object()
+
+
+async def moderated_stream(
+    moderator: Optional[Moderator],
+    user_text: str,
+    deltas: AsyncIterator[str],
+) -> AsyncIterator[Tuple[str, str]]:
+    """답변 델타 스트림에 모더레이션을 겹침. ("delta", 텍스트) 반복 후 필요하면 한 번 더:
+
+    - ("blocked", 안전 문장): 입력이 걸림. 델타는 하나도 내보내지 않고 생성을 취소
+    - ("replace", 안전 문장): 완성된 답변이 출력 검사에 걸림. 이미 보낸 델타를 대체
+
+    입력 검사가 끝날 때까지 생성은 계속 진행하되 델타는 모아 두었다가, 통과하면 한꺼번에 내보냅니다.
+    """
+    if moderator is None:
+        async for delta in deltas:
+            yield "delta", delta
+        return
+    queue: "asyncio.Queue[Any]" = asyncio.Queue()
+
+    async def pump() -> None:
+        try:
+            async for delta in deltas:
+                queue.put_nowait(delta)
+        except Exception as e:  # 소비 쪽에서 다시 올림
+            queue.put_nowait(e)
+        queue.put_nowait(_END)
+
+    pump_task = asyncio.ensure_future(pump())
+    try:
+        verdict = await moderator.check(user_text)
+        if verdict.flagged:
+            _cancel(pump_task)
+            yield "blocked", safe_reply(verdict)
+            return
+        parts: List[str] = []
+        while True:
+            item = await queue.get()
+            if item is _END:
+                break
+            if isinstance(item, Exception):
+                raise item
+            parts.append(item)
+            yield "delta", item
+        if (await moderator.check("".join(parts))).flagged:
+            yield "replace", BLOCKED_OUTPUT_REPLY
+    finally:
+        if not pump_task.done():
+            _cancel(pump_task)
@@ -1,11 +1,49 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+import asyncio
 import io
+import logging
+import sqlite3
 
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from .config import load_config
+from .cache import ResponseCache, cache_key
+from .config import AppConfig, load_config
+
+logger = logging.getLogger(__name__)
+
+
+def _build_response_cache(cfg: AppConfig) -> Optional[ResponseCache]:
+    if not cfg.response_cache_enabled:
+        return None
+    try:
+        return ResponseCache(
+            cfg.response_cache_path,
+            ttl_sec=cfg.response_cache_ttl_sec,
+            max_entries=cfg.response_cache_max_entries,
+            max_bytes=cfg.response_cache_max_bytes,
+        )
+    except Exception:
+        # 캐시 파일을 만들 수 없으면 캐시 없이 동작
+        return None
+
+
+def read_cache(cache: ResponseCache, key: str) -> Optional[str]:
+    """캐시 조회. 파일이 잠겼거나 깨졌으면 요청을 실패시키지 않고 없는 것으로 봄"""
+    try:
+        return cache.get(key)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("응답 캐시 조회 실패: %s", e)
+        return None
+
+
+def write_cache(cache: ResponseCache, key: str, value: str) -> None:
+    """캐시 저장. 실패하면 저장만 건너뜀 (응답은 그대로 돌려줌)"""
+    try:
+        cache.put(key, value)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning("응답 캐시 저장 실패: %s", e)
 
 
 class OpenAIClient:
@@ -24,6 +62,7 @@ class OpenAIClient:
         self._tts_model = cfg.tts_model
         self._moderation_model = cfg.moderation_model
         self._tts_voice = cfg.tts_voice
+        self.response_cache = _build_response_cache(cfg)
 
     # ---------- Moderation ----------
     def check_policy(self, input_text: str) -> Dict[str, Any]:
@@ -34,14 +73,23 @@ class OpenAIClient:
         return result.model_dump()
 
     # ---------- Chat (text + optional image tool) ----------
-    def chat(self, messages: List[Dict[str, Any]], temperature: float = 0.8) -> str:
-        """일반 텍스트/이미지 혼합 메시지로 답변 텍스트를 생성"""
+    def chat(self, messages: List[Dict[str, Any]], temperature: float = 0.8, use_cache: bool = True) -> str:
+        """일반 텍스트/이미지 혼합 메시지로 답변 텍스트를 생성 (동일 요청은 응답 캐시 사용)"""
+        cache = self.response_cache if use_cache else None
+        key = cache_key(self._chat_model, "", temperature, messages) if cache else ""
+        if cache:
+            cached = read_cache(cache, key)
+            if cached is not None:
+                return cached
         response = self._client.chat.completions.create(
             model=self._chat_model,
             messages=messages,
             temperature=temperature,
         )
-        return response.choices[0].message.content or ""
+        reply = response.choices[0].message.content or ""
+        if cache and reply:
+            write_cache(cache, key, reply)
+        return reply
 
     # ---------- TTS ----------
     def tts_to_audio_bytes(self, text: str, voice: Optional[str] = None) -> bytes:
@@ -53,7 +101,7 @@ class OpenAIClient:
             model=model,
             voice=voice_name,
             input=text,
-            format="mp3",
+            response_format="mp3",
         )
         return resp.read()
 
@@ -70,3 +118,127 @@ class OpenAIClient:
         return getattr(transcript, "text", "").strip()
 
 
+class AsyncOpenAIClient:
+    """OpenAI 비동기 클라이언트 래퍼.
+
+    FastAPI 이벤트 루프를 막지 않도록 SDK의 AsyncOpenAI를 사용합니다.
+    프로세스당 하나의 인스턴스를 만들어 공유하면 내부 HTTP 커넥션 풀(keep-alive)이
+    모든 요청에서 재사용됩니다. 종료 시 ``aclose()``로 풀을 정리하세요.
+    """
+
+    def __init__(self) -> None:
+        cfg = load_config()
+        self._client = AsyncOpenAI(api_key=cfg.openai_api_key, timeout=cfg.request_timeout_sec)
+        self._chat_model = cfg.chat_model
+        self._tts_model = cfg.tts_model
+        self._moderation_model = cfg.moderation_model
+        self._tts_voice = cfg.tts_voice
+        self._stt_model = cfg.stt_model
+        self.response_cache = _build_response_cache(cfg)
+
+    @property
+    def tts_model(self) -> str:
+        return self._tts_model
+
+    @property
+    def tts_voice(self) -> str:
+        return self._tts_voice
+
+    async def aclose(self) -> None:
+        await self._client.close()
+        if self.response_cache is not None:
+            self.response_cache.close()
+
+    # ---------- Moderation ----------
+    async def check_policy(self, input_text: str) -> Dict[str, Any]:
+        result = await self._client.moderations.create(
+            model=self._moderation_model,
+            input=input_text,
+        )
+        return result.model_dump()
+
+    # ---------- Chat (text + optional image tool) ----------
+    async def chat(self, messages: List[Dict[str, Any]], temperature: float = 0.8, use_cache: bool = True) -> str:
+        """일반 텍스트/이미지 혼합 메시지로 답변 텍스트를 생성 (동일 요청은 응답 캐시 사용)"""
+        cache = self.response_cache if use_cache else None
+        key = cache_key(self._chat_model, "", temperature, messages) if cache else ""
+        if cache:
+            # SQLite 조회는 짧지만 이벤트 루프를 막지 않도록 스레드에서 실행
+            cached = await asyncio.to_thread(read_cache, cache, key)
+            if cached is not None:
+                return cached
+        response = await self._client.chat.completions.create(
+            model=self._chat_model,
+            messages=messages,
+            temperature=temperature,
+        )
+        reply = response.choices[0].message.content or ""
+        if cache and reply:
+            await asyncio.to_thread(write_cache, cache, key, reply)
+        return reply
+
+    async def chat_stream(self, messages: List[Dict[str, Any]], temperature: float = 0.8) -> AsyncIterator[str]:
+        """답변 텍스트를 생성되는 대로 델타 단위로 전달"""
+        stream = await self._client.chat.completions.create(
+            model=self._chat_model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+        )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    # ---------- TTS ----------
+    async def tts_to_audio_bytes(self, text: str, voice: Optional[str] = None) -> bytes:
+        """텍스트를 mp3 바이트로 변환"""
+        resp = await self._client.audio.speech.create(
+            model=self._tts_model,
+            voice=voice or self._tts_voice,
+            input=text,
+            response_format="mp3",
+        )
+        return await resp.aread()
+
+    async def tts_stream(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        chunk_size: int = 16 * 1024,
+    ) -> AsyncIterator[bytes]:
+        """텍스트를 mp3로 합성하면서 도착하는 청크를 그대로 전달 (전체 버퍼링 없음)"""
+        async with self._client.audio.speech.with_streaming_response.create(
+            model=self._tts_model,
+            voice=voice or self._tts_voice,
+            input=text,
+            response_format="mp3",
+        ) as resp:
+            async for chunk in resp.iter_bytes(chunk_size):
+                yield chunk
+
+    # ---------- STT ----------
+    async def transcribe_audio(self, audio_bytes: bytes, filename: str = "audio.webm") -> str:
+        """오디오 바이트를 텍스트로 전사"""
+        bio = io.BytesIO(audio_bytes)
+        bio.name = filename
+        transcript = await self._client.audio.transcriptions.create(
+            model=self._stt_model,
+            file=bio,
+        )
+        return getattr(transcript, "text", "").strip()
+
+    async def transcribe_audio_stream(self, audio_bytes: bytes, filename: str = "audio.webm") -> AsyncIterator[str]:
+        """전사 결과를 생성되는 대로 델타 단위로 전달 (gpt-4o-*-transcribe 계열만 지원)"""
+        bio = io.BytesIO(audio_bytes)
+        bio.name = filename
+        stream = await self._client.audio.transcriptions.create(
+            model=self._stt_model,
+            file=bio,
+            stream=True,
+        )
+        async for event in stream:
+            if getattr(event, "type", "") == "transcript.text.delta" and event.delta:
+                yield event.delta
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import re
-from typing import Tuple
+from typing import Sequence, Tuple
 
 
 POSITIVE_PREFIX = (
@@ -29,7 +29,17 @@ def safe_and_empathetic_system_prompt() -> str:
     )
 
 
-def build_chat_messages(user_text: str, image_url: str | None = None) -> list[dict]:
+def build_chat_messages(
+    user_text: str,
+    image_url: str | None = None,
+    history: Sequence[dict] = (),
+    summary: str = "",
+) -> list[dict]:
+    """[고정 시스템 프롬프트, (이전 대화 요약), 최근 기록..., 이번 사용자 메시지]
+
+    고정된 시스템 프롬프트를 항상 맨 앞에 두어 턴이 바뀌어도 프롬프트 접두사가 같게 유지합니다
+    (모델 쪽 프롬프트 캐시 재사용). 요약은 기록이 밀려날 때만 바뀝니다.
+    """
     system = safe_and_empathetic_system_prompt()
     content: list[dict] = [{"type": "text", "text": empathetic_prefix() + " " + user_text}]
     if image_url:
@@ -37,9 +47,14 @@ def build_chat_messages(user_text: str, image_url: str | None = None) -> list[di
             "type": "image_url",
             "image_url": {"url": image_url}
         })
-    return [
-        {"role": "system", "content": system},
-        {"role": "user", "content": content},
-    ]
+    messages: list[dict] = [{"role": "system", "content": system}]
+    if summary:
+        messages.append({"role": "system", "content": "지금까지의 대화 요약: " + summary})
+    messages.extend(history)
+    messages.append({"role": "user", "content": content})
+    return messages
 
 
+def history_text(user_text: str, image_url: str | None = None) -> str:
+    """대화 기록에 남길 사용자 발화 (이미지는 다시 보내지 않고 표시만 남김)"""
+    return user_text + (" (사진을 함께 보냄)" if image_url else "")
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+class StateStore:
+    """워커끼리 나눠 써야 하는 상태(세션, 업로드 이미지, 요청 제한)를 담는 키-값 저장소.
+
+    값은 바이트, ``ttl_sec`` 를 주면 그 시간이 지난 뒤 없는 것으로 봅니다.
+    ``shared`` 가 True면 다른 프로세스도 같은 값을 보므로, 쓰는 쪽은 메모리 사본을 믿지 말고 다시 읽어야 합니다.
+    """
+
+    backend = "base"
+    shared = False
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl_sec: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def add(self, key: str, value: bytes, ttl_sec: Optional[float] = None) -> bool:
+        """키가 없을 때만 저장. 저장했으면 True (워커 하나만 해야 하는 작업의 임대에 사용)"""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def incr(self, key: str, ttl_sec: Optional[float] = None) -> int:
+        """정수 카운터를 1 올리고 새 값을 돌려줌. 없으면 1부터 (``ttl_sec`` 은 처음 만들 때만 적용)"""
+        raise NotImplementedError
+
+    def info(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+class MemoryStateStore(StateStore):
+    """프로세스 안에서만 보이는 기본 저장소 (워커 1개일 때)"""
+
+    backend = "memory"
+    shared = False
+
+    def __init__(self) -> None:
+        self._items: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _live(self, key: str, now: float) -> Optional[bytes]:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item[1] is not None and item[1] <= now:
+            del self._items[key]
+            return None
+        return item[0]
+
+    def _store(self, key: str, value: bytes, ttl_sec: Optional[float], now: float) -> None:
+        self._items[key] = (value, now + ttl_sec if ttl_sec else None)
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            for k in [k for k, (_, exp) in self._items.items() if exp is not None and exp <= now]:
+                del self._items[k]
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(key, time.time())
+
+    def set(self, key: str, value: bytes, ttl_sec: Optional[float] = None) -> None:
+        with self._lock:
+            self._store(key, value, ttl_sec, time.time())
+
+    def add(self, key: str, value: bytes, ttl_sec: Optional[float] = None) -> bool:
+        now = time.time()
+        with self._lock:
+            if self._live(key, now) is not None:
+                return False
+            self._store(key, value, ttl_sec, now)
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._items.pop(key, None)
+
+    def incr(self, key: str, ttl_sec: Optional[float] = None) -> int:
+        now = time.time()
+        with self._lock:
+            current = self._live(key, now)
+            if current is None:
+                self._store(key, b"1", ttl_sec, now)
+                return 1
+            count = int(current) + 1
+            self._items[key] = (str(count).encode("ascii"), self._items[key][1])
+            return count
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "entries": len(self._items),
+                "bytes": sum(len(v) for v, _ in self._items.values()),
+            }
+
+
+class SQLiteStateStore(StateStore):
+    """같은 호스트의 여러 워커가 함께 쓰는 SQLite 저장소 (WAL, 쓰기는 짧은 트랜잭션).
+
+    - 만료된 항목은 읽을 때 없는 것으로 보고, 쓰기 1000번마다 한꺼번에 지움
+    - 스레드 간 공유 가능 (비동기 경로에서는 ``asyncio.to_thread`` 로 호출)
+    """
+
+    backend = "sqlite"
+    shared = True
+
+    def __init__(self, path: str, busy_timeout_sec: float = 5.0) -> None:
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(
+            self.path, timeout=busy_timeout_sec, check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS state ("
+            " key TEXT PRIMARY KEY,"
+            " value BLOB NOT NULL,"
+            " expires_at REAL)"
+        )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # 읽고-고치고-쓰기 사이에 다른 워커가 끼어들지 않도록 처음부터 쓰기 잠금
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self._writes += 1
+            if self._writes % 1000 == 0:
+                self._conn.execute("DELETE FROM state WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+
+    @staticmethod
+    def _live(conn: sqlite3.Connection, key: str, now: float) -> Optional[bytes]:
+        row = conn.execute(
+            "SELECT value FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, now)
+        ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._live(self._conn, key, time.time())
+
+    def set(self, key: str, value: bytes, ttl_sec: Optional[float] = None) -> None:
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl_sec if ttl_sec else None),
+            )
+
+    def add(self, key: str, value: bytes, ttl_sec: Optional[float] = None) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            if self._live(conn, key, now) is not None:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, now + ttl_sec if ttl_sec else None),
+            )
+            return True
+
+    def delete(self, key: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM state WHERE key = ?", (key,))
+
+    def incr(self, key: str, ttl_sec: Optional[float] = None) -> int:
+        now = time.time()
+        with self._transaction() as conn:
+            current = self._live(conn, key, now)
+            if current is None:
+                conn.execute(
+                    "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, b"1", now + ttl_sec if ttl_sec else None),
+                )
+                return 1
+            count = int(current) + 1
+            conn.execute("UPDATE state SET value = ? WHERE key = ?", (str(count).encode("ascii"), key))
+            return count
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM state"
+                " WHERE expires_at IS NULL OR expires_at > ?",
+                (time.time(),),
+            ).fetchone()
+        return {"backend": self.backend, "path": self.path, "entries": count, "bytes": total}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def open_state_store(backend: str, path: str, workers: int = 1) -> StateStore:
+    """``backend``: "memory", "sqlite", 또는 "auto" (워커가 2개 이상이면 sqlite)"""
+    if backend == "auto":
+        backend = "sqlite" if workers > 1 else "memory"
+    if backend == "memory":
+        return MemoryStateStore()
+    if backend == "sqlite":
+        return SQLiteStateStore(path)
+    raise ValueError(f"알 수 없는 상태 저장소: {backend!r} (memory, sqlite, auto 중 하나)")
+
+
+class RateLimiter:
+    """고정 창(``window_sec``) 안에서 키(세션/클라이언트)마다 ``limit`` 번까지 허용.
+
+    카운터를 ``StateStore`` 에 두므로 공유 저장소를 쓰면 모든 워커에 걸쳐 한도가 적용됩니다.
+    """
+
+    def __init__(self, state: StateStore, limit: int, window_sec: float = 60.0) -> None:
+        self.state = state
+        self.limit = limit
+        self.window_sec = window_sec
+        self.allowed = 0
+        self.limited = 0
+
+    def hit(self, key: str) -> Tuple[bool, float]:
+        """(허용 여부, 다음 창까지 남은 초)"""
+        now = time.time()
+        window = int(now // self.window_sec)
+        count = self.state.incr(f"rate:{key}:{window}", ttl_sec=self.window_sec * 2)
+        retry_after = (window + 1) * self.window_sec - now
+        if count > self.limit:
+            self.limited += 1
+            return False, retry_after
+        self.allowed += 1
+        return True, retry_after
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "window_sec": self.window_sec,
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
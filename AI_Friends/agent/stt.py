@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from typing import AsyncIterator, Tuple
+
+from .openai_client import AsyncOpenAIClient
+
+
+# 스트리밍 전사(부분 결과)를 지원하는 모델 접두사. whisper-1 은 완성본만 돌려줌
+STREAMING_STT_MODELS = ("gpt-4o-mini-transcribe", "gpt-4o-transcribe")
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class BoundedAudioBuffer:
+    """녹음 중 도착하는 MediaRecorder 청크를 모으는 버퍼 (최대 크기 제한).
+
+    한도를 넘는 청크가 오면 ``UploadTooLarge`` 를 올리고 더 받지 않습니다.
+    청크는 ``bytearray`` 하나에 이어 붙이므로 청크 수만큼 객체가 쌓이지 않습니다.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._buf = bytearray()
+        self.chunks = 0
+
+    def append(self, chunk: bytes) -> None:
+        if len(self._buf) + len(chunk) > self.max_bytes:
+            raise UploadTooLarge(f"녹음이 너무 길어요 (최대 {self.max_bytes // (1024 * 1024)}MB)")
+        self._buf += chunk
+        self.chunks += 1
+
+    def __len__(self) -> int:
+        return len(self._buf)
+
+    def getvalue(self) -> bytes:
+        return bytes(self._buf)
+
+    def clear(self) -> None:
+        self._buf = bytearray()
+        self.chunks = 0
+
+
+async def transcribe_with_partials(
+    client: AsyncOpenAIClient,
+    audio: bytes,
+    filename: str = "speech.webm",
+    model: str = "gpt-4o-mini-transcribe",
+    partials: bool = True,
+) -> AsyncIterator[Tuple[str, str]]:
+    """("partial", 누적 텍스트)를 도착하는 대로 내보내고 마지막에 ("final", 전체 텍스트)
+
+    모델이 스트리밍 전사를 지원하지 않거나 ``partials=False`` 이면 완성본 하나만 보냅니다.
+    """
+    if not partials or not model.startswith(STREAMING_STT_MODELS):
+        yield "final", await client.transcribe_audio(audio, filename=filename)
+        return
+    text = ""
+    try:
+        async for delta in client.transcribe_audio_stream(audio, filename=filename):
+            text += delta
+            yield "partial", text
+    except Exception:
+        # 스트리밍이 시작되기 전에 실패했다면(미지원 등) 일반 전사로 한 번 더 시도
+        if text:
+            raise
+        yield "final", await client.transcribe_audio(audio, filename=filename)
+        return
+    yield "final", text.strip()
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+from .moderation import BLOCKED_INPUT_REPLY, BLOCKED_OUTPUT_REPLY, SELF_HARM_REPLY
+from .openai_client import AsyncOpenAIClient
+from .tts_cache import TTSCache, tts_cache_key
+
+
+# job_tutor/core/cover_letter._split_sentences_kr 와 같은 규칙 (가변 길이 lookbehind 회피)
+_SENTENCE_BOUNDARY = re.compile(
+    r"(?<=\.)\s+|(?<=!)\s+|(?<=\?)\s+|(?<=요\.)\s+|(?<=다\.)\s+"
+)
+
+
+def split_sentences_kr(text: str, min_chars: int = 20) -> List[str]:
+    """TTS 요청 단위로 문장을 나눔. ``min_chars`` 보다 짧은 조각은 다음 문장과 합침"""
+    candidates = [s.strip() for s in _SENTENCE_BOUNDARY.split((text or "").strip()) if s.strip()]
+    chunks: List[str] = []
+    pending = ""
+    for sentence in candidates:
+        pending = f"{pending} {sentence}" if pending else sentence
+        if len(pending) >= min_chars:
+            chunks.append(pending)
+            pending = ""
+    if pending:
+        if chunks:
+            chunks[-1] = f"{chunks[-1]} {pending}"
+        else:
+            chunks.append(pending)
+    return chunks
+
+
+# 서버가 정해 두고 반복해서 말하는 문장 (기동 시 워밍업 대상)
+DEFAULT_WARMUP_PHRASES = (
+    "안녕! 오늘 하루는 어땠어?",
+    "응, 듣고 있어. 천천히 이야기해 줘.",
+    "미안, 잘 못 들었어. 한 번만 다시 말해 줄래?",
+    SELF_HARM_REPLY,
+    BLOCKED_INPUT_REPLY,
+    BLOCKED_OUTPUT_REPLY,
+)
+
+
+async def cached_tts_stream(
+    client: AsyncOpenAIClient,
+    cache: Optional[TTSCache],
+    text: str,
+    voice: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """``client.tts_stream`` 과 같지만, 캐시에 있으면 디스크에서 바로 보내고 없으면 합성하면서 저장"""
+    if cache is None or not cache.cacheable(text):
+        async for chunk in client.tts_stream(text, voice=voice):
+            yield chunk
+        return
+    key = tts_cache_key(client.tts_model, voice or client.tts_voice, text)
+    data = await asyncio.to_thread(cache.get, key)
+    if data is not None:
+        yield data
+        return
+    started = time.perf_counter()
+    parts: List[bytes] = []
+    async for chunk in client.tts_stream(text, voice=voice):
+        parts.append(chunk)
+        yield chunk
+    # 끝까지 받은 오디오만 저장 (중간에 끊기면 여기까지 오지 않음)
+    await asyncio.to_thread(cache.put, key, text, b"".join(parts), time.perf_counter() - started)
+
+
+async def warm_tts_cache(
+    client: AsyncOpenAIClient,
+    cache: TTSCache,
+    phrases: Iterable[str],
+    min_chars: int = 20,
+    concurrency: int = 3,
+    voice: Optional[str] = None,
+) -> Dict[str, int]:
+    """고정 문장을 ``stream_pipelined_tts`` 와 같은 단위로 나눠 미리 합성하고 고정(pinned)해 둠"""
+    chunks = list(dict.fromkeys(c for p in phrases for c in split_sentences_kr(p, min_chars=min_chars)))
+    counts = {"rendered": 0, "cached": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def render(chunk: str) -> None:
+        if not cache.cacheable(chunk):
+            return
+        key = tts_cache_key(client.tts_model, voice or client.tts_voice, chunk)
+        if await asyncio.to_thread(cache.pin, key):
+            counts["cached"] += 1
+            return
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                data = await client.tts_to_audio_bytes(chunk, voice=voice)
+            except Exception:
+                counts["failed"] += 1
+                return
+            await asyncio.to_thread(cache.put, key, chunk, data, time.perf_counter() - started, True)
+        counts["rendered"] += 1
+
+    await asyncio.gather(*(render(c) for c in chunks))
+    return counts
+
+
+_Item = Union[bytes, BaseException, None]
+
+
+async def stream_pipelined_tts(
+    client: AsyncOpenAIClient,
+    text: str,
+    concurrency: int = 3,
+    min_chars: int = 20,
+    voice: Optional[str] = None,
+    cache: Optional[TTSCache] = None,
+) -> AsyncIterator[bytes]:
+    """문장 단위로 TTS를 병렬 합성하고, 오디오는 문장 순서대로 흘려보냄.
+
+    최대 ``concurrency`` 개 문장만 동시에 합성하며(슬라이딩 윈도우), 앞 문장이
+    전송을 마치면 다음 문장 합성을 시작합니다. 첫 문장은 SDK 스트리밍 응답을
+    그대로 중계하므로 전체 합성을 기다리지 않고 재생이 시작됩니다.
+    ``cache`` 를 주면 캐시에 있는 문장은 저장된 오디오를, 나머지는 새로 합성한 오디오를 이어 붙입니다.
+    """
+    sentences = iter(split_sentences_kr(text, min_chars=min_chars))
+    window: Deque[Tuple[asyncio.Task, asyncio.Queue]] = deque()
+
+    async def produce(sentence: str, queue: "asyncio.Queue[_Item]") -> None:
+        try:
+            async for chunk in cached_tts_stream(client, cache, sentence, voice=voice):
+                await queue.put(chunk)
+        except Exception as e:
+            await queue.put(e)
+            return
+        await queue.put(None)
+
+    def launch_next() -> None:
+        sentence = next(sentences, None)
+        if sentence is None:
+            return
+        queue: "asyncio.Queue[_Item]" = asyncio.Queue()
+        window.append((asyncio.create_task(produce(sentence, queue)), queue))
+
+    for _ in range(max(1, concurrency)):
+        launch_next()
+
+    try:
+        while window:
+            _, queue = window[0]
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+            window.popleft()
+            launch_next()
+    finally:
+        # 클라이언트 연결이 끊기면 남은 합성 작업 취소
+        for task, _ in window:
+            task.cancel()
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+
+@dataclass
+class TTSCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    saved_sec: float = 0.0  # 적중한 항목을 처음 합성할 때 걸렸던 시간의 합
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+def normalize_tts_text(text: str) -> str:
+    # 공백/개행 차이만 있는 문장은 같은 오디오로 취급 (문장부호는 억양에 영향을 주므로 유지)
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+def tts_cache_key(model: str, voice: str, text: str) -> str:
+    payload = json.dumps([model, voice, normalize_tts_text(text)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """합성한 오디오를 (모델, 보이스, 정규화된 문장) 단위로 디스크에 보관하는 캐시.
+
+    - 오디오는 ``<directory>/<key>.mp3`` 파일, 메타데이터(크기/합성 시간/최근 사용)는 SQLite 인덱스
+    - 합계가 ``max_bytes`` 를 넘으면 가장 오래 쓰이지 않은 항목부터 제거 (워밍업 문장은 가장 나중에)
+    - ``max_chars`` 보다 긴 문장은 다시 나올 일이 드물어 저장하지 않음
+    - 스레드 간 공유 가능 (비동기 경로에서는 ``asyncio.to_thread`` 로 호출)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 200 * 1024 * 1024, max_chars: int = 300) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_chars = max_chars
+        self.stats = TTSCacheStats()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.directory / "index.sqlite3"), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS audio ("
+            " key TEXT PRIMARY KEY,"
+            " text TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " synth_sec REAL NOT NULL,"
+            " pinned INTEGER NOT NULL DEFAULT 0,"
+            " hits INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS audio_evict ON audio(pinned, accessed_at)")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.mp3"
+
+    def cacheable(self, text: str) -> bool:
+        return 0 < len(normalize_tts_text(text)) <= self.max_chars
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._conn.execute("SELECT synth_sec FROM audio WHERE key = ?", (key,)).fetchone()
+            data = None
+            if row is not None:
+                try:
+                    data = self._path(key).read_bytes()
+                except OSError:
+                    # 파일이 지워졌으면 인덱스도 정리
+                    self._conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+            if data is None:
+                self.stats.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE audio SET accessed_at = ?, hits = hits + 1 WHERE key = ?", (time.time(), key)
+            )
+            self.stats.hits += 1
+            self.stats.saved_sec += row[0]
+            return data
+
+    def pin(self, key: str) -> bool:
+        """이미 있는 항목을 워밍업 문장으로 표시 (없으면 False)"""
+        with self._lock:
+            cur = self._conn.execute("UPDATE audio SET pinned = 1 WHERE key = ?", (key,))
+        return cur.rowcount > 0 and self._path(key).exists()
+
+    def put(self, key: str, text: str, data: bytes, synth_sec: float, pinned: bool = False) -> None:
+        if not data or not self.cacheable(text):
+            return
+        # 임시 파일에 쓴 뒤 교체해 읽는 쪽이 반쯤 쓴 파일을 보지 않게 함
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self._path(key))
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO audio (key, text, size, synth_sec, pinned, created_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET size = excluded.size, synth_sec = excluded.synth_sec,"
+                " pinned = MAX(pinned, excluded.pinned), accessed_at = excluded.accessed_at",
+                (key, normalize_tts_text(text), len(data), synth_sec, int(pinned), now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM audio").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM audio ORDER BY pinned ASC, accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+            total -= size
+            self.stats.evictions += 1
+
+    def info(self) -> Dict[str, Any]:
+        with self._lock:
+            count, total, pinned = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(pinned), 0) FROM audio"
+            ).fetchone()
+        return {
+            "entries": count,
+            "pinned": pinned,
+            "bytes": total,
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "hit_rate": round(self.stats.hit_rate, 3),
+            "saved_synthesis_sec": round(self.stats.saved_sec, 2),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def load_phrases(path: Optional[str], builtin: Iterable[str] = ()) -> List[str]:
+    """워밍업 문장 목록: 기본 문장 + 파일(한 줄에 한 문장, ``#`` 주석) 순서, 중복 제거"""
+    phrases = list(builtin)
+    if path:
+        for line in Path(path).read_text(encoding="utf-8").splitlines():
+            line = line.strip()
+            if line and not line.startswith("#"):
+                phrases.append(line)
+    seen = set()
+    unique = []
+    for phrase in phrases:
+        normalized = normalize_tts_text(phrase)
+        if normalized and normalized not in seen:
+            seen.add(normalized)
+            unique.append(normalized)
+    return unique
+
+
+def main() -> None:
+    """미리 합성: ``python -m agent.tts_cache warmup [--phrases 파일]``"""
+    import argparse
+    import asyncio
+
+    from .config import load_config
+    from .openai_client import AsyncOpenAIClient
+    from .tts import DEFAULT_WARMUP_PHRASES, warm_tts_cache
+
+    parser = argparse.ArgumentParser(description="TTS 오디오 캐시 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warmup = sub.add_parser("warmup", help="고정 문장을 미리 합성해 캐시에 저장")
+    warmup.add_argument("--phrases", help="한 줄에 한 문장씩 적은 파일 (기본 문장에 추가)")
+    sub.add_parser("info", help="캐시 상태 출력")
+    args = parser.parse_args()
+
+    cfg = load_config()
+    cache = TTSCache(cfg.tts_cache_dir, max_bytes=cfg.tts_cache_max_bytes, max_chars=cfg.tts_cache_max_chars)
+    try:
+        if args.command == "warmup":
+            phrases = load_phrases(args.phrases or cfg.tts_warmup_phrases_path, DEFAULT_WARMUP_PHRASES)
+
+            async def run() -> Dict[str, int]:
+                client = AsyncOpenAIClient()
+                try:
+                    return await warm_tts_cache(
+                        client, cache, phrases, min_chars=cfg.tts_min_chunk_chars, concurrency=cfg.tts_concurrency
+                    )
+                finally:
+                    await client.aclose()
+
+            print(json.dumps(asyncio.run(run()), ensure_ascii=False))
+        print(json.dumps(cache.info(), ensure_ascii=False))
+    finally:
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,65 +1,467 @@
 from __future__ import annotations
 
-import base64
-import io
-from typing import Optional
+import asyncio
+import json
+import math
+import os
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator, Optional, Tuple
 
-from fastapi import FastAPI, File, Form, Request, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Request, Response, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from starlette.requests import HTTPConnection
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
-from agent.openai_client import OpenAIClient
-from agent.safety import build_chat_messages, sanitize_user_text
+from agent.cache import ResponseCache
+from agent.config import AppConfig, load_config
+from agent.conversation import ConversationStore
+from agent.images import ImageStore, ImageTooLarge, InvalidImage
+from agent.moderation import Moderator, moderated_chat, moderated_stream
+from agent.openai_client import AsyncOpenAIClient
+from agent.safety import build_chat_messages, history_text, sanitize_user_text
+from agent.state import RateLimiter, open_state_store
+from agent.stt import BoundedAudioBuffer, UploadTooLarge, transcribe_with_partials
+from agent.tts import DEFAULT_WARMUP_PHRASES, stream_pipelined_tts, warm_tts_cache
+from agent.tts_cache import TTSCache, load_phrases
 
 
-app = FastAPI(title="AI Friends - Empathetic Multimodal Friend")
+def _build_moderator(cfg: AppConfig, openai_client: AsyncOpenAIClient) -> Optional[Moderator]:
+    if not cfg.moderation_enabled:
+        return None
+    try:
+        cache: Optional[ResponseCache] = ResponseCache(
+            cfg.moderation_cache_path,
+            ttl_sec=cfg.moderation_cache_ttl_sec,
+            max_entries=cfg.moderation_cache_max_entries,
+        )
+    except Exception:
+        # 캐시 파일을 만들 수 없으면 캐시 없이 동작
+        cache = None
+    return Moderator(openai_client, cache, model=cfg.moderation_model, fail_open=cfg.moderation_fail_open)
+
+
+def _build_tts_cache(cfg: AppConfig) -> Optional[TTSCache]:
+    if not cfg.tts_cache_enabled:
+        return None
+    try:
+        return TTSCache(cfg.tts_cache_dir, max_bytes=cfg.tts_cache_max_bytes, max_chars=cfg.tts_cache_max_chars)
+    except Exception:
+        # 캐시 폴더를 만들 수 없으면 캐시 없이 동작
+        return None
+
+
+config = load_config()
+client = AsyncOpenAIClient()
+moderator = _build_moderator(config, client)
+tts_cache = _build_tts_cache(config)
+# 워커가 여러 개면 세션/이미지/요청 제한을 모든 워커가 보는 저장소에 둠 (응답/판정/TTS 캐시는 원래 파일 공유)
+state = open_state_store(
+    config.state_backend,
+    config.state_path,
+    workers=config.server_workers if config.server_mode == "production" else 1,
+)
+shared_state = state if state.shared else None
+conversations = ConversationStore(
+    token_budget=config.history_token_budget,
+    max_messages=config.max_history_messages,
+    summary_token_budget=config.summary_token_budget,
+    max_sessions=config.conversation_max_sessions,
+    ttl_sec=config.conversation_ttl_sec,
+    path=config.conversation_store_path,
+    state=shared_state,
+)
+images = ImageStore(
+    max_bytes=config.image_store_max_bytes,
+    max_entries=config.image_store_max_entries,
+    max_side=config.image_max_side,
+    quality=config.image_jpeg_quality,
+    max_upload_bytes=config.image_max_upload_bytes,
+    state=shared_state,
+    state_ttl_sec=config.image_state_ttl_sec,
+)
+limiter = RateLimiter(state, config.rate_limit_per_minute) if config.rate_limit_per_minute > 0 else None
+SESSION_COOKIE = "ai_friends_sid"
+TTS_WARMUP_LEASE = "lease:tts-warmup"
+_active_streams = 0
+
+
+async def _tracked(stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """진행 중인 스트리밍 응답 수를 세어, 종료할 때 다 끝날 때까지 기다릴 수 있게 함"""
+    global _active_streams
+    _active_streams += 1
+    try:
+        async for chunk in stream:
+            yield chunk
+    finally:
+        _active_streams -= 1
+
+
+async def _drain_streams(timeout_sec: float) -> None:
+    deadline = time.monotonic() + timeout_sec
+    while _active_streams and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+
+
+async def _warm_up_tts(phrases: list) -> None:
+    try:
+        await warm_tts_cache(
+            client, tts_cache, phrases, min_chars=config.tts_min_chunk_chars, concurrency=config.tts_concurrency
+        )
+    finally:
+        await asyncio.to_thread(state.delete, TTS_WARMUP_LEASE)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    warmup: Optional[asyncio.Task] = None
+    # 워커가 여러 개면 임대를 먼저 얻은 워커 하나만 워밍업
+    if tts_cache is not None and config.tts_cache_warmup and state.add(TTS_WARMUP_LEASE, b"1", ttl_sec=600):
+        # 기동을 막지 않도록 백그라운드에서 고정 문장을 미리 합성 (이미 있는 문장은 건너뜀)
+        phrases = load_phrases(config.tts_warmup_phrases_path, DEFAULT_WARMUP_PHRASES)
+        warmup = asyncio.create_task(_warm_up_tts(phrases))
+    yield
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+        # 임대 반납(finally)이 저장소를 닫기 전에 끝나도록 기다림
+        with suppress(asyncio.CancelledError, Exception):
+            await warmup
+    # 서버가 새 연결을 끊은 뒤에도 남은 스트림이 공유 클라이언트/저장소를 쓰는 동안은 닫지 않음
+    await _drain_streams(config.graceful_shutdown_sec)
+    # 공유 커넥션 풀 정리
+    await client.aclose()
+    if tts_cache is not None:
+        tts_cache.close()
+    conversations.close()
+    if moderator is not None and moderator.cache is not None:
+        moderator.cache.close()
+    state.close()
+
+
+app = FastAPI(title="AI Friends - Empathetic Multimodal Friend", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 templates = Jinja2Templates(directory="templates")
 
-client = OpenAIClient()
-
 
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request) -> HTMLResponse:
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+def _session_id(request: Request) -> Tuple[str, bool]:
+    """(세션 ID, 새로 만들었는지). 쿠키가 없거나 형식이 틀리면 새 ID 발급"""
+    sid = request.cookies.get(SESSION_COOKIE) or ""
+    if re.fullmatch(r"[0-9a-f]{32}", sid):
+        return sid, False
+    return uuid.uuid4().hex, True
+
+
+def _set_session_cookie(response: Response, session_id: str, is_new: bool) -> None:
+    if is_new:
+        response.set_cookie(
+            SESSION_COOKIE,
+            session_id,
+            max_age=int(config.conversation_ttl_sec),
+            httponly=True,
+            samesite="lax",
+        )
+
+
+def _client_key(conn: HTTPConnection) -> str:
+    """요청 제한 단위: 세션 쿠키가 있으면 세션, 없으면 클라이언트 IP"""
+    sid = conn.cookies.get(SESSION_COOKIE) or ""
+    if re.fullmatch(r"[0-9a-f]{32}", sid):
+        return f"sid:{sid}"
+    return f"ip:{conn.client.host if conn.client else 'unknown'}"
+
+
+async def _retry_after(conn: HTTPConnection) -> Optional[int]:
+    """요청 한도를 넘었으면 다시 시도할 수 있을 때까지 남은 초, 아니면 None"""
+    if limiter is None:
+        return None
+    allowed, retry_after = await asyncio.to_thread(limiter.hit, _client_key(conn))
+    return None if allowed else max(1, math.ceil(retry_after))
+
+
+async def _enforce_rate_limit(request: Request) -> None:
+    retry_after = await _retry_after(request)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="요청이 너무 많아. 잠시 후 다시 시도해줘.",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+async def _model_image_url(image_id: Optional[str], image_url: Optional[str]) -> Optional[str]:
+    """업로드한 이미지 ID를 모델 요청용 data URL로 바꿈 (ID가 없으면 image_url 그대로)"""
+    if not image_id:
+        return image_url
+    # 공유 저장소에서 읽고 base64로 인코딩하므로 이벤트 루프 밖에서 실행
+    url = await asyncio.to_thread(images.data_url, image_id)
+    if url is None:
+        raise HTTPException(status_code=404, detail="이미지를 찾을 수 없어. 다시 올려줘.")
+    return url
+
+
+async def _session_messages(session_id: str, user_text: str, image_url: Optional[str]) -> list:
+    conv = await asyncio.to_thread(conversations.get, session_id)
+    return build_chat_messages(user_text, image_url, history=conv.turns, summary=conv.summary)
+
+
 @app.post("/api/chat")
 async def api_chat(
+    request: Request,
     text: str = Form(""),
+    image_id: Optional[str] = Form(None),
     image_url: Optional[str] = Form(None),
 ) -> JSONResponse:
+    await _enforce_rate_limit(request)
+    session_id, is_new = _session_id(request)
     user_text = sanitize_user_text(text)
-    messages = build_chat_messages(user_text, image_url)
-    reply = client.chat(messages)
-    return JSONResponse({"reply": reply})
+    image_url = await _model_image_url(image_id, image_url)
+    messages = await _session_messages(session_id, user_text, image_url)
+    # 입력 모더레이션과 답변 생성을 동시에: 입력이 걸리면 생성을 취소하고 안전 문장으로 대체
+    reply, blocked = await moderated_chat(moderator, user_text, client.chat(messages))
+    await asyncio.to_thread(conversations.append_turn, session_id, history_text(user_text, image_url), reply)
+    # 밀려난 턴 요약은 응답을 보낸 뒤에
+    response = JSONResponse(
+        {"reply": reply, "moderated": blocked},
+        background=BackgroundTask(conversations.summarize, session_id, client),
+    )
+    _set_session_cookie(response, session_id, is_new)
+    return response
+
+
+def _sse(event: str, payload: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+@app.post("/api/chat/stream")
+async def api_chat_stream(
+    request: Request,
+    text: str = Form(""),
+    image_id: Optional[str] = Form(None),
+    image_url: Optional[str] = Form(None),
+) -> StreamingResponse:
+    """/api/chat 과 같은 입력을 받아 답변 델타를 SSE(text/event-stream)로 전달"""
+    await _enforce_rate_limit(request)
+    session_id, is_new = _session_id(request)
+    user_text = sanitize_user_text(text)
+    image_url = await _model_image_url(image_id, image_url)
+    messages = await _session_messages(session_id, user_text, image_url)
+
+    async def events() -> AsyncIterator[bytes]:
+        parts = []
+        try:
+            async for kind, delta in moderated_stream(moderator, user_text, client.chat_stream(messages)):
+                if kind == "delta":
+                    parts.append(delta)
+                    yield _sse("delta", {"text": delta})
+                else:
+                    # 입력(blocked) 또는 완성된 답변(replace)이 모더레이션에 걸림: 말풍선 내용을 대체
+                    parts = [delta]
+                    yield _sse("replace", {"text": delta, "reason": "input" if kind == "blocked" else "output"})
+        except Exception:
+            yield _sse("error", {"message": "답변 생성 중 오류가 발생했어. 잠시 후 다시 시도해줘."})
+            return
+        # 끝까지 받은 답변만 기록에 남김
+        await asyncio.to_thread(conversations.append_turn, session_id, history_text(user_text, image_url), "".join(parts))
+        yield _sse("done", {})
+
+    response = StreamingResponse(
+        _tracked(events()),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(conversations.summarize, session_id, client),
+    )
+    _set_session_cookie(response, session_id, is_new)
+    return response
+
+
+@app.post("/api/chat/reset")
+async def api_chat_reset(request: Request) -> JSONResponse:
+    """현재 세션의 대화 기록과 요약을 지움"""
+    session_id, _ = _session_id(request)
+    await asyncio.to_thread(conversations.reset, session_id)
+    return JSONResponse({"ok": True})
 
 
 @app.post("/api/voice")
 async def api_voice(
+    request: Request,
     text: str = Form("")
 ):
+    await _enforce_rate_limit(request)
     user_text = sanitize_user_text(text)
-    audio_bytes = client.tts_to_audio_bytes(user_text)
-    return StreamingResponse(io.BytesIO(audio_bytes), media_type="audio/mpeg")
+    if tts_cache is None:
+        return StreamingResponse(_tracked(client.tts_stream(user_text)), media_type="audio/mpeg")
+    # 캐시에 있는 문장은 저장된 오디오로, 나머지만 새로 합성해 이어 붙임
+    audio = stream_pipelined_tts(
+        client,
+        user_text,
+        concurrency=config.tts_concurrency,
+        min_chars=config.tts_min_chunk_chars,
+        cache=tts_cache,
+    )
+    return StreamingResponse(_tracked(audio), media_type="audio/mpeg")
+
 
+@app.post("/api/voice/stream")
+async def api_voice_stream(
+    request: Request,
+    text: str = Form("")
+) -> StreamingResponse:
+    """문장 단위 병렬 합성: 첫 문장 오디오부터 순서대로 흘려보냄"""
+    await _enforce_rate_limit(request)
+    user_text = sanitize_user_text(text)
+    audio = stream_pipelined_tts(
+        client,
+        user_text,
+        concurrency=config.tts_concurrency,
+        min_chars=config.tts_min_chunk_chars,
+        cache=tts_cache,
+    )
+    return StreamingResponse(_tracked(audio), media_type="audio/mpeg")
 
-# 간단한 이미지 업로드를 위한 엔드포인트 (선택적): 프론트에서 Data URL로 사용 가능
+
+# 이미지는 업로드 때 한 번만 받아 축소/재인코딩하고, 채팅에서는 image_id로 참조
 @app.post("/api/upload-image")
-async def upload_image(file: UploadFile = File(...)) -> JSONResponse:
-    content = await file.read()
-    data_url = "data:" + (file.content_type or "image/png") + ";base64," + base64.b64encode(content).decode("utf-8")
-    return JSONResponse({"image_url": data_url})
+async def upload_image(request: Request, file: UploadFile = File(...)) -> JSONResponse:
+    await _enforce_rate_limit(request)
+    content = await file.read(config.image_max_upload_bytes + 1)
+    try:
+        image = await asyncio.to_thread(images.put, content, file.content_type or "")
+    except ImageTooLarge as e:
+        return JSONResponse({"error": str(e)}, status_code=413)
+    except InvalidImage as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    return JSONResponse({
+        "image_id": image.image_id,
+        "image_url": f"/api/images/{image.image_id}",
+        "width": image.width,
+        "height": image.height,
+        "bytes": len(image.data),
+        "original_bytes": image.original_bytes,
+    })
+
+
+@app.get("/api/images/{image_id}")
+async def get_image(image_id: str) -> Response:
+    image = await asyncio.to_thread(images.get, image_id)
+    if image is None:
+        return JSONResponse({"error": "not found"}, status_code=404)
+    # 내용 주소라 같은 ID의 내용은 바뀌지 않음
+    return Response(
+        image.data,
+        media_type=image.content_type,
+        headers={"Cache-Control": "public, max-age=31536000, immutable", "ETag": f'"{image_id}"'},
+    )
 
 
 @app.post("/api/transcribe")
-async def api_transcribe(file: UploadFile = File(...)) -> JSONResponse:
-    content = await file.read()
-    text = client.transcribe_audio(content, filename=file.filename or "audio.webm")
+async def api_transcribe(request: Request, file: UploadFile = File(...)) -> JSONResponse:
+    await _enforce_rate_limit(request)
+    content = await file.read(config.stt_max_upload_bytes + 1)
+    if len(content) > config.stt_max_upload_bytes:
+        return JSONResponse({"error": "녹음이 너무 길어요."}, status_code=413)
+    text = await client.transcribe_audio(content, filename=file.filename or "audio.webm")
     return JSONResponse({"text": text})
 
 
+@app.websocket("/ws/transcribe")
+async def ws_transcribe(websocket: WebSocket) -> None:
+    """녹음 중에 MediaRecorder 청크를 미리 받아 두고, stop 메시지가 오면 바로 전사 시작
+
+    클라이언트 → 서버: 바이너리 오디오 청크 반복, 그 뒤 ``{"type": "stop"}``
+    서버 → 클라이언트: ``partial`` (모델이 지원할 때) 반복 후 ``final`` 또는 ``error``
+    """
+    if await _retry_after(websocket) is not None:
+        # 수락 전에 닫으면 클라이언트는 연결 실패로 보고 /api/transcribe 로 대신 보냄
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    buffer = BoundedAudioBuffer(config.stt_max_upload_bytes)
+    filename = "speech.webm"
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                return
+            if message.get("bytes") is not None:
+                buffer.append(message["bytes"])
+                continue
+            data = json.loads(message.get("text") or "{}")
+            if data.get("type") == "start":
+                filename = str(data.get("filename") or filename)
+                buffer.clear()
+            elif data.get("type") == "stop":
+                break
+        if not len(buffer):
+            await websocket.send_json({"type": "error", "message": "녹음된 소리가 없어요."})
+            await websocket.close()
+            return
+        started = time.perf_counter()
+        async for kind, text in transcribe_with_partials(
+            client,
+            buffer.getvalue(),
+            filename=filename,
+            model=config.stt_model,
+            partials=config.stt_stream_partials,
+        ):
+            payload = {"type": kind, "text": text}
+            if kind == "final":
+                payload.update(bytes=len(buffer), transcribe_ms=round((time.perf_counter() - started) * 1000))
+            await websocket.send_json(payload)
+    except WebSocketDisconnect:
+        return
+    except UploadTooLarge as e:
+        await websocket.send_json({"type": "error", "message": str(e)})
+    except Exception:
+        await websocket.send_json({"type": "error", "message": "전사 중 오류가 발생했어. 잠시 후 다시 시도해줘."})
+    await websocket.close()
+
+
+@app.get("/api/stats/cache")
+async def cache_stats() -> JSONResponse:
+    cache = client.response_cache
+    return JSONResponse(cache.info() if cache is not None else {"enabled": False})
+
+
+@app.get("/api/stats/tts-cache")
+async def tts_cache_stats() -> JSONResponse:
+    if tts_cache is None:
+        return JSONResponse({"enabled": False})
+    return JSONResponse(await asyncio.to_thread(tts_cache.info))
+
+
+@app.get("/api/stats/images")
+async def image_stats() -> JSONResponse:
+    return JSONResponse(await asyncio.to_thread(images.info))
+
+
+@app.get("/api/stats/conversations")
+async def conversation_stats() -> JSONResponse:
+    return JSONResponse(await asyncio.to_thread(conversations.info))
+
+
+@app.get("/api/stats/state")
+async def state_stats() -> JSONResponse:
+    info = await asyncio.to_thread(state.info)
+    info["rate_limit"] = limiter.info() if limiter is not None else None
+    return JSONResponse(info)
+
+
+@app.get("/healthz")
+async def healthz() -> JSONResponse:
+    """로드밸런서/벤치마크용. 응답한 워커와 진행 중인 스트림 수"""
+    return JSONResponse({"ok": True, "pid": os.getpid(), "active_streams": _active_streams, "state": state.backend})
+
+
 def create_app() -> FastAPI:
     return app
 
@@ -67,6 +469,19 @@ def create_app() -> FastAPI:
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
+    if config.server_mode == "production":
+        # 워커마다 이 모듈을 다시 불러오며, 설정은 같은 환경변수(AI_FRIENDS_*)에서 읽음.
+        # 종료 신호를 받으면 새 연결을 받지 않고 진행 중인 요청/스트림을 graceful_shutdown_sec 까지 기다림
+        uvicorn.run(
+            "app:app",
+            host=config.server_host,
+            port=config.server_port,
+            workers=config.server_workers,
+            timeout_graceful_shutdown=config.graceful_shutdown_sec,
+            proxy_headers=True,
+            log_level=config.server_log_level,
+        )
+    else:
+        uvicorn.run("app:app", host=config.server_host, port=config.server_port, reload=True)
 
 
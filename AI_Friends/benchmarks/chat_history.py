@@ -0,0 +1,128 @@
+"""100턴 대화에서 턴별 프롬프트 토큰과 지연 비교.
+
+- 단발 (변경 전): 시스템 프롬프트 + 이번 메시지만 전송 (맥락 없음)
+- 전체 누적: 지난 대화를 모두 붙여 보냄 (예산 없음)
+- 예산 + 요약: ``ConversationStore`` 로 최근 기록을 토큰 예산 안에 두고 밀려난 턴은 요약
+
+스텁 채팅은 ``--latency`` + 프롬프트 글자당 ``--prompt-char-delay`` 가 걸립니다.
+"캐시 밖 토큰"은 직전 턴 프롬프트와 메시지 단위로 앞부분이 같은 부분(프롬프트 캐시 재사용 가능분)을 뺀
+턴당 평균 토큰입니다.
+요약 호출은 응답 뒤 백그라운드에서 돌므로 턴 지연에는 포함하지 않고 따로 셉니다.
+
+    python benchmarks/chat_history.py --turns 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from stub_openai import start_stub_server  # noqa: E402
+
+
+USER_LINES = [
+    "오늘 회사에서 발표가 있었는데 너무 떨려서 말을 더듬었어",
+    "팀장님이 괜찮다고 했지만 계속 신경 쓰여",
+    "요즘 잠들기 전에 자꾸 내일 걱정을 하게 돼",
+    "주말에 혼자 갈 만한 조용한 카페 추천해 줄래?",
+    "운동을 시작하고 싶은데 작심삼일이 될까 봐 겁나",
+    "친구랑 약속을 잡았다가 피곤해서 취소했어, 미안하네",
+    "저녁으로 뭘 먹을지 모르겠어, 따뜻한 게 당겨",
+    "부모님께 연락을 자주 못 드려서 마음이 무거워",
+]
+
+
+def _prefix_tokens(prev: List[dict], cur: List[dict], message_tokens) -> int:
+    shared = 0
+    for a, b in zip(prev, cur):
+        if a != b:
+            break
+        shared += message_tokens(b)
+    return shared
+
+
+async def _run(mode: str, turns: int) -> Dict[str, object]:
+    from agent.conversation import ConversationStore, message_tokens
+    from agent.openai_client import AsyncOpenAIClient
+    from agent.safety import build_chat_messages, history_text
+
+    client = AsyncOpenAIClient()
+    store: Optional[ConversationStore] = None
+    if mode == "전체 누적":
+        store = ConversationStore(token_budget=10 ** 9, max_messages=10 ** 9)
+    elif mode == "예산 + 요약":
+        store = ConversationStore()
+    tokens: List[int] = []
+    latencies: List[float] = []
+    uncached: List[int] = []
+    summary_sec = 0.0
+    prev: List[dict] = []
+    try:
+        for i in range(turns):
+            user_text = f"{USER_LINES[i % len(USER_LINES)]} ({i + 1}번째)"
+            if store is None:
+                messages = build_chat_messages(user_text)
+            else:
+                conv = store.get("bench")
+                messages = build_chat_messages(user_text, history=conv.turns, summary=conv.summary)
+            prompt_tokens = sum(message_tokens(m) for m in messages)
+            tokens.append(prompt_tokens)
+            uncached.append(prompt_tokens - _prefix_tokens(prev, messages, message_tokens))
+            prev = messages
+            start = time.perf_counter()
+            reply = await client.chat(messages, use_cache=False)
+            latencies.append(time.perf_counter() - start)
+            if store is not None:
+                store.append_turn("bench", history_text(user_text), reply)
+                start = time.perf_counter()
+                await store.summarize("bench", client)
+                summary_sec += time.perf_counter() - start
+    finally:
+        await client.aclose()
+    return {
+        "tokens": tokens,
+        "latencies": latencies,
+        "uncached": statistics.mean(uncached),
+        "summaries": store.summaries if store is not None else 0,
+        "summary_sec": summary_sec,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="대화 기록 예산 벤치마크")
+    parser.add_argument("--turns", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 기본 지연(초)")
+    parser.add_argument("--prompt-char-delay", type=float, default=0.00005, help="프롬프트 글자당 스텁 지연(초)")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(latency_sec=args.latency, prompt_char_delay_sec=args.prompt_char_delay)
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = stub_url
+    try:
+        marks = [m for m in (1, 10, 50, 100) if m <= args.turns]
+        header = " | ".join(f"{m}턴" for m in marks)
+        print(f"{'방식':<10} 프롬프트 토큰 ({header}) | 합계 | 평균 지연 | 마지막 10턴 지연 | 캐시 밖 토큰 | 요약 호출")
+        for mode in ("단발", "전체 누적", "예산 + 요약"):
+            r = asyncio.run(_run(mode, args.turns))
+            tokens, latencies = r["tokens"], r["latencies"]
+            at = " | ".join(f"{tokens[m - 1]:5d}" for m in marks)
+            print(
+                f"{mode:<10} {at} | {sum(tokens):7d} | {statistics.mean(latencies) * 1000:6.0f} ms"
+                f" | {statistics.mean(latencies[-10:]) * 1000:6.0f} ms | {r['uncached']:5.0f}"
+                f" | {r['summaries']}회 ({r['summary_sec']:.1f}s)"
+            )
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
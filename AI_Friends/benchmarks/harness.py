@@ -0,0 +1,95 @@
+"""벤치마크 공용 도우미: 스텁 서버에 연결된 앱을 uvicorn 서브프로세스로 실행"""
+
+from __future__ import annotations
+
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+
+APP_DIR = str(Path(__file__).resolve().parents[1])
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url: str, timeout_sec: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout_sec
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except Exception:
+            time.sleep(0.2)
+    raise RuntimeError(f"서버가 준비되지 않았습니다: {url}")
+
+
+def launch_app(
+    stub_url: str,
+    app_dir: str,
+    env_dir: str,
+    extra_env: Optional[Dict[str, str]] = None,
+    workers: Optional[int] = None,
+) -> Tuple["subprocess.Popen[bytes]", str]:
+    """앱 서브프로세스를 띄우고 (프로세스, base URL)을 돌려줌.
+
+    ``workers`` 를 주면 ``python app.py`` 를 production 모드(워커 N개)로, 아니면 ``uvicorn app:app`` 을 실행합니다.
+    스텁 응답이 실제 캐시에 섞이거나 이전 실행의 캐시가 측정에 끼지 않도록 캐시와 상태 저장소는 ``env_dir`` 아래에 둡니다.
+    """
+    port = free_port()
+    env = dict(
+        os.environ,
+        OPENAI_API_KEY="sk-local-stub",
+        OPENAI_BASE_URL=stub_url,
+        AI_FRIENDS_TTS_CACHE_DIR=str(Path(env_dir) / "tts"),
+        AI_FRIENDS_STATE_PATH=str(Path(env_dir) / "state.sqlite3"),
+        AI_FRIENDS_RESPONSE_CACHE_PATH=str(Path(env_dir) / "responses.sqlite3"),
+        AI_FRIENDS_MODERATION_CACHE_PATH=str(Path(env_dir) / "moderation.sqlite3"),
+    )
+    if workers is None:
+        command = [sys.executable, "-m", "uvicorn", "app:app", "--port", str(port), "--log-level", "warning"]
+    else:
+        command = [sys.executable, "app.py"]
+        env.update(
+            AI_FRIENDS_SERVER_MODE="production",
+            AI_FRIENDS_SERVER_HOST="127.0.0.1",
+            AI_FRIENDS_SERVER_PORT=str(port),
+            AI_FRIENDS_SERVER_WORKERS=str(workers),
+            AI_FRIENDS_SERVER_LOG_LEVEL="warning",
+        )
+    env.update(extra_env or {})
+    server = subprocess.Popen(command, cwd=app_dir, env=env)
+    base_url = f"http://127.0.0.1:{port}"
+    try:
+        wait_ready(base_url + "/static/css/styles.css")
+    except Exception:
+        server.terminate()
+        raise
+    return server, base_url
+
+
+@contextmanager
+def running_app(
+    stub_url: str,
+    app_dir: str = APP_DIR,
+    extra_env: Optional[Dict[str, str]] = None,
+    workers: Optional[int] = None,
+) -> Iterator[str]:
+    """앱을 띄우고 base URL을 돌려줌. 블록을 벗어나면 종료"""
+    with tempfile.TemporaryDirectory() as env_dir:
+        server, base_url = launch_app(stub_url, app_dir, env_dir, extra_env, workers)
+        try:
+            yield base_url
+        finally:
+            server.terminate()
+            server.wait(timeout=30)
@@ -0,0 +1,158 @@
+"""사진 한 장 업로드 → 이미지와 함께 채팅까지 주고받는 바이트와 지연.
+
+5MB 안팎의 휴대폰 사진(4032x3024 JPEG, 작은 목표 크기는 해상도를 비례해서 줄임)을 만들어
+
+1. ``/api/upload-image`` 로 업로드
+2. 응답으로 받은 ``image_id`` (변경 전에는 base64 data URL ``image_url``)와 함께 ``/api/chat`` 전송
+
+을 수행하고 구간별 송수신 바이트, 모델(스텁)에 올라간 바이트, 지연을 출력합니다.
+``--baseline-ref`` 를 주면 그 커밋의 앱을 ``git archive`` 로 풀어 같은 방식으로 측정해 비교합니다.
+
+    python benchmarks/image_upload.py --baseline-ref <변경 전 커밋>
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import io
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageDraw
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import APP_DIR, running_app  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def make_photo(target_bytes: int) -> bytes:
+    """그라데이션 + 노이즈로 사진처럼 잘 압축되지 않는 JPEG를 목표 크기 근처로 생성"""
+    scale = min(1.0, (target_bytes / 5e6) ** 0.5)
+    size = (int(4032 * scale), int(3024 * scale))
+    noise = Image.effect_noise(size, 40)
+    base = Image.linear_gradient("L").resize(size)
+    img = Image.merge("RGB", (Image.blend(base, noise, 0.5), noise, base.rotate(90).resize(size)))
+    ImageDraw.Draw(img).ellipse((1000, 700, 3000, 2300), outline=(255, 255, 255), width=40)
+    best = b""
+    for quality in (95, 90, 85, 80, 75, 70, 60, 50):
+        out = io.BytesIO()
+        img.save(out, "JPEG", quality=quality)
+        best = out.getvalue()
+        if len(best) <= target_bytes:
+            break
+    return best
+
+
+def _multipart(fields: Dict[str, str], files: Dict[str, Tuple[str, bytes, str]]) -> Tuple[bytes, str]:
+    boundary = uuid.uuid4().hex
+    parts: List[bytes] = []
+    for name, value in fields.items():
+        parts.append(
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"\r\n\r\n{value}\r\n".encode("utf-8")
+        )
+    for name, (filename, data, content_type) in files.items():
+        head = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"{name}\"; filename=\"{filename}\"\r\n"
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        parts.append(head + data + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+def _post(base_url: str, path: str, body: bytes, content_type: str) -> Tuple[int, bytes, float]:
+    host, port = base_url.split("//", 1)[1].split(":")
+    conn = http.client.HTTPConnection(host, int(port), timeout=120)
+    start = time.perf_counter()
+    conn.request("POST", path, body=body, headers={"Content-Type": content_type})
+    resp = conn.getresponse()
+    data = resp.read()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return resp.status, data, elapsed
+
+
+def _measure(base_url: str, photo: bytes, stats) -> Dict[str, float]:
+    # JPEG 끝(EOI) 뒤에 매번 다른 바이트를 붙여 내용 주소 저장소의 중복 제거에 걸리지 않게 함
+    photo = photo + uuid.uuid4().bytes
+    body, ctype = _multipart({}, {"file": ("photo.jpg", photo, "image/jpeg")})
+    status, upload_resp, upload_sec = _post(base_url, "/api/upload-image", body, ctype)
+    if status != 200:
+        raise RuntimeError(f"/api/upload-image: HTTP {status} {upload_resp[:200]!r}")
+    uploaded = json.loads(upload_resp)
+    ref = {"image_id": uploaded["image_id"]} if "image_id" in uploaded else {"image_url": uploaded["image_url"]}
+    chat_body, chat_ctype = _multipart({"text": f"이 사진 어때? ({uuid.uuid4().hex[:8]})", **ref}, {})
+    before = stats.request_bytes
+    status, chat_resp, chat_sec = _post(base_url, "/api/chat", chat_body, chat_ctype)
+    if status != 200:
+        print(f"  /api/chat 실패: HTTP {status} {chat_resp[:120].decode('utf-8', 'replace')}")
+    return {
+        "chat_ok": float(status == 200),
+        "upload_sent": len(body),
+        "upload_received": len(upload_resp),
+        "chat_sent": len(chat_body),
+        "model_bytes": stats.request_bytes - before,
+        "upload_sec": upload_sec,
+        "chat_sec": chat_sec,
+    }
+
+
+def _report(name: str, samples: List[Dict[str, float]]) -> None:
+    m = {k: statistics.median(s[k] for s in samples) for k in samples[0]}
+    wire = m["upload_sent"] + m["upload_received"] + m["chat_sent"]
+    ok = f"채팅 성공 {sum(s['chat_ok'] for s in samples):.0f}/{len(samples)}"
+    print(
+        f"{name:<8} 업로드 {m['upload_sent'] / 1e6:5.2f} MB ↑ {m['upload_received'] / 1e6:5.2f} MB ↓ "
+        f"{m['upload_sec'] * 1000:5.0f} ms | 채팅 {m['chat_sent'] / 1e6:5.2f} MB ↑ {m['chat_sec'] * 1000:5.0f} ms | "
+        f"브라우저↔서버 {wire / 1e6:5.2f} MB | 서버→모델 {m['model_bytes'] / 1e6:5.2f} MB | "
+        f"합계 {(m['upload_sec'] + m['chat_sec']) * 1000:5.0f} ms | {ok}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="이미지 업로드 바이트/지연 벤치마크")
+    parser.add_argument("--photo-mb", type=float, nargs="+", default=[5.0, 0.5])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2, help="스텁 응답 지연(초)")
+    parser.add_argument("--baseline-ref", help="비교할 변경 전 커밋 (git archive로 풀어서 실행)")
+    args = parser.parse_args()
+
+    photos = [make_photo(int(mb * 1e6)) for mb in args.photo_mb]
+    stub, stub_url = start_stub_server(latency_sec=args.latency)
+    stats = stub.stats  # type: ignore[attr-defined]
+    try:
+        apps = []
+        tmp = None
+        if args.baseline_ref:
+            tmp = tempfile.TemporaryDirectory()
+            repo = subprocess.run(
+                ["git", "rev-parse", "--show-toplevel"], cwd=APP_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+            prefix = str(Path(APP_DIR).relative_to(repo))
+            archive = subprocess.run(["git", "archive", args.baseline_ref, prefix], cwd=repo, capture_output=True, check=True)
+            subprocess.run(["tar", "-x", "-C", tmp.name], input=archive.stdout, check=True)
+            apps.append(("변경 전", str(Path(tmp.name) / prefix)))
+        apps.append(("변경 후", APP_DIR))
+        for name, app_dir in apps:
+            with running_app(stub_url, app_dir=app_dir) as base_url:
+                for photo in photos:
+                    with Image.open(io.BytesIO(photo)) as img:
+                        print(f"사진 {img.width}x{img.height}, {len(photo) / 1e6:.2f} MB")
+                    _report(name, [_measure(base_url, photo, stats) for _ in range(args.runs)])
+        if tmp is not None:
+            tmp.cleanup()
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""/api/chat 동시성 부하 테스트.
+
+스텁 OpenAI 서버를 띄운 뒤 지정한 앱 디렉터리에서 uvicorn(워커 1개)을 실행하고,
+동시 클라이언트 N개로 요청을 보내 초당 처리량(RPS)과 지연을 측정합니다.
+비교하려면 변경 전 체크아웃(예: ``git worktree add /tmp/before <commit>``)의
+AI_Friends 디렉터리를 ``--app-dir`` 로 지정해 한 번 더 실행하세요.
+
+    python benchmarks/load_test.py --clients 50 --requests 10
+    python benchmarks/load_test.py --app-dir /tmp/before/AI_Friends
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import APP_DIR, running_app  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def _post_form(url: str, fields: dict) -> float:
+    data = urllib.parse.urlencode(fields).encode("utf-8")
+    start = time.perf_counter()
+    with urllib.request.urlopen(url, data=data, timeout=120) as resp:
+        resp.read()
+    return time.perf_counter() - start
+
+
+def run_load(base_url: str, path: str, clients: int, requests_per_client: int) -> List[float]:
+    url = base_url + path
+
+    def worker(client_id: int) -> List[float]:
+        # 요청마다 다른 문장을 보내 응답 캐시를 거치지 않고 모델 경로를 측정
+        return [
+            _post_form(url, {"text": f"오늘 좀 힘들었어 ({client_id}-{i})"})
+            for i in range(requests_per_client)
+        ]
+
+    latencies: List[float] = []
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        for chunk in pool.map(worker, range(clients)):
+            latencies.extend(chunk)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="AI_Friends 동시성 부하 테스트")
+    parser.add_argument("--app-dir", default=APP_DIR)
+    parser.add_argument("--path", default="/api/chat")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=10, help="클라이언트당 요청 수")
+    parser.add_argument("--latency", type=float, default=0.2, help="스텁 모델 지연(초)")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(latency_sec=args.latency)
+    try:
+        with running_app(stub_url, args.app_dir) as base_url:
+            start = time.perf_counter()
+            latencies = run_load(base_url, args.path, args.clients, args.requests)
+            elapsed = time.perf_counter() - start
+    finally:
+        stub.shutdown()
+
+    latencies.sort()
+    print(f"app-dir     : {args.app_dir}")
+    print(f"requests    : {len(latencies)} ({args.clients} clients, stub latency {args.latency:.2f}s)")
+    print(f"throughput  : {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency p50 : {statistics.median(latencies) * 1000:.0f} ms")
+    print(f"latency p95 : {latencies[int(len(latencies) * 0.95) - 1] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""모더레이션을 붙였을 때 채팅 지연이 얼마나 늘어나는지 비교.
+
+- 없음: 모더레이션 없이 ``chat`` / ``chat_stream``
+- 직렬: 입력 검사 → 답변 생성 → 출력 검사를 차례로 (단순하게 붙였을 때)
+- 병렬: ``moderated_chat`` / ``moderated_stream`` (입력 검사와 생성을 동시에, 출력 검사는 완성 후)
+- 병렬 + 캐시: 같은 입력/답변의 판정을 ``ResponseCache`` 에서 재사용
+
+스텁 채팅은 ``--latency`` 후 토큰당 ``--token-delay``, 모더레이션은 ``--moderation-latency`` 가 걸립니다.
+입력이 걸리는 경우(스텁의 ``[flag]``)에는 안전 문장이 나오기까지의 시간을 잽니다.
+
+    python benchmarks/moderation.py --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from stub_openai import start_stub_server  # noqa: E402
+
+
+async def _serial(moderator, client, messages, text: str) -> str:
+    if (await moderator.check(text)).flagged:
+        return "blocked"
+    reply = await client.chat(messages, use_cache=False)
+    await moderator.check(reply)
+    return reply
+
+
+async def _stream(events) -> Tuple[Optional[float], float]:
+    start = time.perf_counter()
+    first = None
+    async for _kind, _text in events:
+        if first is None:
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+async def _plain_stream(deltas):
+    async for delta in deltas:
+        yield "delta", delta
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    from agent.cache import ResponseCache
+    from agent.moderation import Moderator, moderated_chat, moderated_stream
+    from agent.openai_client import AsyncOpenAIClient
+    from agent.safety import build_chat_messages
+
+    client = AsyncOpenAIClient()
+    client.response_cache = None
+    uncached = Moderator(client)
+    cached = Moderator(client, ResponseCache(":memory:"))
+
+    def text_for(i: int, flagged: bool = False) -> str:
+        return f"오늘 좀 힘들었어 {'[flag] ' if flagged else ''}({uuid.uuid4().hex[:8] if i >= 0 else 'same'})"
+
+    async def timed(fn: Callable[[], Awaitable[object]]) -> float:
+        start = time.perf_counter()
+        await fn()
+        return time.perf_counter() - start
+
+    async def median_of(make: Callable[[int], Callable[[], Awaitable[object]]]) -> float:
+        return statistics.median([await timed(make(i)) for i in range(args.runs)]) * 1000
+
+    def chat_case(mode: str, flagged: bool = False) -> Callable[[int], Callable[[], Awaitable[object]]]:
+        def make(i: int) -> Callable[[], Awaitable[object]]:
+            text = text_for(-1 if mode == "cached" else i, flagged)
+            messages = build_chat_messages(text)
+            if mode == "none":
+                return lambda: client.chat(messages, use_cache=False)
+            if mode == "serial":
+                return lambda: _serial(uncached, client, messages, text)
+            moderator = cached if mode == "cached" else uncached
+            return lambda: moderated_chat(moderator, text, client.chat(messages, use_cache=False))
+        return make
+
+    # 캐시 모드는 같은 입력을 한 번 미리 보내 판정을 채워 둠
+    for flagged in (False, True):
+        warm = text_for(-1, flagged)
+        await moderated_chat(cached, warm, client.chat(build_chat_messages(warm), use_cache=False))
+
+    print(f"/api/chat (runs={args.runs}, 중앙값)")
+    base = await median_of(chat_case("none"))
+    for label, mode in (("없음", "none"), ("직렬", "serial"), ("병렬", "parallel"), ("병렬 + 캐시", "cached")):
+        value = base if mode == "none" else await median_of(chat_case(mode))
+        print(f"  {label:<10} {value:6.0f} ms  (+{value - base:4.0f} ms)")
+    print("  입력이 걸린 경우 (안전 문장까지)")
+    for label, mode in (("없음", "none"), ("직렬", "serial"), ("병렬", "parallel"), ("병렬 + 캐시", "cached")):
+        print(f"  {label:<10} {await median_of(chat_case(mode, flagged=True)):6.0f} ms")
+
+    print("/api/chat/stream (첫 델타 | 전체)")
+    for label, moderator in (("없음", None), ("병렬", uncached), ("병렬 + 캐시", cached)):
+        samples: List[Tuple[Optional[float], float]] = []
+        for i in range(args.runs):
+            text = text_for(-1 if moderator is cached else i)
+            deltas = client.chat_stream(build_chat_messages(text))
+            events = _plain_stream(deltas) if moderator is None else moderated_stream(moderator, text, deltas)
+            samples.append(await _stream(events))
+        first = statistics.median(s[0] or s[1] for s in samples) * 1000
+        total = statistics.median(s[1] for s in samples) * 1000
+        print(f"  {label:<10} 첫 델타 {first:6.0f} ms | 전체 {total:6.0f} ms")
+    await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="병렬 모더레이션 오버헤드 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3, help="채팅 첫 토큰까지 스텁 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="토큰당 스텁 지연(초)")
+    parser.add_argument("--moderation-latency", type=float, default=0.15, help="모더레이션 스텁 지연(초)")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(
+        latency_sec=args.latency,
+        token_delay_sec=args.token_delay,
+        moderation_latency_sec=args.moderation_latency,
+    )
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = stub_url
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
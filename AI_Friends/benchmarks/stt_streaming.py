@@ -0,0 +1,124 @@
+"""녹음 종료 → 전사 텍스트 도달 시간: /api/transcribe 업로드 대 /ws/transcribe 스트리밍.
+
+MediaRecorder처럼 ``--bitrate-kbps`` 로 인코딩된 오디오가 250ms마다 청크로 나온다고 보고,
+클라이언트 업링크를 ``--uplink-kbps`` 로 제한합니다.
+
+* 업로드 (변경 전): 녹음이 끝난 뒤 전체 blob을 multipart로 POST
+* WebSocket: 녹음 중 청크를 실시간으로 보내 두고 종료 시 stop 메시지만 전송
+
+스텁 전사는 ``--latency`` 후 단어당 ``--token-delay`` 가 걸립니다.
+
+    python benchmarks/stt_streaming.py --seconds 5 30 --uplink-kbps 256
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from websockets.sync.client import connect
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import running_app  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+
+CHUNK_SEC = 0.25
+
+
+def _throttled_sleep(size: int, uplink_kbps: float) -> None:
+    time.sleep(size * 8 / (uplink_kbps * 1000))
+
+
+def _upload_flow(base_url: str, audio: bytes, uplink_kbps: float) -> Tuple[Optional[float], float]:
+    """녹음 종료 시점부터 (첫 텍스트, 최종 텍스트) 도달 시간. 업로드는 부분 결과가 없음"""
+    host, port = base_url.split("//", 1)[1].split(":")
+    boundary = uuid.uuid4().hex
+    head = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"speech.webm\"\r\n"
+        "Content-Type: audio/webm\r\n\r\n"
+    ).encode("utf-8")
+    body = head + audio + f"\r\n--{boundary}--\r\n".encode("utf-8")
+    conn = http.client.HTTPConnection(host, int(port), timeout=120)
+    start = time.perf_counter()
+    conn.putrequest("POST", "/api/transcribe")
+    conn.putheader("Content-Type", f"multipart/form-data; boundary={boundary}")
+    conn.putheader("Content-Length", str(len(body)))
+    conn.endheaders()
+    for i in range(0, len(body), 4096):
+        piece = body[i:i + 4096]
+        _throttled_sleep(len(piece), uplink_kbps)
+        conn.send(piece)
+    text = json.loads(conn.getresponse().read()).get("text")
+    total = time.perf_counter() - start
+    conn.close()
+    assert text, "전사 결과가 비어 있습니다"
+    return None, total
+
+
+def _websocket_flow(base_url: str, chunks: List[bytes], uplink_kbps: float) -> Tuple[Optional[float], float]:
+    with connect(base_url.replace("http", "ws", 1) + "/ws/transcribe") as ws:
+        ws.send(json.dumps({"type": "start", "filename": "speech.webm"}))
+        # 녹음 중: 청크가 나오는 속도(250ms마다)로 전송
+        for chunk in chunks:
+            tick = time.perf_counter()
+            _throttled_sleep(len(chunk), uplink_kbps)
+            ws.send(chunk)
+            time.sleep(max(0.0, CHUNK_SEC - (time.perf_counter() - tick)))
+        start = time.perf_counter()
+        ws.send(json.dumps({"type": "stop"}))
+        first = None
+        while True:
+            msg = json.loads(ws.recv())
+            if msg["type"] == "partial" and first is None:
+                first = time.perf_counter() - start
+            elif msg["type"] == "final":
+                return first, time.perf_counter() - start
+            elif msg["type"] == "error":
+                raise RuntimeError(msg["message"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="STT 스트리밍 업로드 벤치마크")
+    parser.add_argument("--seconds", type=float, nargs="+", default=[5.0, 30.0], help="녹음 길이(초)")
+    parser.add_argument("--runs", type=int, default=2)
+    parser.add_argument("--bitrate-kbps", type=float, default=32.0, help="녹음 인코딩 비트레이트")
+    parser.add_argument("--uplink-kbps", type=float, default=256.0, help="클라이언트 업링크 대역폭")
+    parser.add_argument("--latency", type=float, default=0.3, help="전사 첫 응답까지 스텁 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="전사 단어당 스텁 지연(초)")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(latency_sec=args.latency, token_delay_sec=args.token_delay)
+    try:
+        with running_app(stub_url) as base_url:
+            print(f"uplink {args.uplink_kbps:.0f} kbps, audio {args.bitrate_kbps:.0f} kbps")
+            for seconds in args.seconds:
+                chunk_size = int(args.bitrate_kbps * 1000 / 8 * CHUNK_SEC)
+                chunks = [bytes([i % 251]) * chunk_size for i in range(int(seconds / CHUNK_SEC))]
+                audio = b"".join(chunks)
+                for name, run in (
+                    ("upload", lambda: _upload_flow(base_url, audio, args.uplink_kbps)),
+                    ("websocket", lambda: _websocket_flow(base_url, chunks, args.uplink_kbps)),
+                ):
+                    samples = [run() for _ in range(args.runs)]
+                    firsts = [s[0] for s in samples if s[0] is not None]
+                    first = f"{statistics.median(firsts) * 1000:6.0f} ms" if firsts else "     - "
+                    final = statistics.median(s[1] for s in samples) * 1000
+                    print(
+                        f"{seconds:4.0f}s ({len(audio) / 1024:5.0f} KiB) {name:<9} "
+                        f"first partial {first} | final {final:6.0f} ms"
+                    )
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""로컬 벤치마크용 OpenAI 호환 스텁 서버.
+
+실제 모델 대신 고정 지연(``--latency``) 후 응답을 돌려줍니다.
+채팅은 토큰당 지연(``--token-delay``)을 더해 생성 시간을 흉내 내며,
+프롬프트 글자당 지연(``--prompt-char-delay``)으로 긴 입력의 처리 시간도 반영합니다.
+``stream: true`` 요청에는 SSE 델타 청크로 응답합니다.
+전사도 단어당 ``--token-delay`` 가 걸리며, multipart ``stream=true`` 요청에는
+``transcript.text.delta`` 이벤트를 단어 단위로 흘려보냅니다.
+TTS는 입력 글자당 지연(``--char-delay``)에 비례해 오디오 청크를 흘려보냅니다.
+모더레이션은 ``--moderation-latency`` 후 응답하며, 입력에 ``FLAGGED_WORDS`` 가 있으면 self-harm으로 표시합니다.
+앱 쪽에서는 ``OPENAI_BASE_URL=http://127.0.0.1:<port>/v1`` 로 연결합니다.
+
+    python benchmarks/stub_openai.py --port 9100 --latency 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+
+REPLY_TEXT = (
+    "그랬구나, 오늘 많이 지쳤겠다. 하루 종일 긴장하고 있었으면 몸도 마음도 무거울 거야. "
+    "잠깐 쉬면서 따뜻한 차 한 잔 어때? 괜찮다면 오늘 제일 힘들었던 순간을 조금 더 들려줄래?"
+)
+
+
+FLAGGED_WORDS = ("죽고 싶", "[flag]")
+
+TRANSCRIPT_TEXT = "오늘 좀 힘들었어. 회의가 길어져서 점심도 못 먹었고 퇴근길 지하철에서도 계속 서 있었거든."
+
+
+def _tokens(text: str) -> List[str]:
+    words = text.split(" ")
+    return [w if i == 0 else " " + w for i, w in enumerate(words)]
+
+
+def _reply_tokens() -> List[str]:
+    return _tokens(REPLY_TEXT)
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    request_bytes: int = 0  # 스텁이 받은 요청 본문 바이트 합계
+
+
+def _prompt_chars(messages: List[dict]) -> int:
+    total = 0
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            total += sum(len(str(part.get("text", ""))) for part in content if isinstance(part, dict))
+        else:
+            total += len(str(content or ""))
+    return total
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency_sec: float = 0.2
+    token_delay_sec: float = 0.0
+    char_delay_sec: float = 0.0
+    prompt_char_delay_sec: float = 0.0
+    moderation_latency_sec: Optional[float] = None  # None이면 latency_sec
+    audio_bytes_per_char: int = 1024
+    stats: StubStats = StubStats()
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - 표준 시그니처 유지
+        return
+
+    def handle(self) -> None:
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            return  # 클라이언트가 취소한 요청 (예: 입력 모더레이션에 걸려 중단된 생성)
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, payload: dict) -> None:
+        self._send(200, json.dumps(payload, ensure_ascii=False).encode("utf-8"), "application/json")
+
+    def _stream_chat(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for token in _reply_tokens():
+            chunk = {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": "stub",
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}],
+            }
+            self.wfile.write(b"data: " + json.dumps(chunk, ensure_ascii=False).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+            time.sleep(self.token_delay_sec)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _stream_transcript(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for token in _tokens(TRANSCRIPT_TEXT):
+            time.sleep(self.token_delay_sec)
+            event = {"type": "transcript.text.delta", "delta": token}
+            self.wfile.write(b"data: " + json.dumps(event, ensure_ascii=False).encode("utf-8") + b"\n\n")
+            self.wfile.flush()
+        done = {"type": "transcript.text.done", "text": TRANSCRIPT_TEXT}
+        self.wfile.write(b"data: " + json.dumps(done, ensure_ascii=False).encode("utf-8") + b"\n\n")
+        self.wfile.flush()
+
+    def _stream_speech(self, text: str) -> None:
+        total = self.audio_bytes_per_char * max(1, len(text))
+        parts = 8
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/mpeg")
+        self.send_header("Content-Length", str(total))
+        self.end_headers()
+        for i in range(parts):
+            time.sleep(self.char_delay_sec * len(text) / parts)
+            size = total // parts + (total % parts if i == parts - 1 else 0)
+            self.wfile.write(b"\xff" * size)
+            self.wfile.flush()
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server 규약
+        body = self._read_body()
+        self.stats.requests += 1
+        self.stats.request_bytes += len(body)
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/moderations") and self.moderation_latency_sec is not None:
+            time.sleep(self.moderation_latency_sec)
+        else:
+            time.sleep(self.latency_sec)
+        if path.endswith("/chat/completions"):
+            try:
+                request = json.loads(body or b"{}")
+            except ValueError:
+                request = {}
+            stream = bool(request.get("stream"))
+            time.sleep(self.prompt_char_delay_sec * _prompt_chars(request.get("messages") or []))
+            if stream:
+                self._stream_chat()
+                return
+            time.sleep(self.token_delay_sec * len(_reply_tokens()))
+            self._send_json({
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "stub",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": REPLY_TEXT},
+                }],
+            })
+        elif path.endswith("/audio/speech"):
+            try:
+                text = str(json.loads(body or b"{}").get("input") or "")
+            except ValueError:
+                text = ""
+            self._stream_speech(text)
+        elif path.endswith("/audio/transcriptions"):
+            if b'name="stream"\r\n\r\ntrue' in body:
+                self._stream_transcript()
+                return
+            time.sleep(self.token_delay_sec * len(_tokens(TRANSCRIPT_TEXT)))
+            self._send_json({"text": TRANSCRIPT_TEXT})
+        elif path.endswith("/moderations"):
+            try:
+                text = json.dumps(json.loads(body or b"{}").get("input"), ensure_ascii=False)
+            except ValueError:
+                text = ""
+            flagged = any(word in text for word in FLAGGED_WORDS)
+            self._send_json({
+                "id": "modr-stub",
+                "model": "stub",
+                "results": [{
+                    "flagged": flagged,
+                    "categories": {"self-harm": flagged},
+                    "category_scores": {"self-harm": 0.99 if flagged else 0.0},
+                }],
+            })
+        else:
+            self._send(404, b"{}", "application/json")
+
+
+def start_stub_server(
+    port: int = 0,
+    latency_sec: float = 0.2,
+    token_delay_sec: float = 0.0,
+    char_delay_sec: float = 0.0,
+    prompt_char_delay_sec: float = 0.0,
+    moderation_latency_sec: Optional[float] = None,
+) -> Tuple[ThreadingHTTPServer, str]:
+    """백그라운드 스레드로 스텁 서버를 띄우고 (server, base_url)을 반환. 요청 통계는 ``server.stats``"""
+    stats = StubStats()
+    handler = type(
+        "ConfiguredStubHandler",
+        (StubHandler,),
+        {
+            "latency_sec": latency_sec,
+            "token_delay_sec": token_delay_sec,
+            "char_delay_sec": char_delay_sec,
+            "prompt_char_delay_sec": prompt_char_delay_sec,
+            "moderation_latency_sec": moderation_latency_sec,
+            "stats": stats,
+        },
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.stats = stats  # type: ignore[attr-defined]
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, bound_port = server.server_address[:2]
+    return server, f"http://{host}:{bound_port}/v1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.2, help="응답 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="채팅 토큰/전사 단어당 지연(초)")
+    parser.add_argument("--char-delay", type=float, default=0.0, help="TTS 입력 글자당 지연(초)")
+    parser.add_argument("--prompt-char-delay", type=float, default=0.0, help="채팅 프롬프트 글자당 지연(초)")
+    parser.add_argument("--moderation-latency", type=float, default=None, help="모더레이션 지연(초, 기본 --latency)")
+    args = parser.parse_args()
+    server, base_url = start_stub_server(
+        args.port, args.latency, args.token_delay, args.char_delay, args.prompt_char_delay, args.moderation_latency
+    )
+    print(f"stub OpenAI server: {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
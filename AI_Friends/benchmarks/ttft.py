@@ -0,0 +1,72 @@
+"""/api/chat 대 /api/chat/stream 첫 토큰 도달 시간(TTFT) 비교.
+
+스텁 모델은 ``--latency`` 후 첫 토큰을 내고 이후 토큰마다 ``--token-delay`` 만큼 걸립니다.
+일반 엔드포인트는 전체 생성이 끝나야 첫 바이트가 오므로 TTFT = 전체 시간입니다.
+
+    python benchmarks/ttft.py --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import statistics
+import sys
+import time
+import urllib.parse
+import uuid
+from pathlib import Path
+from typing import List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import running_app  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def _measure(base_url: str, path: str) -> Tuple[float, float]:
+    """(첫 답변 텍스트 도달 시간, 전체 완료 시간)을 초 단위로 반환"""
+    host, port = base_url.split("//", 1)[1].split(":")
+    # 응답 캐시를 피하도록 매 요청 고유한 문장 사용
+    body = urllib.parse.urlencode({"text": f"오늘 좀 힘들었어 ({uuid.uuid4().hex[:8]})"})
+    conn = http.client.HTTPConnection(host, int(port), timeout=120)
+    start = time.perf_counter()
+    conn.request("POST", path, body=body, headers={"Content-Type": "application/x-www-form-urlencoded"})
+    resp = conn.getresponse()
+    first = None
+    if path.endswith("/stream"):
+        while True:
+            line = resp.readline()
+            if not line:
+                break
+            if first is None and line.startswith(b"event: delta"):
+                first = time.perf_counter() - start
+    else:
+        resp.read()
+        first = time.perf_counter() - start
+    total = time.perf_counter() - start
+    conn.close()
+    return first or total, total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="채팅 TTFT 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3, help="첫 토큰까지 스텁 지연(초)")
+    parser.add_argument("--token-delay", type=float, default=0.05, help="토큰당 스텁 지연(초)")
+    args = parser.parse_args()
+
+    stub, stub_url = start_stub_server(latency_sec=args.latency, token_delay_sec=args.token_delay)
+    try:
+        with running_app(stub_url) as base_url:
+            for path in ("/api/chat", "/api/chat/stream"):
+                samples: List[Tuple[float, float]] = [_measure(base_url, path) for _ in range(args.runs)]
+                ttft = statistics.median(s[0] for s in samples) * 1000
+                total = statistics.median(s[1] for s in samples) * 1000
+                print(f"{path:<18} TTFT {ttft:7.0f} ms | total {total:7.0f} ms")
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
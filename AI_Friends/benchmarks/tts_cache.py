@@ -0,0 +1,121 @@
+"""고정 문장 TTS 캐시가 첫 오디오 도달 시간(TTFA)과 전체 합성 시간을 얼마나 줄이는지 비교.
+
+- 캐시 없음: ``stream_pipelined_tts`` 가 매번 모든 문장을 합성
+- 캐시: ``warm_tts_cache`` 로 기본 워밍업 문장을 미리 합성한 뒤 같은 함수에 ``cache`` 전달
+
+문장 종류
+- 고정: 안전 문장(``SELF_HARM_REPLY``)처럼 서버가 그대로 반복하는 답변
+- 섞임: 고정 문장 뒤에 매번 다른 문장이 붙는 답변 (캐시된 앞부분 + 새로 합성한 뒷부분)
+
+스텁 TTS는 ``--latency`` + 글자당 ``--char-delay`` 만큼 걸립니다. 캐시는 임시 폴더를 씁니다.
+
+    python benchmarks/tts_cache.py --runs 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Callable, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from stub_openai import start_stub_server  # noqa: E402
+
+
+FRESH_TEXT = "그런데 오늘 {tag} 일은 어떻게 됐는지 궁금하다. 조금 더 자세히 들려줄 수 있을까?"
+
+
+async def _measure(stream: AsyncIterator[bytes]) -> Tuple[float, float, int]:
+    start = time.perf_counter()
+    first = None
+    size = 0
+    async for chunk in stream:
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+    return first or total, total, size
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> None:
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+
+    from agent.moderation import SELF_HARM_REPLY
+    from agent.openai_client import AsyncOpenAIClient
+    from agent.tts import DEFAULT_WARMUP_PHRASES, stream_pipelined_tts, warm_tts_cache
+    from agent.tts_cache import TTSCache
+
+    client = AsyncOpenAIClient()
+    tmp = tempfile.TemporaryDirectory()
+    cache = TTSCache(tmp.name)
+    try:
+        await _measure(client.tts_stream("준비"))  # 커넥션 워밍업
+        start = time.perf_counter()
+        counts = await warm_tts_cache(client, cache, DEFAULT_WARMUP_PHRASES, concurrency=args.concurrency)
+        print(
+            f"워밍업 {len(DEFAULT_WARMUP_PHRASES)}개 문장 → {counts['rendered']}개 조각 합성, "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms, {cache.info()['bytes'] / 1024:.0f} KiB"
+        )
+
+        def fixed() -> str:
+            return SELF_HARM_REPLY
+
+        def mixed() -> str:
+            return f"{SELF_HARM_REPLY} {FRESH_TEXT.format(tag=uuid.uuid4().hex[:6])}"
+
+        cases: List[Tuple[str, Callable[[], str]]] = [("고정", fixed), ("섞임", mixed)]
+        for label, make_text in cases:
+            print(f"{label} ({len(make_text())}자, runs={args.runs}, 중앙값)")
+            for name, use_cache in (("캐시 없음", None), ("캐시", cache)):
+                before = cache.stats.saved_sec
+                samples = [
+                    await _measure(
+                        stream_pipelined_tts(client, make_text(), concurrency=args.concurrency, cache=use_cache)
+                    )
+                    for _ in range(args.runs)
+                ]
+                ttfa = statistics.median(s[0] for s in samples) * 1000
+                total = statistics.median(s[1] for s in samples) * 1000
+                saved = (cache.stats.saved_sec - before) / args.runs * 1000
+                print(
+                    f"  {name:<8} TTFA {ttfa:6.0f} ms | 전체 {total:6.0f} ms"
+                    f" | 아낀 합성 {saved:6.0f} ms/회 | 오디오 {samples[0][2] / 1024:.0f} KiB"
+                )
+        info = cache.info()
+        print(
+            f"캐시 적중률 {info['hit_rate'] * 100:.0f}% ({info['hits']}/{info['hits'] + info['misses']}), "
+            f"아낀 합성 시간 합계 {info['saved_synthesis_sec']:.1f} s"
+        )
+    finally:
+        cache.close()
+        tmp.cleanup()
+        await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="고정 문장 TTS 캐시 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--char-delay", type=float, default=0.01)
+    parser.add_argument("--concurrency", type=int, default=3)
+    args = parser.parse_args()
+
+    stub, base_url = start_stub_server(latency_sec=args.latency, char_delay_sec=args.char_delay)
+    try:
+        asyncio.run(_run(args, base_url))
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""TTS 첫 오디오 도달 시간(TTFA)과 요청당 최대 메모리 비교.
+
+- buffered : 기존 방식. ``tts_to_audio_bytes`` 로 전체 mp3를 읽은 뒤 BytesIO로 감싸 전송
+- pipelined: ``stream_pipelined_tts`` 로 문장 단위 병렬 합성 + 순서대로 스트리밍
+
+스텁 TTS는 ``--latency`` + 글자당 ``--char-delay`` 만큼 걸리고 글자당 1KB를 돌려줍니다.
+메모리는 tracemalloc 최대치(요청 처리 중 파이썬 할당)입니다.
+
+    python benchmarks/tts_pipeline.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import AsyncIterator, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from stub_openai import start_stub_server  # noqa: E402
+
+
+SAMPLE_TEXT = (
+    "오늘 정말 고생 많았어. 아침부터 회의가 이어져서 쉴 틈도 없었겠다. "
+    "그래도 끝까지 버틴 너 자신을 조금은 칭찬해 줬으면 좋겠어. "
+    "저녁에는 따뜻한 국물 요리로 몸을 녹여 보는 건 어때? "
+    "잠들기 전에는 휴대폰을 내려두고 가볍게 스트레칭을 해 봐. "
+    "내일 아침에는 좋아하는 음악을 틀고 천천히 준비해 보자. "
+    "작은 루틴이 쌓이면 마음도 조금씩 단단해질 거야. "
+    "혹시 더 이야기하고 싶은 게 있으면 언제든 말해줘. 나는 여기 있을게."
+)
+
+
+async def _buffered(client, text: str) -> AsyncIterator[bytes]:
+    audio = await client.tts_to_audio_bytes(text)
+    bio = io.BytesIO(audio)
+    while True:
+        chunk = bio.read(64 * 1024)
+        if not chunk:
+            return
+        yield chunk
+
+
+async def _measure(stream: AsyncIterator[bytes]) -> Tuple[float, float, int, int]:
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    first = None
+    total_bytes = 0
+    async for chunk in stream:
+        if first is None:
+            first = time.perf_counter() - start
+        total_bytes += len(chunk)
+    total = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return first or total, total, peak, total_bytes
+
+
+async def _run(args: argparse.Namespace, base_url: str) -> None:
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+
+    from agent.openai_client import AsyncOpenAIClient
+    from agent.tts import split_sentences_kr, stream_pipelined_tts
+
+    client = AsyncOpenAIClient()
+    text = SAMPLE_TEXT * args.repeat
+    print(f"text: {len(text)} chars, {len(split_sentences_kr(text))} chunks, concurrency {args.concurrency}")
+    try:
+        await _measure(_buffered(client, "준비"))  # 커넥션 워밍업
+        cases = [
+            ("buffered", lambda: _buffered(client, text)),
+            ("pipelined", lambda: stream_pipelined_tts(client, text, concurrency=args.concurrency)),
+        ]
+        for name, factory in cases:
+            ttfa, total, peak, size = await _measure(factory())
+            print(
+                f"{name:<10} TTFA {ttfa * 1000:7.0f} ms | total {total * 1000:7.0f} ms"
+                f" | peak {peak / 1024:8.0f} KiB | audio {size / 1024:.0f} KiB"
+            )
+    finally:
+        await client.aclose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="파이프라인 TTS 벤치마크")
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--char-delay", type=float, default=0.01)
+    parser.add_argument("--concurrency", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=1, help="샘플 텍스트 반복 횟수")
+    args = parser.parse_args()
+
+    stub, base_url = start_stub_server(latency_sec=args.latency, char_delay_sec=args.char_delay)
+    try:
+        asyncio.run(_run(args, base_url))
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
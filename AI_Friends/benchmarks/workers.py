@@ -0,0 +1,158 @@
+"""production 모드 워커 수(1 → N)에 따른 처리량과, 워커 사이 상태 공유/종료 시 스트림 정리 확인.
+
+워커 수마다 ``python app.py`` 를 ``AI_FRIENDS_SERVER_MODE=production`` 으로 띄워
+
+1. 처리량: 동시 클라이언트로 ``--path`` (기본 ``/api/chat``) 부하 → RPS, p50/p95 지연
+2. 공유 상태: 사진 한 장을 올린 뒤 ``/api/images/{id}`` 를 ``--checks`` 번 조회해 못 찾은(404) 횟수,
+   한 세션으로 ``--checks`` 번 요청해 분당 한도(``--rate-limit``)에 걸린(429) 횟수.
+   ``--compare-memory`` 를 주면 워커마다 따로 노는 메모리 저장소로도 측정해 비교합니다.
+3. 종료 정리(``--drain``): 긴 ``/api/voice/stream`` 응답 도중 SIGTERM을 보내 끝까지 받았는지 확인
+
+스텁 모델은 ``--latency`` 만큼 걸립니다. 워커 수 이상의 CPU 코어가 있어야 처리량이 늘어납니다.
+
+    python benchmarks/workers.py --workers 1 2 4 --compare-memory --drain
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import signal
+import statistics
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PIL import Image
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from harness import APP_DIR, launch_app, running_app  # noqa: E402
+from image_upload import _multipart, _post  # noqa: E402
+from load_test import run_load  # noqa: E402
+from stub_openai import start_stub_server  # noqa: E402
+
+
+def _status(url: str, data: Optional[bytes] = None, headers: Optional[Dict[str, str]] = None) -> int:
+    req = urllib.request.Request(url, data=data, headers=headers or {})
+    try:
+        with urllib.request.urlopen(req, timeout=60) as resp:
+            resp.read()
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def _throughput(base_url: str, args: argparse.Namespace) -> Dict[str, float]:
+    start = time.perf_counter()
+    latencies = sorted(run_load(base_url, args.path, args.clients, args.requests))
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def _shared_state(base_url: str, checks: int) -> Dict[str, int]:
+    photo = io.BytesIO()
+    Image.effect_noise((640, 480), 40).convert("RGB").save(photo, "JPEG")
+    body, ctype = _multipart({}, {"file": ("photo.jpg", photo.getvalue() + uuid.uuid4().bytes, "image/jpeg")})
+    status, resp, _ = _post(base_url, "/api/upload-image", body, ctype)
+    if status != 200:
+        raise RuntimeError(f"/api/upload-image: HTTP {status}")
+    image_id = json.loads(resp)["image_id"]
+    # 새 연결마다 다른 워커가 받을 수 있음
+    missing = sum(_status(f"{base_url}/api/images/{image_id}") == 404 for _ in range(checks))
+    cookie = {"Cookie": f"ai_friends_sid={uuid.uuid4().hex}"}
+    limited = 0
+    for i in range(checks):
+        data = urllib.parse.urlencode({"text": f"한도 확인 {i}"}).encode("utf-8")
+        limited += _status(f"{base_url}/api/chat", data, cookie) == 429
+    return {"missing": missing, "limited": limited}
+
+
+def _drain(stub_url: str, workers: int) -> None:
+    text = " ".join(f"{i}번째 문장은 종료 신호가 와도 끝까지 전달되어야 한다." for i in range(12))
+    data = urllib.parse.urlencode({"text": text}).encode("utf-8")
+    # 캐시를 끄고 한 문장씩 합성해 응답이 몇 초 동안 이어지게 함
+    env = {"AI_FRIENDS_TTS_CACHE_ENABLED": "0", "AI_FRIENDS_TTS_CONCURRENCY": "1"}
+    with tempfile.TemporaryDirectory() as env_dir:
+        server, base_url = launch_app(stub_url, APP_DIR, env_dir, env, workers=workers)
+        with urllib.request.urlopen(base_url + "/api/voice/stream", data=data, timeout=120) as resp:
+            expected = len(resp.read())
+        started = time.perf_counter()
+        with urllib.request.urlopen(base_url + "/api/voice/stream", data=data, timeout=120) as resp:
+            received = len(resp.read(1024))
+            server.send_signal(signal.SIGTERM)
+            signalled = time.perf_counter()
+            try:
+                while True:
+                    chunk = resp.read(16 * 1024)
+                    if not chunk:
+                        break
+                    received += len(chunk)
+                complete = True
+            except Exception:
+                complete = False
+        server.wait(timeout=60)
+        exited = time.perf_counter() - signalled
+    print(
+        f"종료 정리 (워커 {workers}): 스트림 {signalled - started:.1f} s 시점에 SIGTERM → "
+        f"{received / 1024:.0f}/{expected / 1024:.0f} KiB 수신 ({'완료' if complete and received == expected else '끊김'}), "
+        f"프로세스 종료까지 {exited:.1f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="production 워커 수 확장 벤치마크")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--path", default="/api/chat")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=4, help="클라이언트당 요청 수")
+    parser.add_argument("--latency", type=float, default=0.2, help="스텁 모델 지연(초)")
+    parser.add_argument("--checks", type=int, default=40, help="공유 상태 확인 요청 수")
+    parser.add_argument("--rate-limit", type=int, default=20, help="공유 상태 확인용 분당 요청 한도")
+    parser.add_argument("--compare-memory", action="store_true", help="메모리 저장소로도 측정")
+    parser.add_argument("--drain", action="store_true", help="스트리밍 도중 종료 확인")
+    args = parser.parse_args()
+
+    print(f"CPU {os.cpu_count()}개, 클라이언트 {args.clients}, 요청 {args.clients * args.requests}, 스텁 지연 {args.latency}s")
+    stub, stub_url = start_stub_server(latency_sec=args.latency, char_delay_sec=0.01)
+    backends: List[str] = ["sqlite"] + (["memory"] if args.compare_memory else [])
+    try:
+        for workers in args.workers:
+            for backend in backends:
+                env = {
+                    "AI_FRIENDS_STATE_BACKEND": backend,
+                    "AI_FRIENDS_RATE_LIMIT_PER_MINUTE": str(args.rate_limit),
+                    "AI_FRIENDS_TTS_CACHE_WARMUP": "0",
+                }
+                with running_app(stub_url, extra_env=env, workers=workers) as base_url:
+                    shared = _shared_state(base_url, args.checks)
+                # 처리량은 요청 제한 없이 따로 측정
+                env["AI_FRIENDS_RATE_LIMIT_PER_MINUTE"] = "0"
+                with running_app(stub_url, extra_env=env, workers=workers) as base_url:
+                    m = _throughput(base_url, args)
+                print(
+                    f"워커 {workers} ({backend:<6}) {m['rps']:6.1f} req/s | p50 {m['p50']:5.0f} ms | p95 {m['p95']:5.0f} ms"
+                    f" | 이미지 못 찾음 {shared['missing']:2d}/{args.checks}"
+                    f" | 429 {shared['limited']:2d}/{args.checks} (한도 {args.rate_limit}, 기대 {max(0, args.checks - args.rate_limit)})"
+                )
+        if args.drain:
+            for workers in sorted({1, max(args.workers)}):
+                _drain(stub_url, workers)
+    finally:
+        stub.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,6 +17,53 @@ function appendMessage(role, text, imageUrl) {
   `;
   messages.appendChild(el);
   messages.scrollTop = messages.scrollHeight;
+  return el;
+}
+
+// SSE 스트리밍 채팅: 델타가 도착하는 대로 말풍선에 이어 붙임
+async function streamChat(formData) {
+  const el = appendMessage('ai', '');
+  const body = el.querySelector('.bubble > div');
+  body.style.whiteSpace = 'pre-wrap';
+  const messages = document.getElementById('messages');
+  const res = await postForm('/api/chat/stream', formData);
+  if (!res.body) {
+    // ReadableStream 미지원 브라우저: 일반 엔드포인트로 대체
+    const fallback = await postForm('/api/chat', formData);
+    body.textContent = (await fallback.json()).reply;
+    return;
+  }
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let reply = '';
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep;
+    while ((sep = buffer.indexOf('\n\n')) >= 0) {
+      const raw = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let event = 'message';
+      let data = '';
+      raw.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      });
+      if (event === 'delta') {
+        reply += JSON.parse(data).text;
+        body.textContent = reply;
+        messages.scrollTop = messages.scrollHeight;
+      } else if (event === 'replace') {
+        // 모더레이션에 걸린 답변은 안전 문장으로 통째로 대체
+        reply = JSON.parse(data).text;
+        body.textContent = reply;
+      } else if (event === 'error') {
+        body.textContent = reply + (reply ? '\n' : '') + JSON.parse(data).message;
+      }
+    }
+  }
 }
 
 document.getElementById('sendBtn').addEventListener('click', async () => {
@@ -27,9 +74,7 @@ document.getElementById('sendBtn').addEventListener('click', async () => {
   appendMessage('user', text);
   const fd = new FormData();
   fd.append('text', text);
-  const res = await postForm('/api/chat', fd);
-  const data = await res.json();
-  appendMessage('ai', data.reply);
+  await streamChat(fd);
 });
 
 document.getElementById('speakBtn').addEventListener('click', async () => {
@@ -37,35 +82,111 @@ document.getElementById('speakBtn').addEventListener('click', async () => {
   if (!text) return;
   const fd = new FormData();
   fd.append('text', text);
-  const res = await postForm('/api/voice', fd);
-  const blob = await res.blob();
-  const url = URL.createObjectURL(blob);
   const player = document.getElementById('audioPlayer');
-  player.src = url;
-  player.play();
+  if (!window.MediaSource || !MediaSource.isTypeSupported('audio/mpeg')) {
+    // MediaSource 미지원: 전체 오디오를 받은 뒤 재생
+    const res = await postForm('/api/voice', fd);
+    player.src = URL.createObjectURL(await res.blob());
+    player.play();
+    return;
+  }
+  // 문장 단위로 합성된 오디오를 도착하는 대로 이어 붙여 재생
+  const mediaSource = new MediaSource();
+  player.src = URL.createObjectURL(mediaSource);
+  await new Promise((resolve) => mediaSource.addEventListener('sourceopen', resolve, { once: true }));
+  const sourceBuffer = mediaSource.addSourceBuffer('audio/mpeg');
+  const res = await postForm('/api/voice/stream', fd);
+  const reader = res.body.getReader();
+  let started = false;
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    sourceBuffer.appendBuffer(value);
+    await new Promise((resolve) => sourceBuffer.addEventListener('updateend', resolve, { once: true }));
+    if (!started) {
+      started = true;
+      player.play();
+    }
+  }
+  mediaSource.endOfStream();
 });
 
 // 음성 녹음 → 전사(STT)
+// 녹음 중 250ms마다 청크를 WebSocket으로 보내 두고, 종료 시 stop만 보내 바로 전사 시작.
+// WebSocket을 쓸 수 없으면 종료 후 전체 녹음을 /api/transcribe 로 업로드
 let mediaRecorder;
 let recordedChunks = [];
+let sttSocket = null;
 const recBtn = document.getElementById('recBtn');
+
+function openSttSocket() {
+  const proto = location.protocol === 'https:' ? 'wss' : 'ws';
+  const ws = new WebSocket(`${proto}://${location.host}/ws/transcribe`);
+  ws.binaryType = 'arraybuffer';
+  const result = document.getElementById('sttResult');
+  let stopped = false;
+  let finished = false;
+  ws.onmessage = (e) => {
+    const msg = JSON.parse(e.data);
+    if (msg.type === 'partial' || msg.type === 'final') result.value = msg.text || '';
+    else if (msg.type === 'error') result.value = msg.message;
+    if (msg.type === 'final' || msg.type === 'error') finished = true;
+  };
+  ws.sendStop = () => {
+    stopped = true;
+    ws.send(JSON.stringify({ type: 'stop' }));
+  };
+  ws.onclose = () => {
+    // stop을 보낸 뒤 결과 없이 닫힘(서버 재시작 등): 전체 녹음을 업로드
+    if (stopped && !finished) uploadRecording();
+  };
+  ws.onerror = () => {
+    sttSocket = null;
+  };
+  ws.onopen = () => {
+    ws.send(JSON.stringify({ type: 'start', filename: 'speech.webm' }));
+    // 연결되기 전에 나온 청크부터 순서대로 전송
+    recordedChunks.forEach((chunk) => ws.send(chunk));
+  };
+  return ws;
+}
+
+async function uploadRecording() {
+  const blob = new Blob(recordedChunks, { type: 'audio/webm' });
+  const fd = new FormData();
+  fd.append('file', blob, 'speech.webm');
+  const res = await postForm('/api/transcribe', fd);
+  const data = await res.json();
+  document.getElementById('sttResult').value = data.text || '';
+}
+
 recBtn?.addEventListener('click', async () => {
   if (!mediaRecorder || mediaRecorder.state === 'inactive') {
     const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
     mediaRecorder = new MediaRecorder(stream, { mimeType: 'audio/webm' });
     recordedChunks = [];
+    sttSocket = window.WebSocket ? openSttSocket() : null;
     mediaRecorder.ondataavailable = (e) => {
-      if (e.data.size > 0) recordedChunks.push(e.data);
+      if (e.data.size === 0) return;
+      recordedChunks.push(e.data);
+      if (sttSocket && sttSocket.readyState === WebSocket.OPEN) sttSocket.send(e.data);
     };
     mediaRecorder.onstop = async () => {
-      const blob = new Blob(recordedChunks, { type: 'audio/webm' });
-      const fd = new FormData();
-      fd.append('file', blob, 'speech.webm');
-      const res = await postForm('/api/transcribe', fd);
-      const data = await res.json();
-      document.getElementById('sttResult').value = data.text || '';
+      stream.getTracks().forEach((t) => t.stop());
+      // 연결이 끝까지 열려 있었으면 이미 모든 청크가 서버에 있음
+      if (sttSocket && sttSocket.readyState === WebSocket.OPEN) {
+        document.getElementById('sttResult').value = '';
+        sttSocket.sendStop();
+        return;
+      }
+      // 아직 연결 중이면 닫아 둠 (stop을 보내지 않았으므로 onclose에서 다시 업로드하지 않음)
+      if (sttSocket) {
+        sttSocket.close();
+        sttSocket = null;
+      }
+      await uploadRecording();
     };
-    mediaRecorder.start();
+    mediaRecorder.start(250);
     recBtn.textContent = '🛑 녹음 종료';
   } else if (mediaRecorder.state === 'recording') {
     mediaRecorder.stop();
@@ -79,37 +200,36 @@ document.getElementById('sendFromSttBtn')?.addEventListener('click', async () =>
   appendMessage('user', text);
   const fd = new FormData();
   fd.append('text', text);
-  const res = await postForm('/api/chat', fd);
-  const data = await res.json();
-  appendMessage('ai', data.reply);
+  await streamChat(fd);
 });
 
 // 이미지 업로드 + 프롬프트
+// 서버는 축소한 이미지를 보관하고 ID만 돌려줌. 미리보기는 로컬 파일로 바로 표시
 const imageInput = document.getElementById('imageFile');
 const preview = document.getElementById('preview');
 imageInput.addEventListener('change', async (e) => {
   const f = e.target.files?.[0];
   if (!f) return;
+  if (preview.src.startsWith('blob:')) URL.revokeObjectURL(preview.src);
+  preview.src = URL.createObjectURL(f);
+  preview.classList.remove('hidden');
+  delete preview.dataset.imageId;
   const fd = new FormData();
   fd.append('file', f);
   const res = await postForm('/api/upload-image', fd);
   const data = await res.json();
-  preview.src = data.image_url;
-  preview.classList.remove('hidden');
-  preview.dataset.url = data.image_url;
+  preview.dataset.imageId = data.image_id;
 });
 
 document.getElementById('imageSendBtn').addEventListener('click', async () => {
   const text = document.getElementById('imageText').value.trim();
-  const imgUrl = preview.dataset.url;
-  if (!text && !imgUrl) return;
-  appendMessage('user', text || '(이미지와 함께)', imgUrl);
+  const imageId = preview.dataset.imageId;
+  if (!text && !imageId) return;
+  appendMessage('user', text || '(이미지와 함께)', imageId ? `/api/images/${encodeURIComponent(imageId)}` : null);
   const fd = new FormData();
   fd.append('text', text);
-  if (imgUrl) fd.append('image_url', imgUrl);
-  const res = await postForm('/api/chat', fd);
-  const data = await res.json();
-  appendMessage('ai', data.reply);
+  if (imageId) fd.append('image_id', imageId);
+  await streamChat(fd);
 });
 
 // 추천 프롬프트 버튼
@@ -5,9 +5,11 @@ from typing import List, Optional
 
 import streamlit as st
 
-from core.cover_letter import analyze_cover_letter
+from core.cover_letter import IncrementalCoverLetterAnalyzer
 from core.coding_tutor import TestCase, tutor
-from core.interview_assistant import analyze_script, analyze_audio_wav, optional_transcribe
+from core.interview_assistant import analyze_script, analyze_audio_wav, transcribe_with_timestamps
+from core.stt_chain import get_transcription_chain
+from core.stt_models import COMPUTE_TYPES, MODEL_SIZES, get_stt_manager, preload_from_env
 
 
 st.set_page_config(page_title="취업 준비 튜터", page_icon="🎯", layout="wide")
@@ -17,6 +19,33 @@ api_key_input = st.sidebar.text_input("OpenAI API Key (선택)", type="password"
 if api_key_input:
     os.environ["OPENAI_API_KEY"] = api_key_input
 
+
+@st.cache_resource
+def _start_stt_preload() -> bool:
+    """Runs once per server process: warm the local STT model if JOB_TUTOR_STT_PRELOAD is set."""
+    return preload_from_env() is not None
+
+
+_start_stt_preload()
+stt_manager = get_stt_manager()
+with st.sidebar.expander("로컬 STT 모델"):
+    stt_size = st.selectbox(
+        "모델 크기", MODEL_SIZES,
+        index=MODEL_SIZES.index(stt_manager.size) if stt_manager.size in MODEL_SIZES else 1,
+        help="클수록 정확하지만 로딩과 전사가 느립니다",
+    )
+    stt_compute = st.selectbox(
+        "연산 정밀도 (faster-whisper)", COMPUTE_TYPES,
+        index=COMPUTE_TYPES.index(stt_manager.compute_type) if stt_manager.compute_type in COMPUTE_TYPES else 0,
+        help="int8은 CPU에서 메모리와 시간을 크게 줄입니다",
+    )
+    stt_manager.configure(size=stt_size, compute_type=stt_compute)
+    if st.button("지금 미리 로드", use_container_width=True):
+        with st.spinner("모델 로딩 중..."):
+            stt_manager.preload(background=False)
+    loaded = stt_manager.loaded()
+    st.caption("로드됨: " + (", ".join(spec.label for spec in loaded) if loaded else "없음"))
+
 st.title("취업 준비 튜터")
 st.caption("자소서 첨삭 · 코딩테스트 튜터 · 면접 도우미")
 
@@ -41,7 +70,17 @@ with tab1:
         use_llm = st.toggle("LLM 보강 사용", value=False, help="API Key 설정 시 심화 피드백")
 
     if run and (content or "").strip():
-        fb = analyze_cover_letter(content, job_title=job_title or None, enable_llm=use_llm)
+        # One analyzer per browser session: re-runs after small edits only re-analyse the
+        # changed sentences and send only the changed paragraphs to the LLM.
+        analyzer = st.session_state.get("cover_letter_analyzer")
+        if analyzer is None or analyzer.job_title != (job_title or None):
+            analyzer = IncrementalCoverLetterAnalyzer(job_title=job_title or None)
+            st.session_state["cover_letter_analyzer"] = analyzer
+        fb = analyzer.update(content, enable_llm=use_llm)
+        upd = analyzer.last_update
+        if upd is not None:
+            llm_note = {"delta": f" · LLM: 수정된 단락 {upd.changed_paragraphs}개만 전송", "reused": " · LLM: 변경 없음, 이전 피드백 재사용"}.get(upd.llm_mode or "", "")
+            st.caption(f"다시 분석한 문장 {upd.changed_sentences}개 · 재사용 {upd.reused_sentences}개 · {upd.elapsed_ms:.1f} ms{llm_note}")
         st.markdown("**기초 지표**")
         st.write({
             "문자수": fb.metrics.num_chars,
@@ -139,8 +178,35 @@ with tab2:
     with col3:
         include_ref = st.toggle("정답 포함", value=False, help="LLM 사용 시 레퍼런스 정답 코드 포함")
 
+    with st.expander("실행 옵션"):
+        ecol1, ecol2, ecol3 = st.columns([1, 1, 1])
+        with ecol1:
+            parallelism = st.number_input("동시 실행 수", min_value=1, max_value=os.cpu_count() or 1, value=min(4, os.cpu_count() or 1))
+        with ecol2:
+            fail_fast = st.toggle("첫 실패 시 중단", value=False)
+        with ecol3:
+            budget = st.number_input("전체 시간 예산(초, 0=제한 없음)", min_value=0.0, value=0.0, step=1.0)
+        lcol1, lcol2 = st.columns([1, 1])
+        with lcol1:
+            case_timeout = st.number_input("케이스당 시간 제한(초)", min_value=0.5, value=2.0, step=0.5)
+        with lcol2:
+            memory_limit = st.number_input("메모리 제한(MB, 0=제한 없음)", min_value=0, value=256, step=64, help="Linux/macOS에서 RLIMIT_AS로 적용")
+        profile = st.toggle("경험적 복잡도 측정", value=False, help="첫 번째 테스트 입력을 N=16, 32, 64, ...로 키워 가며 실행 시간을 측정하고 성장 곡선을 맞춥니다")
+
     if run_tests and (code or "").strip():
-        resp = tutor(code=code, problem=problem or "", testcases=tcs, ask_llm_solution=ask_llm, include_reference=include_ref)
+        resp = tutor(
+            code=code,
+            problem=problem or "",
+            testcases=tcs,
+            ask_llm_solution=ask_llm,
+            include_reference=include_ref,
+            parallelism=int(parallelism),
+            fail_fast=fail_fast,
+            total_timeout_sec=budget or None,
+            timeout_sec=case_timeout,
+            memory_limit_mb=int(memory_limit) or None,
+            profile_complexity=profile,
+        )
         st.markdown("**정적 분석**")
         st.write({
             "문법 정상": resp.static.syntax_ok,
@@ -149,13 +215,41 @@ with tab2:
             "패턴": resp.static.detected_patterns,
             "경고": resp.static.warnings,
         })
+        if resp.static.findings:
+            st.markdown("**성능 점검**")
+            for f in resp.static.findings:
+                lines = f"line {f.line}" if f.line == f.end_line else f"line {f.line}-{f.end_line}"
+                with st.expander(f"{lines} · {f.message}"):
+                    st.caption(f"`{f.rule}`")
+                    st.write(f.rationale)
+        if resp.empirical:
+            emp = resp.empirical
+            st.markdown("**경험적 복잡도**")
+            ccol1, ccol2 = st.columns(2)
+            ccol1.metric("측정 결과", emp.best_fit, help=f"정적 추정: {resp.static.complexity_estimate}")
+            ccol2.metric("신뢰도", f"{emp.confidence:.0%}")
+            if emp.samples:
+                st.line_chart({"N": [n for n, _ in emp.samples], "초": [t for _, t in emp.samples]}, x="N", y="초")
+            if emp.note:
+                st.caption(emp.note)
 
         if resp.results:
             st.markdown("**테스트 결과**")
-            for r in resp.results:
+            if resp.stats:
+                st.caption(
+                    f"총 {resp.stats.total_sec:.2f}초 · {resp.stats.cases_per_sec} cases/s · "
+                    f"동시 실행 {resp.stats.parallelism} · 건너뜀 {resp.stats.skipped}"
+                )
+            for idx, r in enumerate(resp.results):
                 box = st.container(border=True)
                 with box:
-                    st.write({"이름": r.name, "통과": r.passed, "종료코드": r.exit_code})
+                    latency = resp.stats.latencies_ms[idx] if resp.stats else None
+                    st.write({"이름": r.name, "통과": r.passed, "종료코드": r.exit_code, "지연(ms)": latency, "건너뜀": r.skipped})
+                    if not r.skipped:
+                        mcol1, mcol2, mcol3 = st.columns(3)
+                        mcol1.metric("실행 시간", f"{r.wall_ms:.1f} ms" if r.wall_ms is not None else "-")
+                        mcol2.metric("CPU 시간", f"{r.cpu_ms:.1f} ms" if r.cpu_ms is not None else "-")
+                        mcol3.metric("최대 메모리", f"{r.peak_rss_kb / 1024:.1f} MB" if r.peak_rss_kb is not None else "-")
                     with st.expander("stdout"):
                         st.code(r.stdout or "", language="text")
                     if r.stderr:
@@ -204,24 +298,71 @@ with tab3:
 
         if audio is not None:
             with st.spinner("오디오 분석 중..."):
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                    tmp.write(audio.getbuffer())
-                    tmp_path = tmp.name
-                aa = analyze_audio_wav(tmp_path, approx_text_length_chars=len(script or ""))
+                # Parsed straight from the upload's memory; no temp file unless a local STT model needs one.
+                audio_view = audio.getbuffer()
+                aa = analyze_audio_wav(audio_view, approx_text_length_chars=len(script or ""))
                 st.markdown("**오디오 지표**")
                 st.write({
                     "길이(초)": aa.duration_sec,
                     "샘플레이트": aa.sample_rate,
                     "채널": aa.channels,
                     "분당 문자수(대략)": aa.approx_chars_per_min,
+                    "발화 시간(초)": aa.voiced_sec,
+                    "발화 비율": aa.speech_ratio,
+                    "멈춤 횟수(0.3초↑)": len(aa.pauses),
+                    "최장 멈춤(초)": aa.longest_pause_sec,
+                    "발화 기준 분당 문자수": aa.chars_per_voiced_min,
                     "비고": aa.note,
                 })
+                if aa.pauses:
+                    with st.expander("멈춤 구간"):
+                        st.dataframe(
+                            [{"시작(초)": p.start_sec, "끝(초)": p.end_sec, "길이(초)": p.duration_sec} for p in aa.pauses],
+                            use_container_width=True,
+                        )
                 if use_stt:
                     st.markdown("**전사(STT) 텍스트**")
-                    tx = optional_transcribe(tmp_path)
+                    transcript = transcribe_with_timestamps(audio_view)
+                    tx = transcript.text if transcript else None
                     if tx:
                         st.write(tx)
+                        st.caption(
+                            f"{transcript.backend} · 구간 {transcript.chunks}개 병렬 전사 · {transcript.elapsed_sec:.1f}초"
+                            + (f" · 실패 구간 {len(transcript.failed_chunks)}개" if transcript.failed_chunks else "")
+                        )
+                        with st.expander("전사 백엔드"):
+                            st.dataframe(
+                                [
+                                    {
+                                        "구간": info.index,
+                                        "처리 백엔드": info.backend or "실패",
+                                        "소요(초)": info.elapsed_sec,
+                                        "실패/건너뜀": "; ".join(f"{a.backend}: {a.error}" for a in info.attempts if not a.ok),
+                                    }
+                                    for info in transcript.served
+                                ],
+                                use_container_width=True,
+                            )
+                            st.dataframe(
+                                [
+                                    {
+                                        "백엔드": name,
+                                        "상태": h.state,
+                                        "성공": h.successes,
+                                        "실패": h.failures,
+                                        "평균 지연(초)": round(h.ewma_latency_sec, 2) if h.ewma_latency_sec is not None else None,
+                                        "실시간 대비": round(h.ewma_rtf, 3) if h.ewma_rtf is not None else None,
+                                        "최근 오류": h.last_error,
+                                    }
+                                    for name, h in get_transcription_chain().health().items()
+                                ],
+                                use_container_width=True,
+                            )
+                        with st.expander("타임스탬프별 전사"):
+                            st.dataframe(
+                                [{"시작(초)": seg.start_sec, "끝(초)": seg.end_sec, "텍스트": seg.text} for seg in transcript.segments],
+                                use_container_width=True,
+                            )
                         st.markdown("**전사 텍스트 기반 피드백**")
                         fb2 = analyze_script(tx, enable_llm=use_llm_iv)
                         st.write(fb2.star_coverage)
@@ -231,9 +372,22 @@ with tab3:
                             st.info("- " + imp)
                     else:
                         st.warning("전사에 실패했거나 사용 가능한 STT가 없습니다.")
-                try:
-                    os.remove(tmp_path)
-                except Exception:
-                    pass
+                    stt_stats = stt_manager.stats()
+                    if stt_stats:
+                        with st.expander("로컬 STT 모델 시간"):
+                            st.dataframe(
+                                [
+                                    {
+                                        "모델": spec.label,
+                                        "로딩(초)": t.load_sec,
+                                        "첫 전사(초)": t.first_sec,
+                                        "이후 평균(초)": t.warm_mean_sec,
+                                        "전사 횟수": t.calls,
+                                        "오류": t.error,
+                                    }
+                                    for spec, t in stt_stats
+                                ],
+                                use_container_width=True,
+                            )
 
 st.caption("Made with ❤️  | 로컬에서 안전하게 실행됩니다. API Key 미설정 시에도 기본 기능이 동작합니다.") 
\ No newline at end of file
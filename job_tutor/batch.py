@@ -0,0 +1,313 @@
+"""Batch grading of cover letters.
+
+Streams essays from a directory of ``.txt`` files or a JSONL file, runs the heuristic
+analysis across a process pool, optionally adds LLM feedback with bounded concurrency,
+and appends one JSON line per essay to the output file as soon as it is graded. Memory
+stays flat regardless of corpus size; re-running with the same output file skips essays
+that were already written, so a crashed run resumes where it stopped.
+
+    python -m job_tutor.batch essays/ -o results.jsonl
+    python -m job_tutor.batch essays.jsonl -o results.jsonl --llm --llm-concurrency 8
+
+JSONL input lines look like ``{"id": "...", "text": "...", "job_title": "..."}``; ``id``
+and ``job_title`` are optional (the line number is used as id).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from .core.cover_letter import analyze_cover_letter, cover_letter_prompt
+from .core.llm import LLMResult, LLMScheduler, cover_letter_request
+
+
+@dataclass
+class Essay:
+    id: str
+    text: str
+    job_title: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class BatchSummary:
+    total: int
+    skipped: int
+    written: int
+    failed: int
+    llm_calls: int
+    elapsed_sec: float
+
+
+def iter_essays(source: Union[str, Path]) -> Iterator[Essay]:
+    """Yield essays one at a time from a directory of .txt files or a JSONL file."""
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(path.rglob("*.txt")):
+            essay_id = file.relative_to(path).as_posix()
+            try:
+                yield Essay(essay_id, file.read_text(encoding="utf-8-sig", errors="replace"))
+            except OSError as e:
+                yield Essay(essay_id, "", error=f"읽기 실패: {e}")
+        return
+
+    with path.open("r", encoding="utf-8-sig") as f:
+        for lineno, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield Essay(f"line-{lineno}", "", error=f"JSON 파싱 실패: {e.msg}")
+                continue
+            if not isinstance(row, dict):
+                yield Essay(f"line-{lineno}", "", error="JSON 객체가 아닙니다")
+                continue
+            yield Essay(str(row.get("id") or f"line-{lineno}"), str(row.get("text") or ""), row.get("job_title") or None)
+
+
+def load_done_ids(output: Union[str, Path]) -> Set[str]:
+    """Ids already present in the output; drops a torn last line left by a crash."""
+    path = Path(output)
+    if not path.exists():
+        return set()
+    done: Set[str] = set()
+    with path.open("rb+") as f:
+        good_end = 0
+        for line in iter(f.readline, b""):
+            if not line.endswith(b"\n"):
+                break
+            try:
+                done.add(str(json.loads(line)["id"]))
+            except (ValueError, KeyError, TypeError):
+                break
+            good_end = f.tell()
+        if good_end != f.seek(0, os.SEEK_END):
+            f.truncate(good_end)
+    return done
+
+
+def _grade_chunk(essays: List[Essay]) -> List[Dict[str, Any]]:
+    """Heuristic grading; runs in a worker process."""
+    records: List[Dict[str, Any]] = []
+    for essay in essays:
+        record: Dict[str, Any] = {"id": essay.id, "job_title": essay.job_title}
+        if essay.error:
+            record["error"] = essay.error
+        else:
+            fb = analyze_cover_letter(essay.text, job_title=essay.job_title, enable_llm=False)
+            record.update(
+                metrics=asdict(fb.metrics),
+                issues=fb.issues,
+                suggestions=fb.suggestions,
+                star_coverage=fb.star_coverage,
+                llm_feedback=None,
+            )
+        records.append(record)
+    return records
+
+
+def _attach_llm(record: Dict[str, Any], result: LLMResult) -> Dict[str, Any]:
+    record["llm_feedback"] = result.text
+    record["llm"] = {
+        "latency_sec": round(result.latency_sec, 3),
+        "retries": result.retries,
+        "rate_limited": result.rate_limited,
+        "cached": result.cached,
+        "error": result.error,
+    }
+    return record
+
+
+def _chunks(items: Iterable[Essay], size: int) -> Iterator[List[Essay]]:
+    chunk: List[Essay] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class _InlineExecutor(Executor):
+    """Runs the heuristics in-process (workers=0), e.g. for tiny corpora or debugging."""
+
+    def submit(self, fn, *args, **kwargs):  # type: ignore[override]
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def grade_batch(
+    source: Union[str, Path],
+    output: Union[str, Path],
+    workers: Optional[int] = None,
+    enable_llm: bool = False,
+    llm_concurrency: int = 4,
+    chunk_size: int = 32,
+    resume: bool = True,
+    use_cache: bool = True,
+    requests_per_min: float = 500.0,
+    tokens_per_min: float = 200_000.0,
+) -> BatchSummary:
+    """Grade every essay in ``source`` and append the results to ``output`` as JSONL.
+
+    At most ``2 * workers`` heuristic chunks and ``2 * llm_concurrency`` LLM requests are in
+    flight at once, so only a bounded number of essays is ever held in memory. LLM calls go
+    through ``LLMScheduler`` (rate limits, retries on 429). Results are written in completion
+    order, one flushed line per essay. An essay whose LLM call failed is counted as failed
+    and not written, so the next resumed run grades it again.
+    """
+    started = time.perf_counter()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    if not resume and output.exists():
+        output.unlink()
+    done = load_done_ids(output) if resume else set()
+
+    scheduler = (
+        LLMScheduler(
+            max_concurrency=llm_concurrency,
+            requests_per_min=requests_per_min,
+            tokens_per_min=tokens_per_min,
+            use_cache=use_cache,
+        )
+        if enable_llm
+        else None
+    )
+    llm_enabled = bool(scheduler and scheduler.enabled)
+    if enable_llm and not llm_enabled:
+        print("OPENAI_API_KEY가 없거나 SDK를 불러올 수 없어 LLM 피드백 없이 진행합니다.", file=sys.stderr)
+
+    total = skipped = written = failed = llm_calls = 0
+    texts: Dict[str, str] = {}
+
+    def pending_essays() -> Iterator[Essay]:
+        nonlocal total, skipped
+        for essay in iter_essays(source):
+            total += 1
+            if essay.id in done:
+                skipped += 1
+                continue
+            done.add(essay.id)  # duplicate ids in the input are graded once
+            if llm_enabled and not essay.error:
+                texts[essay.id] = essay.text
+            yield essay
+
+    heuristics: Executor = ProcessPoolExecutor(max_workers=workers) if workers > 0 else _InlineExecutor()
+    heuristic_window = 2 * max(1, workers)
+    llm_window = 2 * max(1, llm_concurrency)
+    chunks = _chunks(pending_essays(), max(1, chunk_size))
+    in_flight: Set[Future] = set()
+    llm_futures: Dict[Future, Dict[str, Any]] = {}
+
+    with output.open("a", encoding="utf-8") as out:
+
+        def write(record: Dict[str, Any]) -> None:
+            nonlocal written, failed
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            written += 1
+            if record.get("error"):
+                failed += 1
+
+        try:
+            exhausted = False
+            while True:
+                # Only pull more input when the LLM stage has room, so a slow API applies
+                # back-pressure all the way to the reader instead of queueing essays in memory.
+                while not exhausted and len(in_flight) < heuristic_window and len(llm_futures) < llm_window:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        break
+                    in_flight.add(heuristics.submit(_grade_chunk, chunk))
+                if not in_flight and not llm_futures:
+                    break
+
+                finished, _ = wait(in_flight | set(llm_futures), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    if future in llm_futures:
+                        record, result = llm_futures.pop(future), future.result()
+                        if result.error:
+                            failed += 1
+                            print(f"LLM 피드백 실패 (다음 실행에서 다시 채점): {record['id']}: {result.error}", file=sys.stderr)
+                        else:
+                            write(_attach_llm(record, result))
+                        continue
+                    in_flight.discard(future)
+                    for record in future.result():
+                        text = texts.pop(record["id"], None)
+                        if llm_enabled and scheduler is not None and text is not None:
+                            llm_calls += 1
+                            request = cover_letter_request(cover_letter_prompt(text, record.get("job_title")))
+                            llm_futures[scheduler.submit_threadsafe(request)] = record
+                        else:
+                            write(record)
+        finally:
+            for future in in_flight | set(llm_futures):
+                future.cancel()
+            heuristics.shutdown(wait=True, cancel_futures=True)
+            if scheduler is not None:
+                scheduler.close()
+            out.flush()
+            os.fsync(out.fileno())
+
+    return BatchSummary(
+        total=total,
+        skipped=skipped,
+        written=written,
+        failed=failed,
+        llm_calls=llm_calls,
+        elapsed_sec=round(time.perf_counter() - started, 3),
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m job_tutor.batch", description="자기소개서 일괄 채점 (JSONL 출력)")
+    parser.add_argument("source", help=".txt 파일이 있는 디렉터리 또는 JSONL 파일")
+    parser.add_argument("-o", "--output", required=True, help="결과 JSONL 경로 (이미 있으면 이어서 채점)")
+    parser.add_argument("--workers", type=int, default=None, help="휴리스틱 프로세스 수 (기본 CPU 수, 0=현재 프로세스)")
+    parser.add_argument("--chunk-size", type=int, default=32, help="프로세스에 한 번에 넘길 자기소개서 수")
+    parser.add_argument("--llm", action="store_true", help="LLM 피드백 포함 (OPENAI_API_KEY 필요)")
+    parser.add_argument("--llm-concurrency", type=int, default=4, help="동시 LLM 요청 수")
+    parser.add_argument("--rpm", type=float, default=500.0, help="분당 LLM 요청 수 상한")
+    parser.add_argument("--tpm", type=float, default=200_000.0, help="분당 토큰 수 상한(추정)")
+    parser.add_argument("--no-resume", action="store_true", help="기존 출력 파일을 지우고 처음부터 채점")
+    parser.add_argument("--no-cache", action="store_true", help="LLM 응답 캐시 사용 안 함")
+    args = parser.parse_args(argv)
+
+    summary = grade_batch(
+        args.source,
+        args.output,
+        workers=args.workers,
+        enable_llm=args.llm,
+        llm_concurrency=args.llm_concurrency,
+        chunk_size=args.chunk_size,
+        resume=not args.no_resume,
+        use_cache=not args.no_cache,
+        requests_per_min=args.rpm,
+        tokens_per_min=args.tpm,
+    )
+    print(
+        f"전체 {summary.total} · 건너뜀(이미 채점) {summary.skipped} · 기록 {summary.written} · "
+        f"오류 {summary.failed} · LLM 호출 {summary.llm_calls} · {summary.elapsed_sec:.2f}초",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
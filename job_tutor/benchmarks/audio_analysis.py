@@ -0,0 +1,101 @@
+"""Chunked WAV analysis on a long synthetic recording.
+
+Writes a synthetic interview recording (speech-like bursts separated by known pauses over
+low background noise), then runs ``analyze_audio_wav`` under tracemalloc to show that
+peak memory depends on the block size, not the recording length. Detected pauses are
+compared with the ground truth.
+
+    python benchmarks/audio_analysis.py --minutes 60
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import wave
+from pathlib import Path
+from typing import List, Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.interview_assistant import analyze_audio_wav  # noqa: E402
+
+RATE = 16000
+
+
+def write_recording(path: str, minutes: float, seed: int = 0) -> List[Tuple[float, float]]:
+    """Stream a synthetic recording to ``path``; returns the true pauses (start, end) in seconds."""
+    rng = np.random.default_rng(seed)
+    pauses: List[Tuple[float, float]] = []
+    t = 0.0
+    total = minutes * 60.0
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(RATE)
+        while t < total:
+            # 2-8 s of speech: noise under a 4 Hz syllable envelope that never fully closes.
+            speech = float(rng.uniform(2.0, 8.0))
+            n = int(speech * RATE)
+            env = 0.55 + 0.45 * np.sin(2 * np.pi * 4.0 * np.arange(n) / RATE + rng.uniform(0, 6.28))
+            burst = rng.normal(0, 0.1, n) * env
+            # then a pause of 0.4-3 s of background noise (-60 dBFS)
+            pause = float(rng.uniform(0.4, 3.0))
+            m = int(pause * RATE)
+            quiet = rng.normal(0, 0.001, m)
+            pauses.append((t + speech, t + speech + pause))
+            block = np.concatenate([burst, quiet])
+            wf.writeframes((np.clip(block, -1, 1) * 32767).astype("<i2").tobytes())
+            t += speech + pause
+    return pauses[:-1]  # the final silence is trailing, not a pause between speech
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chunked WAV analysis benchmark")
+    parser.add_argument("--minutes", type=float, default=60.0)
+    parser.add_argument("--keep", action="store_true", help="keep the generated WAV")
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        start = time.perf_counter()
+        truth = write_recording(path, args.minutes)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"wrote {args.minutes:g} min, {size_mb:.1f} MB in {time.perf_counter() - start:.1f} s")
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = analyze_audio_wav(path, approx_text_length_chars=int(args.minutes * 300))
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        detected = result.pauses
+        matched = sum(
+            1 for t0, t1 in truth if any(abs(p.start_sec - t0) < 0.1 and abs(p.end_sec - t1) < 0.1 for p in detected)
+        )
+        true_voiced = args.minutes * 60.0 - sum(t1 - t0 for t0, t1 in truth)
+        print(f"analysis: {elapsed:.2f} s ({result.duration_sec / elapsed:.0f}x real time), peak traced memory {peak / 1e6:.2f} MB")
+        print(
+            f"pauses: detected {len(detected)}, true {len(truth)}, matched within 100 ms {matched}; "
+            f"longest {result.longest_pause_sec:.2f} s (true {max(t1 - t0 for t0, t1 in truth):.2f} s)"
+        )
+        print(
+            f"voiced {result.voiced_sec:.0f} s (true ~{true_voiced:.0f} s), speech ratio {result.speech_ratio}, "
+            f"{result.chars_per_voiced_min} chars/voiced min vs {result.approx_chars_per_min} chars/min overall"
+        )
+    finally:
+        if args.keep:
+            print(f"kept {path}")
+        else:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
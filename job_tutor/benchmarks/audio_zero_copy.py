@@ -0,0 +1,98 @@
+"""Interview upload handling: temp-file flow vs. in-memory flow.
+
+Simulates the interview tab on an uploaded WAV (a ``BytesIO`` like Streamlit's
+``UploadedFile``) against the local OpenAI stub:
+
+* temp file: write ``getbuffer()`` to a NamedTemporaryFile, analyse and transcribe by path
+* in memory: pass ``getbuffer()`` straight to ``analyze_audio_wav`` and the transcription
+
+Prints wall time, bytes written to disk, peak traced allocations and leftover temp files.
+
+    python benchmarks/audio_zero_copy.py --seconds 50 300
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from audio_analysis import write_recording  # noqa: E402
+from fake_openai import start_fake_server  # noqa: E402
+
+
+def _measure(fn: Callable[[], int]) -> Tuple[float, int, int]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = fn()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, written, peak
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, nargs="+", default=[50.0, 300.0])
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server()
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["JOB_TUTOR_STT_CHAIN"] = "openai:whisper-1"
+
+    from core.interview_assistant import analyze_audio_wav, transcribe_with_timestamps  # noqa: E402
+
+    tmpdir = tempfile.gettempdir()
+    ok = True
+    try:
+        for seconds in args.seconds:
+            fd, wav = tempfile.mkstemp(suffix=".wav")
+            os.close(fd)
+            write_recording(wav, seconds / 60.0)
+            with open(wav, "rb") as f:
+                upload = io.BytesIO(f.read())
+            os.remove(wav)
+            size = upload.getbuffer().nbytes
+
+            def temp_file_flow() -> int:
+                with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
+                    tmp.write(upload.getbuffer())
+                    path = tmp.name
+                try:
+                    analyze_audio_wav(path, approx_text_length_chars=500)
+                    assert transcribe_with_timestamps(path) is not None
+                finally:
+                    os.remove(path)
+                return size
+
+            def in_memory_flow() -> int:
+                view = upload.getbuffer()
+                analyze_audio_wav(view, approx_text_length_chars=500)
+                assert transcribe_with_timestamps(view) is not None
+                view.release()
+                return 0
+
+            temp_file_flow()  # warm the SDK client and imports
+            before = set(os.listdir(tmpdir))
+            print(f"{seconds:.0f}s upload ({size / 1e6:.1f} MB)")
+            for name, fn in (("temp file", temp_file_flow), ("in memory", in_memory_flow)):
+                elapsed, written, peak = _measure(fn)
+                print(f"  {name:10s} {elapsed * 1000:7.1f} ms  disk {written / 1e6:5.1f} MB  peak alloc {peak / 1e6:5.1f} MB")
+            leftover = set(os.listdir(tmpdir)) - before
+            ok = ok and not leftover
+            print(f"  temp files left: {len(leftover)}")
+    finally:
+        server.shutdown()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Incremental cover-letter re-analysis vs full re-analysis on small edits.
+
+Builds a ~3,000-character essay, applies random single-sentence edits (word swap, insert,
+delete), and after each edit checks that ``IncrementalCoverLetterAnalyzer.update`` gives
+the same result as ``analyze_cover_letter``. Then times both, and with ``--llm`` compares
+the prompt size sent to a local fake LLM server.
+
+    python benchmarks/cover_letter_incremental.py --edits 300 --llm
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from cover_letter_scan import make_essay  # noqa: E402
+from core.cover_letter import (  # noqa: E402
+    IncrementalCoverLetterAnalyzer,
+    _sentence_spans,
+    analyze_cover_letter,
+)
+
+
+def make_document(rng: random.Random, chars: int) -> str:
+    paragraphs = []
+    while sum(len(p) for p in paragraphs) < chars:
+        paragraphs.append(make_essay(rng, rng.randint(250, 450)))
+    return "\n\n".join(paragraphs)
+
+
+def edit(rng: random.Random, text: str) -> str:
+    spans = _sentence_spans(text)
+    a, b = spans[rng.randrange(len(spans))]
+    sentence = text[a:b]
+    kind = rng.choice(["swap", "swap", "insert", "delete"])
+    if kind == "swap":
+        words = sentence.split(" ")
+        words[rng.randrange(len(words))] = rng.choice(["성과", "20%", "열심히", "개선되었다", "주도했습니다"])
+        return text[:a] + " ".join(words) + text[b:]
+    if kind == "insert":
+        return text[:b] + " 그 결과 매출이 12% 늘었습니다." + text[b:]
+    return text[:a] + text[b:].lstrip(" ") if len(spans) > 3 else text
+
+
+def _ms(fn: Callable[[], object]) -> float:
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Incremental cover-letter analysis benchmark")
+    parser.add_argument("--edits", type=int, default=300)
+    parser.add_argument("--chars", type=int, default=3000)
+    parser.add_argument("--llm", action="store_true", help="also compare LLM prompt sizes against a fake server")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    text = make_document(rng, args.chars)
+    analyzer = IncrementalCoverLetterAnalyzer()
+    analyzer.update(text)
+    print(f"essay: {len(text)} chars, {len(_sentence_spans(text))} sentences")
+
+    full_ms: List[float] = []
+    incr_ms: List[float] = []
+    mismatches = 0
+    for _ in range(args.edits):
+        text = edit(rng, text)
+        full_ms.append(_ms(lambda: analyze_cover_letter(text, enable_llm=False)))
+        incr_ms.append(_ms(lambda: analyzer.update(text)))
+        expected = analyze_cover_letter(text, enable_llm=False)
+        if analyzer.update(text) != expected:
+            mismatches += 1
+
+    def row(name: str, samples: List[float]) -> str:
+        p95 = sorted(samples)[int(0.95 * len(samples)) - 1]
+        return f"{name:<22} median {statistics.median(samples):7.3f} ms   p95 {p95:7.3f} ms"
+
+    print(f"edits: {args.edits}, mismatches vs full analysis: {mismatches}")
+    print(row("full re-analysis", full_ms))
+    print(row("incremental update", incr_ms))
+    print(f"speedup (median): {statistics.median(full_ms) / statistics.median(incr_ms):.1f}x")
+
+    if args.llm:
+        from fake_openai import start_fake_server
+
+        server, url = start_fake_server(latency_sec=0.0)
+        os.environ.update(
+            OPENAI_BASE_URL=url,
+            OPENAI_API_KEY="sk-fake",
+            JOB_TUTOR_CACHE_PATH=str(Path(tempfile.mkdtemp()) / "cache.sqlite3"),
+        )
+        llm_analyzer = IncrementalCoverLetterAnalyzer()
+        llm_analyzer.update(text, enable_llm=True, use_cache=False)
+        first = llm_analyzer.last_update
+        sizes: List[int] = []
+        modes: List[str] = []
+        for _ in range(20):
+            text = edit(rng, text)
+            llm_analyzer.update(text, enable_llm=True, use_cache=False)
+            assert llm_analyzer.last_update is not None
+            sizes.append(llm_analyzer.last_update.llm_prompt_chars)
+            modes.append(str(llm_analyzer.last_update.llm_mode))
+        print(
+            f"LLM prompt chars: first (full) {first.llm_prompt_chars if first else 0}, "
+            f"after edits median {statistics.median(sizes):.0f} "
+            f"({', '.join(f'{m} {modes.count(m)}' for m in sorted(set(modes)))})"
+        )
+        server.shutdown()
+
+    if mismatches:
+        sys.exit("incremental result differs from full analysis")
+
+
+if __name__ == "__main__":
+    main()
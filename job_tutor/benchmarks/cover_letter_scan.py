@@ -0,0 +1,126 @@
+"""Cover-letter keyword scanning: per-pattern passes vs the single precompiled scanner.
+
+Generates synthetic Korean essays sprinkled with STAR keywords, filler words, passive
+endings and numbers, checks that both approaches agree, then times them.
+
+    python benchmarks/cover_letter_scan.py --essays 10000
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.cover_letter import (  # noqa: E402
+    FILLER_WORDS,
+    NUMBER_PATTERN,
+    PASSIVE_PATTERNS,
+    STAR_KEYWORDS,
+    analyze_cover_letter,
+    scan_cover_letter,
+)
+
+FRAGMENTS = (
+    sum(STAR_KEYWORDS.values(), [])
+    + FILLER_WORDS
+    + ["배우게 되었습니다", "개선되었다", "도입되어", "전환율 18%", "리드 120건", "3.5배", "2주"]
+)
+
+# Keywords glued to each other or to the surrounding word, where matches overlap
+EDGE_CASES = [
+    "업무 성과제고를 위해 노력했습니다.",
+    "결과제출 과정에서 배웠습니다.",
+    "문제상황에서 목표지표를 세웠습니다.",
+    "성실노력열심히 일했고 협업소통을 중시했습니다.",
+    "배경계기상황을 설명하고 조치행동실행 결과성과를 회고했습니다.",
+    "120건을 처리하게 되었습니다되어 3.5배 성장했다.",
+    "매출이 3배경쟁사를 앞질렀습니다.",
+]
+
+Summary = Tuple[frozenset, Dict[str, bool], bool, bool]
+
+
+def make_essay(rng: random.Random, chars: int, density: float = 0.04) -> str:
+    parts: List[str] = []
+    size = 0
+    while size < chars:
+        word = "".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(1, 5)))
+        if rng.random() < density:
+            word = rng.choice(FRAGMENTS)
+        if rng.random() < 0.1:
+            word += rng.choice(["다.", "요.", "!", "?"])
+        # Sometimes glue the word to the previous one so keywords end up adjacent or compound
+        if parts and rng.random() < 0.2:
+            parts[-1] += word
+        else:
+            parts.append(word)
+        size += len(word) + 1
+    return " ".join(parts)
+
+
+def legacy_summary(text: str) -> Summary:
+    """What analyze_cover_letter used to compute: one scan per keyword and per regex."""
+    filler = frozenset(w for w in FILLER_WORDS if w in text)
+    star = {k: any(kw in text for kw in kws) for k, kws in STAR_KEYWORDS.items()}
+    passive = bool([p for p in PASSIVE_PATTERNS if re.search(p, text)])
+    numbers = bool(NUMBER_PATTERN.findall(text))
+    return filler, star, passive, numbers
+
+
+def scanner_summary(text: str) -> Summary:
+    filler = set()
+    star = {k: False for k in STAR_KEYWORDS}
+    passive = numbers = False
+    for h in scan_cover_letter(text):
+        if h.kind == "star":
+            star[h.label] = True
+        elif h.kind == "filler":
+            filler.add(h.label)
+        elif h.kind == "passive":
+            passive = True
+        else:
+            numbers = True
+    return frozenset(filler), star, passive, numbers
+
+
+def _time(fn, essays: List[str], repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for e in essays:
+            fn(e)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cover-letter scanner benchmark")
+    parser.add_argument("--essays", type=int, default=10000)
+    parser.add_argument("--chars", type=int, default=1500, help="approximate length of each essay")
+    parser.add_argument("--density", type=float, default=0.04, help="share of words that are keywords/numbers")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    essays = EDGE_CASES + [make_essay(rng, args.chars, args.density) for _ in range(args.essays)]
+    mismatches = sum(1 for e in essays if legacy_summary(e) != scanner_summary(e))
+
+    legacy = _time(legacy_summary, essays)
+    single = _time(scanner_summary, essays)
+    full = _time(lambda e: analyze_cover_letter(e, enable_llm=False), essays)
+
+    n = len(essays)
+    print(f"essays: {n} x ~{args.chars} chars, mismatches: {mismatches}")
+    print(f"{'per-pattern passes':<22} {legacy:7.2f} s  {legacy / n * 1e6:8.1f} us/essay")
+    print(f"{'single-pass scanner':<22} {single:7.2f} s  {single / n * 1e6:8.1f} us/essay  ({legacy / single:.1f}x)")
+    print(f"{'analyze_cover_letter':<22} {full:7.2f} s  {full / n * 1e6:8.1f} us/essay  (no LLM)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Minimal OpenAI-compatible HTTP stub for local benchmarks.
+
+Point the SDK at it with ``OPENAI_BASE_URL=http://127.0.0.1:<port>/v1``. It can inject
+latency jitter, random 429/503 responses and a server-side concurrency limit, and counts
+what it served in ``FakeStats``. Transcription requests take time proportional to the
+uploaded WAV's duration, honour ``response_format=verbose_json`` with 5-second segments, and
+uploads above ``max_upload_bytes`` get 413 like the real 25 MB limit.
+
+    python benchmarks/fake_openai.py --port 9200 --latency 0.05 --rate-limit 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import random
+import threading
+import time
+import wave
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional, Tuple
+
+
+@dataclass
+class FakeStats:
+    requests: int = 0
+    ok: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    accepted_at: List[float] = field(default_factory=list)  # monotonic times of 200 responses
+    audio_sec: float = 0.0  # seconds of audio transcribed
+    upload_bytes: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency_sec: float = 0.0
+    jitter_sec: float = 0.0
+    rate_limit_prob: float = 0.0
+    error_prob: float = 0.0
+    max_concurrent: Optional[int] = None
+    retry_after: Optional[float] = None
+    transcribe_rtf: float = 0.0  # extra seconds of latency per second of uploaded audio
+    max_upload_bytes: Optional[int] = None
+    fail_models: Tuple[str, ...] = ()  # transcription models that always answer 503
+    stats: FakeStats = FakeStats()
+    body: bytes = b""
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002
+        return
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: int, code: str, retry_after: Optional[float] = None) -> None:
+        body = json.dumps({"error": {"message": code, "type": code, "code": code}}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if retry_after is not None:
+            self.send_header("Retry-After", f"{retry_after:g}")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        self.body = self.rfile.read(length) if length else b""
+        stats = self.stats
+        with stats.lock:
+            stats.requests += 1
+            stats.in_flight += 1
+            stats.max_in_flight = max(stats.max_in_flight, stats.in_flight)
+            over_limit = self.max_concurrent is not None and stats.in_flight > self.max_concurrent
+        try:
+            self._handle(over_limit)
+        finally:
+            with stats.lock:
+                stats.in_flight -= 1
+
+    def _handle(self, over_limit: bool) -> None:
+        stats = self.stats
+        if over_limit or random.random() < self.rate_limit_prob:
+            with stats.lock:
+                stats.rate_limited += 1
+            self._send_error(429, "rate_limit_exceeded", self.retry_after)
+            return
+        time.sleep(self.latency_sec + random.uniform(0, self.jitter_sec))
+        if random.random() < self.error_prob:
+            with stats.lock:
+                stats.server_errors += 1
+            self._send_error(503, "server_overloaded")
+            return
+        path = self.path.split("?", 1)[0]
+        if path.endswith("/chat/completions"):
+            with stats.lock:
+                stats.ok += 1
+                stats.accepted_at.append(time.monotonic())
+            self._send_json(200, {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "fake",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "핵심 요약: 구체적인 수치를 보강하세요."},
+                }],
+                "usage": {"prompt_tokens": 50, "completion_tokens": 20, "total_tokens": 70},
+            })
+        elif path.endswith("/audio/transcriptions"):
+            self._transcribe()
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def _transcribe(self) -> None:
+        stats = self.stats
+        if self.max_upload_bytes is not None and len(self.body) > self.max_upload_bytes:
+            self._send_error(413, "file_too_large")
+            return
+        if any(f'name="model"\r\n\r\n{m}\r\n'.encode() in self.body for m in self.fail_models):
+            with stats.lock:
+                stats.server_errors += 1
+                stats.upload_bytes += len(self.body)
+            self._send_error(503, "model_unavailable")
+            return
+        duration = 0.0
+        riff = self.body.find(b"RIFF")
+        if riff >= 0:
+            try:
+                with wave.open(io.BytesIO(self.body[riff:]), "rb") as wf:
+                    duration = wf.getnframes() / float(wf.getframerate())
+            except (wave.Error, EOFError):
+                pass
+        time.sleep(duration * self.transcribe_rtf)
+        with stats.lock:
+            stats.ok += 1
+            stats.audio_sec += duration
+            stats.upload_bytes += len(self.body)
+            stats.accepted_at.append(time.monotonic())
+        text = "저는 프로젝트에서 팀장 역할을 맡았습니다."
+        if b'name="response_format"\r\n\r\nverbose_json' not in self.body:
+            self._send_json(200, {"text": text})
+            return
+        segments = []
+        t = 0.0
+        while t < duration:
+            end = min(duration, t + 5.0)
+            segments.append({"id": len(segments), "start": round(t, 3), "end": round(end, 3), "text": f"{t:.0f}초 지점: {text}"})
+            t = end
+        self._send_json(200, {
+            "task": "transcribe",
+            "language": "korean",
+            "duration": duration,
+            "text": " ".join(seg["text"] for seg in segments),
+            "segments": segments,
+        })
+
+
+def start_fake_server(
+    port: int = 0,
+    latency_sec: float = 0.0,
+    jitter_sec: float = 0.0,
+    rate_limit_prob: float = 0.0,
+    error_prob: float = 0.0,
+    max_concurrent: Optional[int] = None,
+    retry_after: Optional[float] = None,
+    transcribe_rtf: float = 0.0,
+    max_upload_bytes: Optional[int] = None,
+    fail_models: Tuple[str, ...] = (),
+) -> Tuple[ThreadingHTTPServer, str]:
+    """Start the stub on a daemon thread and return (server, base_url); stats on ``server.stats``."""
+    stats = FakeStats()
+    handler = type("ConfiguredFakeOpenAIHandler", (FakeOpenAIHandler,), {
+        "latency_sec": latency_sec,
+        "jitter_sec": jitter_sec,
+        "rate_limit_prob": rate_limit_prob,
+        "error_prob": error_prob,
+        "max_concurrent": max_concurrent,
+        "retry_after": retry_after,
+        "transcribe_rtf": transcribe_rtf,
+        "max_upload_bytes": max_upload_bytes,
+        "fail_models": tuple(fail_models),
+        "stats": stats,
+    })
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.stats = stats  # type: ignore[attr-defined]
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, bound_port = server.server_address[:2]
+    return server, f"http://{host}:{bound_port}/v1"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake OpenAI server for benchmarks")
+    parser.add_argument("--port", type=int, default=9200)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency up to N seconds")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="probability of answering 429")
+    parser.add_argument("--errors", type=float, default=0.0, help="probability of answering 503")
+    parser.add_argument("--max-concurrent", type=int, default=None, help="answer 429 above N in-flight requests")
+    args = parser.parse_args()
+    server, base_url = start_fake_server(
+        args.port, args.latency, args.jitter, args.rate_limit, args.errors, args.max_concurrent
+    )
+    print(f"fake OpenAI server: {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Per-call overhead of LLMProvider: fresh client per call vs the shared registry.
+
+Runs ``cover_letter_feedback`` against a local zero-latency stub so the measured time
+is almost entirely client construction, connection setup and request plumbing.
+
+    python benchmarks/llm_overhead.py --calls 200
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fake_openai import start_fake_server  # noqa: E402
+
+
+def _time_calls(make_provider: Callable[[], object], calls: int) -> List[float]:
+    samples: List[float] = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        provider = make_provider()
+        out = provider.cover_letter_feedback("자기소개서 본문")  # type: ignore[attr-defined]
+        samples.append(time.perf_counter() - start)
+        assert out, "stub call failed"
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLMProvider per-call overhead")
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server()
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+
+    from core import llm
+
+    def fresh() -> object:
+        # Previous behaviour: a brand-new OpenAI() client (and HTTP pool) per call.
+        llm.close_providers()
+        return llm.LLMProvider()
+
+    try:
+        for name, factory in (("fresh client", fresh), ("shared registry", llm.get_provider)):
+            _time_calls(factory, 5)  # warm-up (imports, first connection)
+            samples = _time_calls(factory, args.calls)
+            print(
+                f"{name:<16} mean {statistics.mean(samples) * 1000:6.2f} ms"
+                f" | p50 {statistics.median(samples) * 1000:6.2f} ms"
+                f" | {args.calls} calls"
+            )
+    finally:
+        llm.close_providers()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""LLMScheduler against a fake server that injects 429s, 503s and latency.
+
+Compares the sequential ``LLMProvider`` loop (which turns every 429 into ``None``) with
+the async scheduler, then checks that the scheduler keeps to its requests/min budget and
+recovers from a server-side concurrency limit. Exits non-zero if any check fails.
+
+    python benchmarks/llm_scheduler.py --requests 100
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from fake_openai import start_fake_server  # noqa: E402
+
+failures: List[str] = []
+
+
+def check(condition: bool, message: str) -> None:
+    print(("  ok   " if condition else "  FAIL ") + message)
+    if not condition:
+        failures.append(message)
+
+
+def _point_sdk_at(base_url: str) -> None:
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["OPENAI_API_KEY"] = "sk-fake"
+
+
+def _report(name: str, scheduler, elapsed: float, results) -> None:
+    s = scheduler.stats
+    p50, p95 = s.percentile(0.5), s.percentile(0.95)
+    retried = sorted(r.retries for r in results)
+    print(
+        f"{name:<28} {elapsed:6.2f} s  ok {s.succeeded}/{s.requests}  retries {s.retries} "
+        f"(max {retried[-1] if retried else 0})  429s {s.rate_limited}  p50 {p50:.3f} s  p95 {p95:.3f} s"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLMScheduler benchmark")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+    n = args.requests
+    os.environ["JOB_TUTOR_CACHE_PATH"] = str(Path(tempfile.mkdtemp()) / "cache.sqlite3")
+
+    from core.llm import LLMProvider, LLMScheduler, close_providers, cover_letter_request
+
+    prompts = [f"자기소개서 {i}번 피드백" for i in range(n)]
+
+    # 1) 20% 429s + 5% 503s, 50-100 ms latency.
+    server, url = start_fake_server(latency_sec=0.05, jitter_sec=0.05, rate_limit_prob=0.2, error_prob=0.05, retry_after=0.05)
+    _point_sdk_at(url)
+    provider = LLMProvider()
+    start = time.perf_counter()
+    sequential = [provider.cover_letter_feedback(p, use_cache=False) for p in prompts]
+    elapsed = time.perf_counter() - start
+    lost = sum(1 for r in sequential if r is None)
+    print(f"{'sequential LLMProvider':<28} {elapsed:6.2f} s  ok {n - lost}/{n}  (SDK retries only, failures -> None)")
+    close_providers()
+
+    scheduler = LLMScheduler(
+        max_concurrency=args.concurrency, requests_per_min=60_000, tokens_per_min=10**7, use_cache=False, base_delay_sec=0.05
+    )
+    start = time.perf_counter()
+    results = scheduler.run_sync([cover_letter_request(p, tag=i) for i, p in enumerate(prompts)])
+    elapsed = time.perf_counter() - start
+    _report(f"scheduler (concurrency {args.concurrency})", scheduler, elapsed, results)
+    check(all(r.text for r in results), "every request succeeds despite injected 429/503")
+    check([r.request.tag for r in results] == list(range(n)), "results come back in input order")
+    check(scheduler.stats.rate_limited > 0 and scheduler.stats.retries >= scheduler.stats.rate_limited, "429s were seen and retried")
+    server.shutdown()
+
+    # 2) Client-side requests/min budget: 600/min = 10 per second.
+    server, url = start_fake_server(latency_sec=0.01)
+    _point_sdk_at(url)
+    budget_n = 40
+    scheduler = LLMScheduler(max_concurrency=args.concurrency, requests_per_min=600, tokens_per_min=10**7, use_cache=False)
+    start = time.perf_counter()
+    results = scheduler.run_sync([cover_letter_request(p) for p in prompts[:budget_n]])
+    elapsed = time.perf_counter() - start
+    _report("scheduler (600 req/min)", scheduler, elapsed, results)
+    times = server.stats.accepted_at  # type: ignore[attr-defined]
+    burst = int(scheduler.request_bucket.capacity)
+    steady = (len(times) - burst - 1) / (times[-1] - times[burst])
+    busiest = max(sum(1 for t in times if t0 <= t < t0 + 1.0) for t0 in times)
+    print(f"  initial burst {burst}, then {steady:.1f} req/s; busiest 1 s window {busiest} requests")
+    check(all(r.text for r in results), "budgeted run completes")
+    check(steady <= 10.5 and busiest <= burst + 11, "stays within 10 req/s after a one-second burst")
+    server.shutdown()
+
+    # 3) Server allows only 4 concurrent requests; the rest get 429 + Retry-After.
+    server, url = start_fake_server(latency_sec=0.05, max_concurrent=4, retry_after=0.1)
+    _point_sdk_at(url)
+    scheduler = LLMScheduler(
+        max_concurrency=args.concurrency, requests_per_min=60_000, tokens_per_min=10**7, use_cache=False, base_delay_sec=0.05
+    )
+    start = time.perf_counter()
+    futures = [scheduler.submit_threadsafe(cover_letter_request(p)) for p in prompts]
+    results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start
+    scheduler.close()
+    _report("scheduler vs server limit 4", scheduler, elapsed, results)
+    check(all(r.text for r in results), "recovers from server-side concurrency limit (submit_threadsafe)")
+    server.shutdown()
+
+    if failures:
+        sys.exit(f"{len(failures)} check(s) failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Test-case throughput: cold interpreter per case vs the warm sandbox pool.
+
+The second scenario makes every tenth case hit the 2 s timeout to show how
+parallel execution keeps one slow case from stalling the rest.
+
+    python benchmarks/sandbox_throughput.py --cases 30 --rounds 3 --parallelism 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.coding_tutor import TestCase, _run_cases, _run_single  # noqa: E402
+from core.sandbox import POOL_SUPPORTED, get_sandbox_pool  # noqa: E402
+
+
+SOLUTION = """\
+import sys
+n = int(sys.stdin.readline())
+nums = list(map(int, sys.stdin.readline().split()))
+print(sum(nums[:n]))
+"""
+
+SLOW_EVERY_TENTH = """\
+import sys, time
+n = int(sys.stdin.readline())
+if n % 10 == 0:
+    time.sleep(5)
+print(sum(map(int, sys.stdin.readline().split())))
+"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="sandbox throughput")
+    parser.add_argument("--cases", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--parallelism", type=int, default=min(4, os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    cases = [
+        TestCase(name=f"TC{i}", stdin=f"{i}\n" + " ".join(str(x) for x in range(i)), expected_stdout=str(sum(range(i))))
+        for i in range(1, args.cases + 1)
+    ]
+
+    def cold() -> None:
+        results = [_run_single(SOLUTION, tc) for tc in cases]
+        assert all(r.passed for r in results)
+
+    def warm() -> None:
+        results, _ = _run_cases(SOLUTION, cases)
+        assert all(r.passed for r in results)
+
+    def warm_parallel() -> None:
+        results, _ = _run_cases(SOLUTION, cases, parallelism=args.parallelism)
+        assert all(r.passed for r in results)
+
+    runners = [("cold interpreter", cold)]
+    if POOL_SUPPORTED:
+        start = time.perf_counter()
+        get_sandbox_pool()
+        print(f"pool start-up (one-off): {(time.perf_counter() - start) * 1000:.0f} ms")
+        runners.append(("warm pool", warm))
+        runners.append((f"warm pool x{args.parallelism}", warm_parallel))
+    else:
+        print("warm pool unavailable on this platform (no os.fork)")
+
+    for name, fn in runners:
+        fn()  # warm-up
+        samples = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            fn()
+            samples.append(time.perf_counter() - start)
+        best = statistics.median(samples)
+        print(f"{name:<17} {args.cases / best:7.1f} cases/s | {best * 1000 / args.cases:6.2f} ms/case")
+
+    if POOL_SUPPORTED:
+        print("with a 2 s timeout on every tenth case:")
+        for parallelism in sorted({1, args.parallelism, 4}):
+            results, stats = _run_cases(SLOW_EVERY_TENTH, cases, parallelism=parallelism)
+            timeouts = sum(1 for r in results if r.exit_code == 124)
+            print(f"  parallelism {parallelism}: {stats.total_sec:6.2f} s wall, {timeouts} timeouts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Transcription fallback with an unhealthy primary model, old path vs. backend chain.
+
+The local OpenAI stub answers 503 for the primary model. ``LLMProvider.transcribe_audio``
+tries the primary on every request before falling back; ``TranscriptionChain`` opens the
+primary's circuit after a few failures and sends the audio straight to the fallback until
+the cool-down ends. Uploaded bytes, wall time and the backend that served each request are
+printed.
+
+    python benchmarks/stt_chain.py --requests 30 --seconds 30
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from audio_analysis import write_recording  # noqa: E402
+from fake_openai import start_fake_server  # noqa: E402
+
+PRIMARY = "gpt-4o-mini-transcribe"
+FALLBACK = "whisper-1"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--seconds", type=float, default=30.0, help="length of each recording")
+    parser.add_argument("--rtf", type=float, default=0.02, help="stub seconds of work per audio second")
+    parser.add_argument("--cooldown", type=float, default=5.0, help="circuit breaker cool-down")
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server(latency_sec=0.05, transcribe_rtf=args.rtf, fail_models=(PRIMARY,))
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+
+    from core.llm import get_provider  # noqa: E402
+    from core.stt_chain import AudioBuffer, TranscriptionChain, make_backend  # noqa: E402
+
+    stats = server.stats  # type: ignore[attr-defined]
+    fd, wav = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        write_recording(wav, args.seconds / 60.0)
+        size = os.path.getsize(wav)
+        print(f"{args.requests} requests of {args.seconds:.0f}s audio ({size / 1e6:.2f} MB), {PRIMARY} answering 503")
+
+        before = stats.upload_bytes
+        started = time.perf_counter()
+        ok = sum(1 for _ in range(args.requests) if get_provider().transcribe_audio(wav))
+        old_sec = time.perf_counter() - started
+        old_mb = (stats.upload_bytes - before) / 1e6
+        print(f"transcribe_audio   {old_sec:6.2f}s  {old_mb:7.1f} MB uploaded  ({old_mb * 1e6 / size / args.requests:.1f} uploads/request incl. SDK retries), {ok} ok")
+
+        chain = TranscriptionChain([make_backend(f"openai:{PRIMARY}"), make_backend(f"openai:{FALLBACK}")], cooldown_sec=args.cooldown)
+        before = stats.upload_bytes
+        started = time.perf_counter()
+        served: Counter = Counter()
+        attempts = 0
+        for _ in range(args.requests):
+            result = chain.transcribe(AudioBuffer.from_file(wav), language=None)
+            served[result.backend] += 1
+            attempts += sum(1 for a in result.attempts if a.error != "circuit open")
+        new_sec = time.perf_counter() - started
+        new_mb = (stats.upload_bytes - before) / 1e6
+        print(f"chain              {new_sec:6.2f}s  {new_mb:7.1f} MB uploaded  ({new_mb * 1e6 / size / args.requests:.1f} uploads/request incl. SDK retries)")
+        print(f"  served by        {dict(served)}, {attempts} backend attempts")
+        for name, h in chain.health().items():
+            latency = f"{h.ewma_latency_sec:.2f}s" if h.ewma_latency_sec is not None else "-"
+            print(f"  {name:30s} {h.state:9s} ok {h.successes:3d}  failed {h.failures:3d}  latency {latency}")
+        passed = served.get(f"openai:{FALLBACK}") == args.requests and new_mb < old_mb
+        print("OK" if passed else "FAIL")
+        return 0 if passed else 1
+    finally:
+        os.remove(wav)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""Cold vs. warm local transcription.
+
+Transcribes the same short WAV several times, first the way ``optional_transcribe`` used
+to (load the model on every call), then through ``STTModelManager`` (load once, reuse),
+and prints load time, first-call time and the warm average.
+
+    python benchmarks/stt_models.py --backend faster-whisper --size base --compute-type int8
+    python benchmarks/stt_models.py --simulate   # no STT package needed: stub backend with fixed costs
+
+``--simulate`` registers a stub whose load and transcription just sleep; it checks the
+manager's bookkeeping (one load per spec, even with concurrent first callers), not model speed.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from audio_analysis import write_recording  # noqa: E402
+from core.stt_models import (  # noqa: E402
+    ModelSpec,
+    STTModelManager,
+    TranscriptSegment,
+    _backends,
+    backend_installed,
+    register_backend,
+)
+
+
+def _simulated(load_sec: float, run_sec: float, warmup_sec: float) -> List[int]:
+    loads = [0]
+
+    def load(spec: ModelSpec) -> Any:
+        loads[0] += 1
+        time.sleep(load_sec)
+        return {"warm": False}
+
+    def run(model: Any, path: str, language: Optional[str]) -> List[TranscriptSegment]:
+        time.sleep(run_sec + (0.0 if model["warm"] else warmup_sec))
+        model["warm"] = True
+        return [TranscriptSegment(0.0, 1.0, "시뮬레이션 전사")]
+
+    register_backend("simulated", load, run, thread_safe=True)
+    return loads
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--backend", default="faster-whisper")
+    parser.add_argument("--size", default="base")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--seconds", type=float, default=10.0, help="length of the test recording")
+    parser.add_argument("--calls", type=int, default=5)
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--load-sec", type=float, default=1.5, help="(--simulate) load cost")
+    parser.add_argument("--run-sec", type=float, default=0.2, help="(--simulate) transcription cost")
+    parser.add_argument("--warmup-sec", type=float, default=0.1, help="(--simulate) extra cost of the first call")
+    args = parser.parse_args()
+
+    loads: Optional[List[int]] = None
+    if args.simulate:
+        args.backend = "simulated"
+        loads = _simulated(args.load_sec, args.run_sec, args.warmup_sec)
+    elif not backend_installed(args.backend):
+        print(f"{args.backend} is not installed; install it or run with --simulate", file=sys.stderr)
+        return 2
+
+    fd, wav = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        write_recording(wav, args.seconds / 60.0)
+        backend = _backends[args.backend]
+        spec = ModelSpec(args.backend, args.size, "cpu", args.compute_type)
+
+        cold: List[float] = []
+        for _ in range(args.calls):
+            started = time.perf_counter()
+            backend.run(backend.load(spec), wav, "ko")
+            cold.append(time.perf_counter() - started)
+        if loads is not None:
+            loads[0] = 0
+
+        manager = STTModelManager(args.size, args.compute_type, "cpu", backends=(args.backend,))
+        warm: List[float] = []
+        for _ in range(args.calls):
+            started = time.perf_counter()
+            result = manager.transcribe(wav)
+            warm.append(time.perf_counter() - started)
+            if result is None:
+                print("transcription failed:", manager.stats(), file=sys.stderr)
+                return 1
+        (_, timing), = manager.stats()
+
+        print(f"model            {spec.label}, {args.calls} calls on {args.seconds:.0f}s of audio")
+        print(f"load every call  total {sum(cold):7.2f}s  mean {sum(cold) / len(cold):6.2f}s/call")
+        print(f"manager          total {sum(warm):7.2f}s  mean {sum(warm) / len(warm):6.2f}s/call")
+        print(f"  load           {timing.load_sec:6.2f}s (once)")
+        print(f"  first call     {timing.first_sec:6.2f}s")
+        if timing.warm_mean_sec is not None:
+            print(f"  warm mean      {timing.warm_mean_sec:6.2f}s")
+
+        if loads is not None:
+            # Concurrent first callers on a fresh manager must share one load.
+            loads[0] = 0
+            fresh = STTModelManager(args.size, args.compute_type, "cpu", backends=(args.backend,))
+            threads = [threading.Thread(target=fresh.transcribe, args=(wav,)) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            ok = loads[0] == 1 and timing.calls == args.calls
+            print(f"concurrent first callers: 8 threads -> {loads[0]} load(s)  {'OK' if ok else 'FAIL'}")
+            return 0 if ok else 1
+        return 0
+    finally:
+        os.remove(wav)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""Chunked parallel transcription of a long recording against the local OpenAI stub.
+
+The stub takes ``--rtf`` seconds per second of uploaded audio and rejects uploads over
+25 MB, like the real endpoint. A long synthetic recording is transcribed as a single
+upload (the old path), then through ``transcribe_recording`` with 1 and N concurrent
+chunk uploads. The stitched segments are checked for order and coverage.
+
+    python benchmarks/transcription_chunked.py --minutes 20 --workers 4
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from audio_analysis import write_recording  # noqa: E402
+from fake_openai import start_fake_server  # noqa: E402
+
+MAX_UPLOAD = 25 * 1024 * 1024
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--minutes", type=float, default=20.0)
+    parser.add_argument("--rtf", type=float, default=0.02, help="stub seconds of work per audio second")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    server, base_url = start_fake_server(transcribe_rtf=args.rtf, max_upload_bytes=MAX_UPLOAD)
+    os.environ["OPENAI_API_KEY"] = "sk-local-stub"
+    os.environ["OPENAI_BASE_URL"] = base_url
+
+    from core.llm import get_provider  # noqa: E402
+    from core.transcription import transcribe_recording  # noqa: E402
+
+    fd, wav = tempfile.mkstemp(suffix=".wav")
+    os.close(fd)
+    try:
+        write_recording(wav, args.minutes)
+        size = os.path.getsize(wav)
+        print(f"recording        {args.minutes:.0f} min, {size / 1e6:.1f} MB, stub rtf {args.rtf}")
+
+        started = time.perf_counter()
+        with open(wav, "rb") as f:
+            whole = get_provider().transcribe_segments(f.read())
+        print(f"single upload    {time.perf_counter() - started:6.2f}s  {'ok' if whole else 'rejected (over 25 MB)'}")
+
+        ok = True
+        for workers in (1, args.workers):
+            result = transcribe_recording(wav, backend="openai", max_workers=workers)
+            if result is None:
+                print(f"workers={workers}: transcription failed")
+                return 1
+            segs = result.segments
+            ordered = all(b.start_sec >= a.start_sec for a, b in zip(segs, segs[1:]))
+            gaps = max((b.start_sec - a.end_sec for a, b in zip(segs, segs[1:])), default=0.0)
+            covered = bool(segs) and segs[0].start_sec < 1.0 and segs[-1].end_sec > result.audio_sec - 1.0
+            passed = ordered and gaps <= 0.001 and covered and not result.failed_chunks
+            ok = ok and passed
+            print(
+                f"chunked x{workers:<2}      {result.elapsed_sec:6.2f}s  {result.chunks} chunks, "
+                f"{len(segs)} segments, max gap {gaps:.3f}s  {'OK' if passed else 'FAIL'}"
+            )
+        stats = server.stats  # type: ignore[attr-defined]
+        print(f"stub             {stats.audio_sec:.0f}s of audio transcribed, {stats.upload_bytes / 1e6:.1f} MB uploaded")
+        return 0 if ok else 1
+    finally:
+        os.remove(wav)
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
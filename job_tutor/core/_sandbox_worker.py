@@ -0,0 +1,204 @@
+"""Warm sandbox worker. Started by ``core.sandbox`` as ``python -I -S -B <this file>``.
+
+Protocol: one JSON object per line on the original stdin/stdout.
+  {"op": "load", "code": "..."}                  -> {"ok": true} | {"ok": false, "error": "..."}
+  {"op": "run", "stdin": "...", "timeout": 2.0, "memory_limit_mb": 256}
+      -> {"stdout", "stderr", "exit_code", "timed_out", "memory_exceeded", "wall_ms", "cpu_ms", "peak_rss_kb"}
+
+The user's code is compiled once per ``load``; every ``run`` forks a child that gets
+fresh copies of the compiled code, redirected stdio and resource limits, so a crash or
+state mutation in one test case cannot leak into the next one or into the worker.
+CPU time and peak RSS come from the child's rusage (``os.wait4``).
+The memory verdict comes from the child itself: a ``MemoryError`` it reports on a private
+status file, or a crash signal while an address-space limit was set. Peak RSS only backs up
+a ``MemoryError`` that the user's code caught and turned into another error.
+Only stdlib modules are used so the worker starts in isolated mode.
+"""
+import io
+import json
+import linecache
+import os
+import resource
+import signal
+import sys
+import tempfile
+import time
+import traceback
+
+SOURCE_NAME = "<solution>"
+MAX_OUTPUT_BYTES = 1024 * 1024
+# An allocation that fails inside C code under RLIMIT_AS usually ends in one of these.
+ALLOCATION_FAILURE_SIGNALS = (signal.SIGSEGV, signal.SIGBUS, signal.SIGABRT, signal.SIGKILL)
+
+
+def _protocol_streams():
+    # Keep private copies of the protocol pipes and point fds 0/1 at /dev/null so
+    # nothing the user's code prints can corrupt the JSON stream.
+    proto_in = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    proto_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    return proto_in, proto_out
+
+
+def _set_limits(timeout, memory_limit_mb):
+    cpu = max(1, int(timeout + 1))
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+    except (ValueError, OSError):
+        pass
+    if memory_limit_mb:
+        limit = int(memory_limit_mb) * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    try:
+        resource.setrlimit(resource.RLIMIT_FSIZE, (MAX_OUTPUT_BYTES * 4, MAX_OUTPUT_BYTES * 4))
+    except (ValueError, OSError):
+        pass
+
+
+def _child(code_obj, stdin_file, stdout_file, stderr_file, status_file, timeout, memory_limit_mb, proto_fds):
+    for fd in proto_fds:
+        os.close(fd)
+    os.dup2(stdin_file.fileno(), 0)
+    os.dup2(stdout_file.fileno(), 1)
+    os.dup2(stderr_file.fileno(), 2)
+    sys.stdin = io.TextIOWrapper(io.BufferedReader(io.FileIO(0, "r", closefd=False)), encoding="utf-8")
+    sys.stdout = io.TextIOWrapper(io.BufferedWriter(io.FileIO(1, "w", closefd=False)), encoding="utf-8")
+    sys.stderr = io.TextIOWrapper(io.FileIO(2, "w", closefd=False), encoding="utf-8", write_through=True)
+    _set_limits(timeout, memory_limit_mb)
+    status = 0
+    try:
+        exec(code_obj, {"__name__": "__main__", "__builtins__": __builtins__})
+    except SystemExit as e:
+        if e.code is None:
+            status = 0
+        elif isinstance(e.code, int):
+            status = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            status = 1
+    except BaseException as e:  # noqa: BLE001 - mirror the interpreter's top level
+        if isinstance(e, MemoryError):
+            # Before printing: formatting the traceback may itself fail at the limit.
+            os.write(status_file.fileno(), b"M")
+        # Drop the worker's own frame so the traceback starts at the user's code.
+        traceback.print_exception(type(e), e, e.__traceback__.tb_next)
+        status = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except BaseException:  # noqa: BLE001
+        pass
+    os._exit(status & 0xFF)
+
+
+def _read_capped(f):
+    f.seek(0)
+    data = f.read(MAX_OUTPUT_BYTES)
+    return data.decode("utf-8", errors="replace")
+
+
+def _peak_rss_kb(rusage):
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    if sys.platform == "darwin":
+        return int(rusage.ru_maxrss // 1024)
+    return int(rusage.ru_maxrss)
+
+
+def _run(code_obj, stdin_text, timeout, memory_limit_mb, proto_fds):
+    with tempfile.TemporaryFile() as fin, tempfile.TemporaryFile() as fout, tempfile.TemporaryFile() as ferr, \
+            tempfile.TemporaryFile() as fstatus:
+        fin.write(stdin_text.encode("utf-8"))
+        fin.flush()
+        fin.seek(0)
+        started = time.monotonic()
+        pid = os.fork()
+        if pid == 0:
+            _child(code_obj, fin, fout, ferr, fstatus, timeout, memory_limit_mb, proto_fds)
+
+        deadline = started + timeout
+        delay = 0.0002
+        timed_out = False
+        while True:
+            done, status, rusage = os.wait4(pid, os.WNOHANG)
+            if done:
+                break
+            if time.monotonic() >= deadline:
+                os.kill(pid, signal.SIGKILL)
+                _, status, rusage = os.wait4(pid, 0)
+                timed_out = True
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, 0.005)
+        wall_ms = (time.monotonic() - started) * 1000
+
+        sig = None
+        if os.WIFSIGNALED(status):
+            sig = os.WTERMSIG(status)
+            exit_code = -sig
+            if sig == signal.SIGXCPU:
+                timed_out = True
+        else:
+            exit_code = os.WEXITSTATUS(status)
+        stderr = _read_capped(ferr)
+        peak_rss_kb = _peak_rss_kb(rusage)
+        fstatus.seek(0)
+        memory_error = fstatus.read(1) == b"M"
+        memory_exceeded = bool(memory_limit_mb) and not timed_out and (
+            memory_error
+            or sig in ALLOCATION_FAILURE_SIGNALS
+            or (exit_code != 0 and "MemoryError" in stderr[-2000:]
+                and peak_rss_kb >= int(memory_limit_mb) * 1024 * 0.9)
+        )
+        return {
+            "stdout": _read_capped(fout),
+            "stderr": stderr,
+            "exit_code": exit_code,
+            "timed_out": timed_out,
+            "memory_exceeded": memory_exceeded,
+            "wall_ms": round(wall_ms, 2),
+            "cpu_ms": round((rusage.ru_utime + rusage.ru_stime) * 1000, 2),
+            "peak_rss_kb": peak_rss_kb,
+        }
+
+
+def main():
+    proto_in, proto_out = _protocol_streams()
+    proto_fds = (proto_in.fileno(), proto_out.fileno())
+    code_obj = None
+    for line in proto_in:
+        msg = json.loads(line)
+        op = msg.get("op")
+        if op == "load":
+            source = msg.get("code", "")
+            try:
+                code_obj = compile(source, SOURCE_NAME, "exec")
+                linecache.cache[SOURCE_NAME] = (len(source), None, source.splitlines(True), SOURCE_NAME)
+                reply = {"ok": True}
+            except SyntaxError as e:
+                code_obj = None
+                reply = {"ok": False, "error": f"SyntaxError: {e.msg} (line {e.lineno})"}
+        elif op == "run":
+            if code_obj is None:
+                reply = {"error": "no code loaded"}
+            else:
+                reply = _run(
+                    code_obj,
+                    msg.get("stdin", ""),
+                    float(msg.get("timeout", 2.0)),
+                    msg.get("memory_limit_mb"),
+                    proto_fds,
+                )
+        else:
+            reply = {"error": f"unknown op: {op}"}
+        proto_out.write(json.dumps(reply) + "\n")
+        proto_out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+from __future__ import annotations
+import io
+import math
+import os
+import wave
+from dataclasses import dataclass, field
+from typing import BinaryIO, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+# Frames are 20 ms: short enough to resolve pauses, long enough for a stable RMS.
+FRAME_MS = 20
+# ~10 s of audio per read; memory use is set by this, not by the recording length.
+BLOCK_SEC = 10.0
+# Silence threshold: never below this absolute level, otherwise this far above the noise floor.
+MIN_SPEECH_DBFS = -50.0
+NOISE_MARGIN_DB = 12.0
+# Noise floor estimate = this percentile of a block's frame levels, smoothed across blocks.
+NOISE_PERCENTILE = 10.0
+DB_EPS = 1e-10
+
+
+# A WAV given as a path, an in-memory buffer (bytes / memoryview, e.g. Streamlit's
+# ``UploadedFile.getbuffer()``) or a seekable binary file object.
+AudioSource = Union[str, "os.PathLike[str]", bytes, bytearray, memoryview, BinaryIO]
+
+
+class MemoryReader(io.RawIOBase):
+    """Read-only, seekable file object over a buffer.
+
+    ``io.BytesIO(memoryview)`` copies the whole buffer; this reads straight from it, so a
+    reader per consumer (``wave``, an HTTP upload) costs nothing until bytes are read.
+    """
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(data).cast("B")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:  # type: ignore[override]
+        n = max(0, min(len(b), len(self._view) - self._pos))
+        b[:n] = self._view[self._pos : self._pos + n]
+        self._pos += n
+        return n
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+
+def is_path(source: AudioSource) -> bool:
+    return isinstance(source, (str, os.PathLike))
+
+
+def as_buffer(source: AudioSource) -> Union[str, "os.PathLike[str]", memoryview]:
+    """Paths stay paths; buffers and file objects become a memoryview (no copy for BytesIO)."""
+    if is_path(source):
+        return source  # type: ignore[return-value]
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).cast("B")
+    if isinstance(source, io.BytesIO):
+        return source.getbuffer()
+    source.seek(0)  # type: ignore[union-attr]
+    return memoryview(source.read())  # type: ignore[union-attr]
+
+
+def open_wav(source: AudioSource) -> wave.Wave_read:
+    """``wave.open`` for any ``AudioSource``; buffers are read in place, never copied whole."""
+    if is_path(source):
+        return wave.open(os.fspath(source), "rb")  # type: ignore[arg-type]
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return wave.open(MemoryReader(source), "rb")
+    source.seek(0)  # type: ignore[union-attr]
+    return wave.open(source, "rb")  # type: ignore[arg-type]
+
+
+@dataclass
+class PauseSegment:
+    start_sec: float
+    end_sec: float
+
+    @property
+    def duration_sec(self) -> float:
+        return round(self.end_sec - self.start_sec, 3)
+
+
+@dataclass
+class SpeechActivity:
+    duration_sec: float
+    voiced_sec: float
+    silence_sec: float
+    speech_ratio: float  # voiced / total
+    mean_rms_dbfs: float
+    noise_floor_dbfs: float
+    pauses: List[PauseSegment] = field(default_factory=list)  # silences between speech >= min_pause_sec
+    first_voice_sec: Optional[float] = None
+    last_voice_sec: Optional[float] = None
+
+    @property
+    def longest_pause_sec(self) -> float:
+        return max((p.duration_sec for p in self.pauses), default=0.0)
+
+
+def _to_mono_float(raw: bytes, sampwidth: int, channels: int) -> np.ndarray:
+    """PCM bytes -> mono float32 in [-1, 1]."""
+    if sampwidth == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif sampwidth == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif sampwidth == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        samples = ints.astype(np.float32) / 8388608.0
+    elif sampwidth == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"지원하지 않는 샘플 폭입니다: {sampwidth} bytes")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples
+
+
+def iter_frame_levels(
+    wf: wave.Wave_read,
+    frame_ms: int = FRAME_MS,
+    block_sec: float = BLOCK_SEC,
+):
+    """Yield (first_frame_index, dBFS per frame) for each block read from ``wf``.
+
+    Reads ``block_sec`` of audio at a time; a trailing partial frame is dropped.
+    """
+    rate, channels, width = wf.getframerate(), wf.getnchannels(), wf.getsampwidth()
+    frame_len = max(1, int(rate * frame_ms / 1000))
+    block_frames = max(1, int(block_sec * 1000 / frame_ms)) * frame_len
+    index = 0
+    while True:
+        raw = wf.readframes(block_frames)
+        if not raw:
+            break
+        samples = _to_mono_float(raw, width, channels)
+        n = len(samples) // frame_len
+        if n == 0:
+            break
+        frames = samples[: n * frame_len].reshape(n, frame_len)
+        rms = np.sqrt(np.mean(np.square(frames, dtype=np.float32), axis=1))
+        yield index, 20.0 * np.log10(rms + DB_EPS)
+        index += n
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start/end (exclusive) indices of the True runs in a boolean array."""
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.flatnonzero(np.diff(padded))
+    return edges[0::2], edges[1::2]
+
+
+def analyze_speech_activity(
+    wf: wave.Wave_read,
+    frame_ms: int = FRAME_MS,
+    block_sec: float = BLOCK_SEC,
+    min_pause_sec: float = 0.3,
+    min_speech_dbfs: float = MIN_SPEECH_DBFS,
+    noise_margin_db: float = NOISE_MARGIN_DB,
+) -> SpeechActivity:
+    """Single streaming pass over a WAV: per-frame RMS, voiced/silent frames and pauses.
+
+    A frame is voiced when its level is above ``max(min_speech_dbfs, noise floor +
+    noise_margin_db)``. The noise floor is the 10th percentile of each block's levels,
+    tracked with a fast-down/slow-up filter so one loud block does not raise it. Only
+    per-block arrays and the list of pauses are held in memory.
+    """
+    frame_sec = frame_ms / 1000.0
+    min_pause_frames = max(1, int(round(min_pause_sec / frame_sec)))
+
+    total = voiced = 0
+    level_sum = 0.0
+    floor: Optional[float] = None
+    first_voice: Optional[int] = None
+    last_voice: Optional[int] = None
+    silence_start: Optional[int] = None  # open silent run carried across blocks
+    pauses: List[PauseSegment] = []
+
+    for start, levels in iter_frame_levels(wf, frame_ms, block_sec):
+        block_floor = float(np.percentile(levels, NOISE_PERCENTILE))
+        floor = block_floor if floor is None or block_floor < floor else 0.8 * floor + 0.2 * block_floor
+        threshold = max(min_speech_dbfs, floor + noise_margin_db)
+        is_voiced = levels > threshold
+
+        n = len(levels)
+        total += n
+        voiced += int(np.count_nonzero(is_voiced))
+        level_sum += float(levels.sum())
+
+        run_starts, run_ends = _runs(is_voiced)
+        if len(run_starts) == 0:
+            if silence_start is None:
+                silence_start = start
+            continue
+        gaps = [(start + int(e), start + int(s)) for e, s in zip(run_ends[:-1], run_starts[1:])]
+        if first_voice is None:
+            first_voice = start + int(run_starts[0])  # leading silence is not a pause
+        else:
+            # Silence before this block's first voiced frame closes a run that may have begun earlier.
+            gap_start = silence_start if silence_start is not None else start
+            gaps.insert(0, (gap_start, start + int(run_starts[0])))
+        for g0, g1 in gaps:
+            if g1 - g0 >= min_pause_frames:
+                pauses.append(PauseSegment(round(g0 * frame_sec, 3), round(g1 * frame_sec, 3)))
+        last_voice = start + int(run_ends[-1]) - 1
+        silence_start = start + int(run_ends[-1]) if run_ends[-1] < n else None
+
+    duration = total * frame_sec
+    voiced_sec = voiced * frame_sec
+    return SpeechActivity(
+        duration_sec=round(duration, 3),
+        voiced_sec=round(voiced_sec, 3),
+        silence_sec=round(duration - voiced_sec, 3),
+        speech_ratio=round(voiced_sec / duration, 4) if duration else 0.0,
+        mean_rms_dbfs=round(level_sum / total, 2) if total else -math.inf,
+        noise_floor_dbfs=round(floor, 2) if floor is not None else -math.inf,
+        pauses=pauses,
+        first_voice_sec=round(first_voice * frame_sec, 3) if first_voice is not None else None,
+        last_voice_sec=round((last_voice + 1) * frame_sec, 3) if last_voice is not None else None,
+    )
@@ -1,12 +1,21 @@
 from __future__ import annotations
 import ast
+import hashlib
+import os
 import subprocess
 import sys
 import tempfile
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
 
-from .llm import LLMProvider
+from .complexity import EmpiricalComplexity, profile_growth, scale_stdin
+from .llm import get_provider
+from .sandbox import RunOutput, get_sandbox_pool
+from .static_checks import Finding, analyze_tree
 
 
 @dataclass
@@ -24,6 +33,10 @@ class TestResult:
     stderr: str
     exit_code: int
     hint: Optional[str]
+    skipped: bool = False
+    wall_ms: Optional[float] = None
+    cpu_ms: Optional[float] = None
+    peak_rss_kb: Optional[int] = None
 
 
 @dataclass
@@ -33,6 +46,16 @@ class StaticAnalysis:
     complexity_estimate: str
     detected_patterns: List[str]
     warnings: List[str]
+    findings: List[Finding] = field(default_factory=list)
+
+
+@dataclass
+class ExecutionStats:
+    total_sec: float
+    cases_per_sec: float
+    latencies_ms: List[Optional[float]]
+    parallelism: int
+    skipped: int
 
 
 @dataclass
@@ -40,6 +63,8 @@ class TutorResponse:
     static: StaticAnalysis
     results: List[TestResult]
     llm_hint: Optional[str]
+    stats: Optional[ExecutionStats] = None
+    empirical: Optional[EmpiricalComplexity] = None
 
 
 COMMON_HINTS = [
@@ -48,55 +73,34 @@ COMMON_HINTS = [
     ("ValueError", "입력 파싱 시 공백/개행/형 변환(int/float) 부분을 점검하세요."),
     ("RecursionError", "재귀 깊이를 줄이거나 반복문으로 전환을 고려하세요."),
     ("Timeout", "시간 제한에 걸렸습니다. 알고리즘 복잡도를 낮추거나 I/O를 최적화하세요."),
+    ("Memory limit exceeded", "메모리 제한을 초과했습니다. 불필요한 리스트 복사/전체 입력 저장을 줄이고 제너레이터나 더 작은 자료구조를 고려하세요."),
+    ("Sandbox worker crashed", "실행 환경이 비정상 종료되었습니다. 프로세스 종료(os.kill/os._exit)나 시그널 조작 코드를 제거하세요."),
 ]
 
 
-def _estimate_complexity(tree: ast.AST) -> Tuple[str, List[str]]:
-    total_loops = 0
-    detected: List[str] = []
-    function_stack: List[str] = []
-
-    def visit(node: ast.AST, loop_depth: int = 0) -> None:
-        nonlocal total_loops
-        if isinstance(node, (ast.For, ast.While)):
-            total_loops += 1
-            if loop_depth >= 1:
-                detected.append("중첩 루프 감지")
-            for child in ast.iter_child_nodes(node):
-                visit(child, loop_depth + 1)
-            return
-
-        if isinstance(node, ast.FunctionDef):
-            function_stack.append(node.name)
-            for child in ast.iter_child_nodes(node):
-                visit(child, loop_depth)
-            function_stack.pop()
-            return
-
-        if isinstance(node, ast.Call):
-            func = node.func
-            if isinstance(func, ast.Name):
-                if func.id.lower() in {"bfs", "dfs"}:
-                    detected.append(f"{func.id.upper()} 호출 감지")
-                if function_stack and func.id == function_stack[-1]:
-                    detected.append("재귀 사용")
-
-        for child in ast.iter_child_nodes(node):
-            visit(child, loop_depth)
-
-    visit(tree)
-
-    if total_loops >= 2:
-        estimate = "O(n^2) 이상 가능성"
-    elif total_loops == 1:
-        estimate = "O(n)~O(n log n) 가능성"
-    else:
-        estimate = "O(n) 또는 더 낮음"
-
-    return estimate, detected
+_STATIC_CACHE_SIZE = 256
+_static_cache: "OrderedDict[str, StaticAnalysis]" = OrderedDict()
+_static_cache_lock = threading.Lock()
 
 
 def _static_analysis(code: str) -> StaticAnalysis:
+    """Parse and lint once per distinct source; Streamlit reruns with unchanged code hit the memo."""
+    key = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    with _static_cache_lock:
+        cached = _static_cache.get(key)
+        if cached is not None:
+            _static_cache.move_to_end(key)
+            return cached
+
+    result = _analyze_source(code)
+    with _static_cache_lock:
+        _static_cache[key] = result
+        while len(_static_cache) > _STATIC_CACHE_SIZE:
+            _static_cache.popitem(last=False)
+    return result
+
+
+def _analyze_source(code: str) -> StaticAnalysis:
     try:
         tree = ast.parse(code)
     except SyntaxError as e:
@@ -108,29 +112,28 @@ def _static_analysis(code: str) -> StaticAnalysis:
             warnings=["문법 오류를 먼저 해결하세요"],
         )
 
-    complexity, detected = _estimate_complexity(tree)
-
-    warnings: List[str] = []
-    source_lower = code.lower()
-    if "input(" in source_lower and "print(" not in source_lower:
-        warnings.append("입력을 받지만 출력을 하지 않을 수 있습니다. 출력 로직을 확인하세요.")
-    if "while true" in source_lower:
-        warnings.append("무한 루프 가능성: 종료 조건을 확인하세요.")
-
+    analyzer = analyze_tree(tree)
     return StaticAnalysis(
         syntax_ok=True,
         syntax_error=None,
-        complexity_estimate=complexity,
-        detected_patterns=detected,
-        warnings=warnings,
+        complexity_estimate=analyzer.complexity_estimate,
+        detected_patterns=analyzer.detected,
+        warnings=analyzer.warnings,
+        findings=analyzer.findings,
     )
 
 
-def _run_single(code: str, tc: TestCase, timeout_sec: int = 2) -> TestResult:
+def _run_single(code: str, tc: TestCase, timeout_sec: float = 2) -> TestResult:
+    """Cold path: one fresh interpreter per test case (used where the warm pool is unavailable).
+
+    Only wall time is measured here; CPU time, peak memory and the memory limit need
+    the POSIX sandbox pool.
+    """
     with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
         f.write(code)
         user_script = f.name
 
+    started = time.perf_counter()
     try:
         proc = subprocess.run(
             [sys.executable, "-I", "-S", "-B", user_script],
@@ -139,10 +142,125 @@ def _run_single(code: str, tc: TestCase, timeout_sec: int = 2) -> TestResult:
             stderr=subprocess.PIPE,
             timeout=timeout_sec,
         )
-        stdout = proc.stdout.decode("utf-8", errors="replace").strip()
-        stderr = proc.stderr.decode("utf-8", errors="replace").strip()
-        exit_code = proc.returncode
     except subprocess.TimeoutExpired:
+        return _to_result(tc, RunOutput("", "", 124, timed_out=True, wall_ms=timeout_sec * 1000))
+    finally:
+        try:
+            os.remove(user_script)
+        except OSError:
+            pass
+
+    return _to_result(tc, RunOutput(
+        stdout=proc.stdout.decode("utf-8", errors="replace"),
+        stderr=proc.stderr.decode("utf-8", errors="replace"),
+        exit_code=proc.returncode,
+        timed_out=False,
+        wall_ms=round((time.perf_counter() - started) * 1000, 2),
+    ))
+
+
+def _default_parallelism() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+def _run_cases(
+    code: str,
+    testcases: List[TestCase],
+    timeout_sec: float = 2,
+    parallelism: int = 1,
+    fail_fast: bool = False,
+    total_timeout_sec: Optional[float] = None,
+    memory_limit_mb: Optional[int] = None,
+) -> Tuple[List[TestResult], ExecutionStats]:
+    """Run test cases on up to ``parallelism`` sandboxes at once.
+
+    Cases are handed out in order from a shared cursor, so results keep the original
+    order. With ``fail_fast`` no new case starts after the first failure; with
+    ``total_timeout_sec`` no case starts after the budget is spent and the running ones
+    get only the remaining time. Cases that never ran are returned as skipped.
+    """
+    pool = get_sandbox_pool()
+    n = len(testcases)
+    results: List[Optional[TestResult]] = [None] * n
+    latencies: List[Optional[float]] = [None] * n
+    cursor = iter(range(n))
+    cursor_lock = threading.Lock()
+    stop = threading.Event()
+    stop_reason: Dict[str, str] = {}  # "fail_fast" or "budget": what set ``stop`` first
+    start = time.monotonic()
+    deadline = start + total_timeout_sec if total_timeout_sec else None
+
+    def next_index() -> Optional[int]:
+        with cursor_lock:
+            return next(cursor, None)
+
+    def halt(reason: str) -> None:
+        with cursor_lock:
+            stop_reason.setdefault("reason", reason)
+        stop.set()
+
+    def drain() -> None:
+        session = pool.session(code) if pool is not None else None
+        try:
+            while not stop.is_set():
+                budget = float(timeout_sec)
+                if deadline is not None:
+                    budget = min(budget, deadline - time.monotonic())
+                    if budget <= 0:
+                        halt("budget")
+                        return
+                i = next_index()
+                if i is None:
+                    return
+                tc = testcases[i]
+                t0 = time.perf_counter()
+                if session is not None:
+                    res = _to_result(tc, session.run(tc.stdin, budget, memory_limit_mb))
+                else:
+                    res = _run_single(code, tc, budget)
+                latencies[i] = round((time.perf_counter() - t0) * 1000, 2)
+                results[i] = res
+                if fail_fast and not res.passed:
+                    # A timeout on a case that only got the leftover budget is the budget's doing.
+                    halt("budget" if res.exit_code == 124 and budget < timeout_sec else "fail_fast")
+        finally:
+            if session is not None:
+                session.close()
+
+    workers = max(1, min(parallelism, n))
+    if pool is not None:
+        pool.reserve(workers)
+    if workers == 1:
+        drain()
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(drain) for _ in range(workers)]:
+                future.result()
+
+    elapsed = time.monotonic() - start
+    if stop_reason.get("reason") == "fail_fast":
+        reason = "앞선 테스트 실패로 실행하지 않았습니다 (fail-fast)."
+    else:
+        reason = "전체 시간 예산을 초과해 실행하지 않았습니다."
+    final: List[TestResult] = []
+    for tc, res in zip(testcases, results):
+        if res is None:
+            res = TestResult(name=tc.name, passed=False, stdout="", stderr="", exit_code=-1, hint=reason, skipped=True)
+        final.append(res)
+    executed = sum(1 for r in final if not r.skipped)
+    stats = ExecutionStats(
+        total_sec=round(elapsed, 3),
+        cases_per_sec=round(executed / elapsed, 1) if elapsed > 0 else 0.0,
+        latencies_ms=latencies,
+        parallelism=workers,
+        skipped=n - executed,
+    )
+    return final, stats
+
+
+def _to_result(tc: TestCase, out: RunOutput) -> TestResult:
+    measurements = dict(wall_ms=out.wall_ms, cpu_ms=out.cpu_ms, peak_rss_kb=out.peak_rss_kb)
+    if out.timed_out:
         return TestResult(
             name=tc.name,
             passed=False,
@@ -150,8 +268,32 @@ def _run_single(code: str, tc: TestCase, timeout_sec: int = 2) -> TestResult:
             stderr="Timeout",
             exit_code=124,
             hint=_hint_from_error("Timeout"),
+            **measurements,
+        )
+    if out.crashed:
+        return TestResult(
+            name=tc.name,
+            passed=False,
+            stdout=out.stdout.strip(),
+            stderr=out.stderr.strip(),
+            exit_code=out.exit_code,
+            hint=_hint_from_error(out.stderr),
+            **measurements,
+        )
+    if out.memory_exceeded:
+        return TestResult(
+            name=tc.name,
+            passed=False,
+            stdout=out.stdout.strip(),
+            stderr="Memory limit exceeded",
+            exit_code=out.exit_code,
+            hint=_hint_from_error("Memory limit exceeded"),
+            **measurements,
         )
 
+    stdout = out.stdout.strip()
+    stderr = out.stderr.strip()
+    exit_code = out.exit_code
     passed = True
     hint: Optional[str] = None
     if tc.expected_stdout is not None:
@@ -170,9 +312,55 @@ def _run_single(code: str, tc: TestCase, timeout_sec: int = 2) -> TestResult:
         stderr=stderr,
         exit_code=exit_code,
         hint=hint,
+        **measurements,
     )
 
 
+def _profile_complexity(
+    code: str,
+    input_generator: Optional[Callable[[int], str]],
+    testcases: List[TestCase],
+    memory_limit_mb: Optional[int] = None,
+) -> EmpiricalComplexity:
+    """Measure the code at growing input sizes with the same sandbox as the test run."""
+    make_input: Callable[[int], Optional[str]]
+    start_n, growth = 16, 2.0
+    if input_generator is not None:
+        make_input = input_generator
+    else:
+        sample = next((tc.stdin for tc in testcases if scale_stdin(tc.stdin, 2) is not None), None)
+        if sample is None:
+            return EmpiricalComplexity(
+                "N/A", 0.0, [], note="입력 생성기가 없고 샘플 입력 형식을 확장할 수 없습니다 (첫 줄이 크기 N인 형식 필요)."
+            )
+        make_input = lambda n: scale_stdin(sample, n)  # noqa: E731
+        if len(sample.split()) == 1:
+            # A lone integer is usually the problem size itself (e.g. fib(n)): grow it gently.
+            start_n, growth = 1, 1.5
+
+    max_run_sec = 0.5
+    pool = get_sandbox_pool()
+    session = pool.session(code) if pool is not None else None
+    probe = TestCase(name="profile", stdin="")
+
+    def measure(stdin: str) -> Optional[float]:
+        if session is not None:
+            out = session.run(stdin, max_run_sec * 4, memory_limit_mb)
+        else:
+            res = _run_single(code, TestCase(name=probe.name, stdin=stdin), max_run_sec * 4)
+            out = RunOutput(res.stdout, res.stderr, res.exit_code, res.exit_code == 124, wall_ms=res.wall_ms)
+        if out.timed_out or out.memory_exceeded or out.exit_code != 0:
+            return None
+        ms = out.cpu_ms if out.cpu_ms is not None else out.wall_ms
+        return max(ms or 0.0, 0.01) / 1000.0
+
+    try:
+        return profile_growth(measure, make_input, start_n=start_n, growth=growth, max_run_sec=max_run_sec)
+    finally:
+        if session is not None:
+            session.close()
+
+
 def _diff_hint(actual: str, expected: str) -> str:
     def norm(s: str) -> List[str]:
         return [line.rstrip() for line in s.splitlines()]
@@ -200,17 +388,37 @@ def tutor(
     testcases: List[TestCase],
     ask_llm_solution: bool = False,
     include_reference: bool = False,
+    use_cache: bool = True,
+    parallelism: Optional[int] = None,
+    fail_fast: bool = False,
+    total_timeout_sec: Optional[float] = None,
+    timeout_sec: float = 2,
+    memory_limit_mb: Optional[int] = None,
+    profile_complexity: bool = False,
+    input_generator: Optional[Callable[[int], str]] = None,
 ) -> TutorResponse:
     static = _static_analysis(code)
 
     results: List[TestResult] = []
-    if static.syntax_ok:
-        for tc in testcases:
-            results.append(_run_single(code, tc))
+    stats: Optional[ExecutionStats] = None
+    if static.syntax_ok and testcases:
+        results, stats = _run_cases(
+            code,
+            testcases,
+            timeout_sec=timeout_sec,
+            parallelism=parallelism or _default_parallelism(),
+            fail_fast=fail_fast,
+            total_timeout_sec=total_timeout_sec,
+            memory_limit_mb=memory_limit_mb,
+        )
+
+    empirical: Optional[EmpiricalComplexity] = None
+    if static.syntax_ok and profile_complexity:
+        empirical = _profile_complexity(code, input_generator, testcases, memory_limit_mb)
 
     llm_hint: Optional[str] = None
     if ask_llm_solution:
-        provider = LLMProvider()
+        provider = get_provider()
         if provider.enabled:
             extra = "\n4) 가능하면 파이썬 레퍼런스 정답 코드를 맨 아래 하나의 코드블록으로 제시하세요." if include_reference else ""
             prompt = (
@@ -219,6 +427,6 @@ def tutor(
                 + extra
                 + "\n\n[문제]\n" + problem + "\n\n[코드]\n" + code
             )
-            llm_hint = provider.coding_hint(prompt)
+            llm_hint = provider.coding_hint(prompt, use_cache=use_cache)
 
-    return TutorResponse(static=static, results=results, llm_hint=llm_hint) 
\ No newline at end of file
+    return TutorResponse(static=static, results=results, llm_hint=llm_hint, stats=stats, empirical=empirical) 
\ No newline at end of file
@@ -0,0 +1,157 @@
+from __future__ import annotations
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# (label, growth function). Each model is fitted as T(n) = a + b * f(n) with a, b >= 0.
+MODELS: List[Tuple[str, Callable[[int], float]]] = [
+    ("O(1)", lambda n: 0.0),
+    ("O(log n)", lambda n: math.log2(n) if n > 1 else 0.0),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(n) if n > 1 else 0.0),
+    ("O(n^2)", lambda n: float(n) * n),
+    ("O(2^n)", lambda n: 2.0 ** n if n <= 60 else math.inf),
+]
+
+
+@dataclass
+class EmpiricalComplexity:
+    best_fit: str
+    confidence: float
+    samples: List[Tuple[int, float]]
+    model_errors: Dict[str, float] = field(default_factory=dict)
+    note: Optional[str] = None
+
+
+def _fit(ns: List[int], ts: List[float], f: Callable[[int], float]) -> float:
+    """Relative RMS error of the best non-negative fit T = a + b*f(n)."""
+    xs = [f(n) for n in ns]
+    if any(math.isinf(x) for x in xs):
+        return math.inf
+    # Weighted least squares on relative error: weights 1/T^2.
+    w = [1.0 / (t * t) for t in ts]
+    sw = sum(w)
+    swx = sum(wi * x for wi, x in zip(w, xs))
+    swy = sum(wi * t for wi, t in zip(w, ts))
+    swxx = sum(wi * x * x for wi, x in zip(w, xs))
+    swxy = sum(wi * x * t for wi, x, t in zip(w, xs, ts))
+    det = sw * swxx - swx * swx
+    a, b = swy / sw, 0.0
+    if det > 1e-12 * max(1.0, sw * swxx):
+        a_ls = (swy * swxx - swx * swxy) / det
+        b_ls = (sw * swxy - swx * swy) / det
+        if a_ls >= 0 and b_ls >= 0:
+            a, b = a_ls, b_ls
+        elif b_ls >= 0 and swxx > 0:
+            a, b = 0.0, swxy / swxx
+    errs = [((a + b * x) - t) / t for x, t in zip(xs, ts)]
+    return math.sqrt(sum(e * e for e in errs) / len(errs))
+
+
+def fit_complexity(samples: List[Tuple[int, float]]) -> EmpiricalComplexity:
+    """Pick the growth model that best explains (n, seconds) samples."""
+    points = [(n, t) for n, t in samples if n > 0 and t > 0]
+    if len(points) < 4:
+        return EmpiricalComplexity("N/A", 0.0, samples, note="측정점이 부족합니다 (최소 4개 크기 필요)")
+    ns = [n for n, _ in points]
+    ts = [t for _, t in points]
+    errors = {label: _fit(ns, ts, f) for label, f in MODELS}
+    ranked = sorted(errors.items(), key=lambda kv: kv[1])
+    (best, best_err), (_, second_err) = ranked[0], ranked[1]
+    if math.isinf(second_err) or second_err <= 0:
+        confidence = 1.0 if best_err < 0.2 else 0.5
+    else:
+        # High when the winner clearly beats the runner-up and explains the data well.
+        separation = 1.0 - best_err / second_err
+        goodness = max(0.0, 1.0 - best_err)
+        confidence = max(0.0, min(1.0, separation * goodness))
+    note = None
+    if ts[-1] / ts[0] < 1.5 and best != "O(1)":
+        note = "실행 시간 변화가 작아 측정 잡음의 영향이 클 수 있습니다."
+    return EmpiricalComplexity(
+        best_fit=best,
+        confidence=round(confidence, 2),
+        samples=samples,
+        model_errors={k: round(v, 4) for k, v in errors.items()},
+        note=note,
+    )
+
+
+def scale_stdin(stdin: str, n: int, seed: int = 0) -> Optional[str]:
+    """Rewrite a sample input to size ``n``, or None if its shape is not recognised.
+
+    Recognised shapes (first token of the first line is the size N):
+      - ``N`` then one line with N tokens        -> one line with n tokens
+      - ``N`` then N lines                       -> n lines
+      - a single integer                         -> ``n``
+    Numeric tokens are resampled uniformly from the sample's value range;
+    other tokens are cycled.
+    """
+    lines = stdin.strip().splitlines()
+    if not lines:
+        return None
+    head = lines[0].split()
+    try:
+        size = int(head[0])
+    except (ValueError, IndexError):
+        return None
+    rng = random.Random(seed)
+
+    def resample(tokens: List[str], count: int) -> List[str]:
+        try:
+            values = [int(t) for t in tokens]
+        except ValueError:
+            return [tokens[i % len(tokens)] for i in range(count)]
+        lo, hi = min(values), max(values)
+        return [str(rng.randint(lo, hi)) for _ in range(count)]
+
+    new_head = " ".join([str(n)] + head[1:])
+    if len(lines) == 1 and len(head) == 1:
+        return str(n)
+    if len(lines) >= 2 and size > 0 and len(lines[1].split()) == size:
+        body = resample(lines[1].split(), n)
+        return "\n".join([new_head, " ".join(body)] + lines[2:]) + "\n"
+    if size > 0 and len(lines) - 1 >= size:
+        rows = lines[1:1 + size]
+        if all(len(r.split()) == 1 for r in rows):
+            body = resample([r.strip() for r in rows], n)
+        else:
+            body = [rows[i % len(rows)] for i in range(n)]
+        return "\n".join([new_head] + body + lines[1 + size:]) + "\n"
+    return None
+
+
+def profile_growth(
+    measure: Callable[[str], Optional[float]],
+    make_input: Callable[[int], Optional[str]],
+    start_n: int = 16,
+    growth: float = 2.0,
+    max_n: int = 1 << 20,
+    max_run_sec: float = 0.5,
+    repeats: int = 3,
+) -> EmpiricalComplexity:
+    """Run at geometrically increasing n until a run gets slow, then fit the curve.
+
+    ``measure(stdin)`` returns seconds for one run, or None when the run failed or
+    timed out; the sweep stops at the first failure or slow run.
+    """
+    samples: List[Tuple[int, float]] = []
+    n = max(1, start_n)
+    while n <= max_n:
+        stdin = make_input(n)
+        if stdin is None:
+            break
+        timings = [measure(stdin) for _ in range(max(1, repeats))]
+        if any(t is None for t in timings):
+            break
+        best = min(t for t in timings if t is not None)
+        samples.append((n, best))
+        if best >= max_run_sec:
+            break
+        n = max(n + 1, int(n * growth))
+    result = fit_complexity(samples)
+    if result.note is None and samples and samples[-1][0] * growth <= max_n and len(samples) < 6:
+        result.note = "큰 입력에서 실행이 실패하거나 느려져 측정 범위가 좁습니다."
+    return result
@@ -1,9 +1,11 @@
 from __future__ import annotations
 import re
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
 
-from .llm import LLMProvider
+from .llm import get_provider
 
 
 @dataclass
@@ -22,6 +24,7 @@ class CoverLetterFeedback:
     suggestions: List[str]
     star_coverage: Dict[str, bool]
     llm_feedback: Optional[str]
+    hits: List["ScanHit"] = field(default_factory=list)
 
 
 STAR_KEYWORDS = {
@@ -42,98 +45,222 @@ PASSIVE_PATTERNS = [
 NUMBER_PATTERN = re.compile(r"\d+([.,]\d+)?(%|퍼센트|배|건|명|원|만원|시간|일|주|달|개|회)?")
 
 
+# A sentence ends at ".", "!" or "?" followed by whitespace (the old "요."/"다." alternatives
+# were already covered by "."). Matching the punctuation itself instead of a lookbehind lets
+# the regex engine skip ahead by first character.
+SENTENCE_END = re.compile(r"[.!?]\s+")
+WORD_PATTERN = re.compile(r"[\w\u3131-\u3163\uAC00-\uD7A3]+")
+PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+LONG_SENTENCE_CHARS = 40
+
+
+def _sentence_spans(text: str) -> List[Tuple[int, int]]:
+    """(start, end) of each sentence in an already stripped ``text``."""
+    spans: List[Tuple[int, int]] = []
+    pos = 0
+    for m in SENTENCE_END.finditer(text):
+        spans.append((pos, m.start() + 1))
+        pos = m.end()
+    if pos < len(text):
+        spans.append((pos, len(text)))
+    return spans
+
+
 def _split_sentences_kr(text: str) -> List[str]:
     # Very simple Korean sentence splitter (avoid variable-width lookbehind)
-    candidates = re.split(
-        r"(?<=\.)\s+|(?<=!)\s+|(?<=\?)\s+|(?<=\uC694\.)\s+|(?<=\uB2E4\.)\s+",
-        text.strip(),
-    )
-    sentences = [s.strip() for s in candidates if s.strip()]
-    return sentences
+    text = text.strip()
+    return [text[a:b] for a, b in _sentence_spans(text)]
 
 
 def _count_words_kr(text: str) -> int:
-    tokens = re.findall(r"[\w\u3131-\u3163\uAC00-\uD7A3]+", text)
-    return len(tokens)
+    return len(WORD_PATTERN.findall(text))
 
 
-def _detect_star(text: str) -> Dict[str, bool]:
-    coverage: Dict[str, bool] = {k: False for k in ["S", "T", "A", "R"]}
+def _literal_alternatives() -> Dict[str, List[Tuple[str, str, str, int]]]:
+    """keyword -> every (kind, label, word, offset) hit implied by matching that keyword.
+
+    A match on "문제 상황" also counts the shorter "문제"/"상황" it contains, so taking the
+    longest literal at each position loses nothing.
+    """
+    owners: Dict[str, List[Tuple[str, str]]] = {}
     for key, kws in STAR_KEYWORDS.items():
-        if any(kw in text for kw in kws):
-            coverage[key] = True
-    return coverage
+        for kw in kws:
+            owners.setdefault(kw, []).append(("star", key))
+    for w in FILLER_WORDS:
+        owners.setdefault(w, []).append(("filler", w))
 
+    table: Dict[str, List[Tuple[str, str, str, int]]] = {}
+    for lit in owners:
+        implied = []
+        for other, kinds in owners.items():
+            offset = lit.find(other)
+            while offset != -1:
+                implied.extend((kind, label, other, offset) for kind, label in kinds)
+                offset = lit.find(other, offset + 1)
+        table[lit] = sorted(implied, key=lambda h: (h[3], -len(h[2])))
+    return table
 
-def _find_passives(text: str) -> List[str]:
-    found = []
-    for p in PASSIVE_PATTERNS:
-        if re.search(p, text):
-            found.append(p)
-    return found
 
+def _build_scanner(keywords_only: bool = False) -> "re.Pattern[str]":
+    # Every top-level branch starts with a literal character so the regex engine can skip
+    # positions by first character instead of trying each alternative everywhere.
+    branches: Dict[str, List[str]] = {}
+    for lit in sorted(_KEYWORD_HITS, key=len, reverse=True):
+        branches.setdefault(lit[0], []).append(re.escape(lit[1:]))
+    if not keywords_only:
+        for pattern in sorted(PASSIVE_PATTERNS, key=len, reverse=True):
+            branches.setdefault(pattern[0], []).append(pattern[1:])
+        number_tail = r"\d*" + NUMBER_PATTERN.pattern[len(r"\d+"):]
+        for digit in "0123456789":
+            branches.setdefault(digit, []).append(number_tail)
+    return re.compile("|".join(
+        re.escape(first) + (tails[0] if len(tails) == 1 else "(?:" + "|".join(tails) + ")")
+        for first, tails in branches.items()
+    ))
 
-def analyze_cover_letter(text: str, job_title: Optional[str] = None, enable_llm: bool = True) -> CoverLetterFeedback:
-    text = (text or "").strip()
-    sentences = _split_sentences_kr(text)
-    num_sentences = len(sentences)
-    num_chars = len(text)
-    num_words = _count_words_kr(text)
-    long_count = sum(1 for s in sentences if len(s) >= 40)
-    avg_sentence_len = (sum(len(s) for s in sentences) / num_sentences) if num_sentences else 0.0
 
-    metrics = CoverLetterMetrics(
-        num_chars=num_chars,
-        num_words=num_words,
-        num_sentences=num_sentences,
-        avg_sentence_len=round(avg_sentence_len, 2),
-        long_sentence_count=long_count,
-    )
+_KEYWORD_HITS = _literal_alternatives()
+_SCANNER = _build_scanner()
+_KEYWORD_SCANNER = _build_scanner(keywords_only=True)
+
 
+@dataclass
+class ScanHit:
+    kind: str  # "star" | "filler" | "passive" | "number"
+    label: str  # STAR key, filler word, or the matched text for passive/number
+    text: str
+    start: int
+    end: int
+
+
+def scan_cover_letter(text: str) -> List[ScanHit]:
+    """Filler, STAR, passive and number hits with positions, from a single regex traversal.
+
+    Keywords may overlap ("성과제고" holds both "성과" and "과제"), so after a keyword match
+    the search resumes one character later, as ``kw in text`` would find both. Passive and
+    number hits resume at their end (a number "120" is one hit); only keywords starting
+    inside them are looked for there, so the scan stays linear in the text length.
+    """
+    hits: List[ScanHit] = []
+    seen = set()  # (kind, word, start) already reported via a longer literal
+
+    def add_keyword(matched: str, start: int) -> None:
+        for kind, label, word, off in _KEYWORD_HITS[matched]:
+            key = (kind, word, start + off)
+            if key not in seen:
+                seen.add(key)
+                hits.append(ScanHit(kind, label, word, start + off, start + off + len(word)))
+
+    search, match_keyword = _SCANNER.search, _KEYWORD_SCANNER.match
+    m = search(text)
+    while m is not None:
+        matched, start, end = m.group(), m.start(), m.end()
+        if matched in _KEYWORD_HITS:
+            add_keyword(matched, start)
+            m = search(text, start + 1)
+            continue
+        hits.append(ScanHit("number" if matched[0].isdigit() else "passive", matched, matched, start, end))
+        for pos in range(start + 1, end):
+            k = match_keyword(text, pos)
+            if k is not None:
+                add_keyword(k.group(), pos)
+        m = search(text, end)
+    return hits
+
+
+def cover_letter_prompt(text: str, job_title: Optional[str] = None) -> str:
+    prompt_parts = [
+        "다음 자기소개서 문항과 답변에 대해 1) 핵심요약(한 문장), 2) 강점, 3) 개선점 3가지, 4) 한 단락 샘플 리라이팅(200자 내외)을 한국어로 간결히 제시하세요.",
+    ]
+    if job_title:
+        prompt_parts.append(f"직무: {job_title}")
+    prompt_parts.append("답변:\n" + text)
+    return "\n\n".join(prompt_parts)
+
+
+def _review(
+    metrics: CoverLetterMetrics,
+    filler_hits: Iterable[str],
+    star_coverage: Dict[str, bool],
+    has_passive: bool,
+    has_number: bool,
+) -> Tuple[List[str], List[str]]:
     issues: List[str] = []
     suggestions: List[str] = []
 
-    if num_chars < 300:
+    if metrics.num_chars < 300:
         issues.append("내용이 너무 짧아 설득력이 약할 수 있습니다 (300자 미만).")
         suggestions.append("경험의 배경과 구체적 행동, 수치화된 결과를 추가해 주세요.")
-    if long_count > 0:
-        issues.append(f"긴 문장이 {long_count}개 있습니다 (40자 이상). 가독성을 위해 분리해 보세요.")
+    if metrics.long_sentence_count > 0:
+        issues.append(f"긴 문장이 {metrics.long_sentence_count}개 있습니다 (40자 이상). 가독성을 위해 분리해 보세요.")
         suggestions.append("각 문장당 하나의 메시지를 담고 불필요한 수식어를 줄여 주세요.")
 
     # Filler words density
-    filler_hits = [w for w in FILLER_WORDS if w in text]
+    filler_hits = set(filler_hits)
     if len(filler_hits) >= 3:
-        issues.append("일반적 미사여구가 많습니다: " + ", ".join(sorted(set(filler_hits))))
+        issues.append("일반적 미사여구가 많습니다: " + ", ".join(sorted(filler_hits)))
         suggestions.append("정성 표현 대신 숫자/지표로 성과를 제시해 주세요.")
 
     # Passive voice
-    passive_found = _find_passives(text)
-    if passive_found:
+    if has_passive:
         issues.append("수동적 표현이 감지되었습니다. 보다 능동태로 바꿔 보세요.")
         suggestions.append("예: '배우게 되었습니다' → '학습하고 적용했습니다'")
 
     # Numbers
-    numbers = NUMBER_PATTERN.findall(text)
-    if not numbers:
+    if not has_number:
         suggestions.append("성과를 %/숫자로 구체화해 주세요 (예: 전환율 18%p 상승, 리드 120건 확보).")
 
-    star_coverage = _detect_star(text)
     if not all(star_coverage.values()):
         missing = [k for k, v in star_coverage.items() if not v]
         issues.append("STAR 구조의 일부가 약합니다: " + ", ".join(missing))
         suggestions.append("상황-과제-행동-결과가 한 사이클로 보이도록 단락을 구성하세요.")
 
+    return issues, suggestions
+
+
+def analyze_cover_letter(
+    text: str,
+    job_title: Optional[str] = None,
+    enable_llm: bool = True,
+    use_cache: bool = True,
+) -> CoverLetterFeedback:
+    text = (text or "").strip()
+    sentences = _split_sentences_kr(text)
+    num_sentences = len(sentences)
+    num_chars = len(text)
+    num_words = _count_words_kr(text)
+    long_count = sum(1 for s in sentences if len(s) >= LONG_SENTENCE_CHARS)
+    avg_sentence_len = (sum(len(s) for s in sentences) / num_sentences) if num_sentences else 0.0
+
+    metrics = CoverLetterMetrics(
+        num_chars=num_chars,
+        num_words=num_words,
+        num_sentences=num_sentences,
+        avg_sentence_len=round(avg_sentence_len, 2),
+        long_sentence_count=long_count,
+    )
+
+    hits = scan_cover_letter(text)
+    filler_hits = set()
+    star_coverage: Dict[str, bool] = {k: False for k in ["S", "T", "A", "R"]}
+    has_passive = has_number = False
+    for h in hits:
+        if h.kind == "star":
+            star_coverage[h.label] = True
+        elif h.kind == "filler":
+            filler_hits.add(h.label)
+        elif h.kind == "passive":
+            has_passive = True
+        else:
+            has_number = True
+
+    issues, suggestions = _review(metrics, filler_hits, star_coverage, has_passive, has_number)
+
     llm_feedback: Optional[str] = None
     if enable_llm:
-        provider = LLMProvider()
+        provider = get_provider()
         if provider.enabled:
-            prompt_parts = [
-                "다음 자기소개서 문항과 답변에 대해 1) 핵심요약(한 문장), 2) 강점, 3) 개선점 3가지, 4) 한 단락 샘플 리라이팅(200자 내외)을 한국어로 간결히 제시하세요.",
-            ]
-            if job_title:
-                prompt_parts.append(f"직무: {job_title}")
-            prompt_parts.append("답변:\n" + text)
-            llm_feedback = provider.cover_letter_feedback("\n\n".join(prompt_parts))
+            llm_feedback = provider.cover_letter_feedback(cover_letter_prompt(text, job_title), use_cache=use_cache)
 
     return CoverLetterFeedback(
         metrics=metrics,
@@ -141,4 +268,181 @@ def analyze_cover_letter(text: str, job_title: Optional[str] = None, enable_llm:
         suggestions=suggestions,
         star_coverage=star_coverage,
         llm_feedback=llm_feedback,
-    ) 
\ No newline at end of file
+        hits=hits,
+    )
+
+
+# ---------------------------------------------------------------------------
+# Incremental re-analysis
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class _SentenceStats:
+    length: int
+    words: int
+    hits: List[ScanHit]  # positions relative to the sentence start
+    offset: int = -1  # sentence start the cached ``placed`` hits were computed for
+    placed: List[ScanHit] = field(default_factory=list)
+
+
+@dataclass
+class IncrementalUpdate:
+    reused_sentences: int
+    changed_sentences: int  # sentences analysed in this update
+    removed_sentences: int
+    changed_paragraphs: int
+    llm_mode: Optional[str]  # "full" | "delta" | "reused" | None
+    llm_prompt_chars: int
+    elapsed_ms: float
+
+
+def _split_paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in PARAGRAPH_BREAK.split(text) if p.strip()]
+
+
+def cover_letter_delta_prompt(
+    changed_paragraphs: List[str],
+    previous_feedback: str,
+    job_title: Optional[str] = None,
+) -> str:
+    prompt_parts = [
+        "아래는 같은 자기소개서에 대해 이전에 드린 피드백과, 그 뒤 사용자가 수정한 단락입니다. "
+        "수정된 단락만 검토해 이전 피드백을 갱신하세요. 같은 형식(1) 핵심요약, 2) 강점, 3) 개선점 3가지, "
+        "4) 한 단락 샘플 리라이팅)을 유지하고, 수정으로 해결된 개선점은 빼고 새 문제는 추가해 한국어로 간결히 제시하세요.",
+    ]
+    if job_title:
+        prompt_parts.append(f"직무: {job_title}")
+    prompt_parts.append("이전 피드백:\n" + previous_feedback)
+    prompt_parts.append("수정된 단락:\n" + "\n\n".join(changed_paragraphs))
+    return "\n\n".join(prompt_parts)
+
+
+class IncrementalCoverLetterAnalyzer:
+    """Re-analyse successive versions of one essay, touching only what changed.
+
+    Each ``update`` splits the new text into sentences, keeps the per-sentence results of
+    the unchanged prefix and suffix, analyses only the sentences in between and adjusts
+    running totals, so the result is identical to ``analyze_cover_letter`` at a fraction
+    of the cost for small edits. With ``enable_llm`` only paragraphs that changed since the
+    last LLM answer are sent, together with that answer as context.
+    """
+
+    def __init__(self, job_title: Optional[str] = None, delta_max_ratio: float = 0.5) -> None:
+        self.job_title = job_title
+        self.delta_max_ratio = delta_max_ratio  # above this share of changed text, re-send everything
+        self.last_update: Optional[IncrementalUpdate] = None
+        self._sentences: List[str] = []
+        self._stats: List[_SentenceStats] = []
+        self._chars = self._words = self._long = 0
+        self._star: Counter = Counter()
+        self._filler: Counter = Counter()
+        self._passive = self._numbers = 0
+        self._llm_paragraphs: List[str] = []
+        self._llm_feedback: Optional[str] = None
+
+    def reset(self) -> None:
+        self.__init__(self.job_title, self.delta_max_ratio)  # type: ignore[misc]
+
+    def _apply(self, stats: _SentenceStats, sign: int) -> None:
+        self._chars += sign * stats.length
+        self._words += sign * stats.words
+        self._long += sign * (stats.length >= LONG_SENTENCE_CHARS)
+        for h in stats.hits:
+            if h.kind == "star":
+                self._star[h.label] += sign
+            elif h.kind == "filler":
+                self._filler[h.label] += sign
+            elif h.kind == "passive":
+                self._passive += sign
+            else:
+                self._numbers += sign
+
+    def update(self, text: str, enable_llm: bool = False, use_cache: bool = True) -> CoverLetterFeedback:
+        started = time.perf_counter()
+        text = (text or "").strip()
+        spans = _sentence_spans(text)
+        new = [text[a:b] for a, b in spans]
+        old = self._sentences
+
+        limit = min(len(old), len(new))
+        prefix = 0
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+
+        removed = self._stats[prefix:len(old) - suffix]
+        for st in removed:
+            self._apply(st, -1)
+        added: List[_SentenceStats] = []
+        for sentence in new[prefix:len(new) - suffix]:
+            st = _SentenceStats(len(sentence), _count_words_kr(sentence), scan_cover_letter(sentence))
+            self._apply(st, +1)
+            added.append(st)
+        self._stats = self._stats[:prefix] + added + self._stats[len(old) - suffix:]
+        self._sentences = new
+
+        count = len(new)
+        metrics = CoverLetterMetrics(
+            num_chars=len(text),
+            num_words=self._words,
+            num_sentences=count,
+            avg_sentence_len=round(self._chars / count, 2) if count else 0.0,
+            long_sentence_count=self._long,
+        )
+        star_coverage = {k: self._star[k] > 0 for k in ["S", "T", "A", "R"]}
+        fillers = [w for w, n in self._filler.items() if n > 0]
+        issues, suggestions = _review(metrics, fillers, star_coverage, self._passive > 0, self._numbers > 0)
+
+        # Absolute positions only change for sentences after the edit.
+        hits: List[ScanHit] = []
+        for (offset, _), st in zip(spans, self._stats):
+            if st.offset != offset:
+                st.placed = [ScanHit(h.kind, h.label, h.text, h.start + offset, h.end + offset) for h in st.hits]
+                st.offset = offset
+            hits.extend(st.placed)
+
+        llm_mode, prompt_chars, changed_paragraphs = None, 0, 0
+        llm_feedback: Optional[str] = None
+        if enable_llm:
+            llm_mode, prompt_chars, changed_paragraphs, llm_feedback = self._llm(text, use_cache)
+
+        self.last_update = IncrementalUpdate(
+            reused_sentences=prefix + suffix,
+            changed_sentences=len(added),
+            removed_sentences=len(removed),
+            changed_paragraphs=changed_paragraphs,
+            llm_mode=llm_mode,
+            llm_prompt_chars=prompt_chars,
+            elapsed_ms=round((time.perf_counter() - started) * 1000, 3),
+        )
+        return CoverLetterFeedback(
+            metrics=metrics,
+            issues=issues,
+            suggestions=suggestions,
+            star_coverage=star_coverage,
+            llm_feedback=llm_feedback,
+            hits=hits,
+        )
+
+    def _llm(self, text: str, use_cache: bool) -> Tuple[Optional[str], int, int, Optional[str]]:
+        provider = get_provider()
+        if not provider.enabled:
+            return None, 0, 0, None
+        paragraphs = _split_paragraphs(text)
+        previous = set(self._llm_paragraphs)
+        changed = [p for p in paragraphs if p not in previous]
+        if self._llm_feedback and not changed and len(paragraphs) == len(self._llm_paragraphs):
+            return "reused", 0, 0, self._llm_feedback
+
+        changed_chars = sum(len(p) for p in changed)
+        if self._llm_feedback and changed and changed_chars <= self.delta_max_ratio * max(1, len(text)):
+            mode, prompt = "delta", cover_letter_delta_prompt(changed, self._llm_feedback, self.job_title)
+        else:
+            mode, prompt = "full", cover_letter_prompt(text, self.job_title)
+        feedback = provider.cover_letter_feedback(prompt, use_cache=use_cache)
+        if feedback:
+            self._llm_paragraphs, self._llm_feedback = paragraphs, feedback
+        return mode, len(prompt), len(changed), feedback or self._llm_feedback
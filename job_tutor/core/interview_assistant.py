@@ -3,10 +3,12 @@ import contextlib
 import os
 import random
 import wave
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
-from .llm import LLMProvider
+from .audio import AudioSource, PauseSegment, analyze_speech_activity, is_path, open_wav
+from .llm import get_provider
+from .transcription import Transcript, transcribe_recording
 
 
 FOLLOW_UPS = [
@@ -41,9 +43,15 @@ class AudioAnalysis:
     channels: int
     approx_chars_per_min: Optional[float]
     note: Optional[str]
+    voiced_sec: Optional[float] = None
+    speech_ratio: Optional[float] = None
+    longest_pause_sec: Optional[float] = None
+    pauses: List[PauseSegment] = field(default_factory=list)
+    chars_per_voiced_min: Optional[float] = None  # speaking rate over voiced time only
+    mean_rms_dbfs: Optional[float] = None
 
 
-def analyze_script(text: str, enable_llm: bool = True) -> TextInterviewFeedback:
+def analyze_script(text: str, enable_llm: bool = True, use_cache: bool = True) -> TextInterviewFeedback:
     text = (text or "").strip()
 
     coverage = {k: any(any(w in text for w in ws) for ws in [v]) for k, v in STAR_CLUES.items()}
@@ -70,13 +78,13 @@ def analyze_script(text: str, enable_llm: bool = True) -> TextInterviewFeedback:
 
     llm_feedback: Optional[str] = None
     if enable_llm:
-        provider = LLMProvider()
+        provider = get_provider()
         if provider.enabled:
             prompt = (
                 "면접관처럼 다음 스크립트를 읽고 1) 날카로운 꼬리질문 3개, 2) 강점 2개, 3) 개선점 3개를 한국어로 간결히 제시하세요.\n\n"
                 + text
             )
-            llm_feedback = provider.interview_feedback(prompt)
+            llm_feedback = provider.interview_feedback(prompt, use_cache=use_cache)
 
     return TextInterviewFeedback(
         star_coverage=coverage,
@@ -87,68 +95,70 @@ def analyze_script(text: str, enable_llm: bool = True) -> TextInterviewFeedback:
     )
 
 
-def analyze_audio_wav(file_path: str, approx_text_length_chars: Optional[int] = None) -> AudioAnalysis:
-    # Basic WAV stats using stdlib wave (no external deps)
-    if not os.path.exists(file_path):
+def analyze_audio_wav(
+    source: AudioSource,
+    approx_text_length_chars: Optional[int] = None,
+    detect_pauses: bool = True,
+    min_pause_sec: float = 0.3,
+) -> AudioAnalysis:
+    # Header stats via stdlib wave, then one chunked NumPy pass for energy and pauses.
+    # ``source`` may be a path or an in-memory upload; buffers are parsed in place.
+    if is_path(source) and not os.path.exists(source):
         return AudioAnalysis(0.0, 0, 0, None, note="파일을 찾을 수 없습니다")
 
+    note: Optional[str] = None
+    activity = None
     try:
-        with contextlib.closing(wave.open(file_path, "rb")) as wf:
+        with contextlib.closing(open_wav(source)) as wf:
             frames = wf.getnframes()
             rate = wf.getframerate()
             channels = wf.getnchannels()
             duration = frames / float(rate) if rate else 0.0
-    except wave.Error:
+            if detect_pauses and rate:
+                try:
+                    activity = analyze_speech_activity(wf, min_pause_sec=min_pause_sec)
+                except ValueError as e:
+                    note = f"음성 구간 분석을 건너뜀: {e}"
+    except (wave.Error, EOFError):
         return AudioAnalysis(0.0, 0, 0, None, note="WAV 형식이 아닙니다. .wav 파일을 올려주세요")
 
     cpm: Optional[float] = None
     if approx_text_length_chars and duration > 0:
         cpm = (approx_text_length_chars / duration) * 60.0
 
-    return AudioAnalysis(
+    result = AudioAnalysis(
         duration_sec=round(duration, 2),
         sample_rate=rate,
         channels=channels,
         approx_chars_per_min=round(cpm, 1) if cpm else None,
-        note=None,
+        note=note,
     )
-
-
-def optional_transcribe(file_path: str) -> Optional[str]:
+    if activity is not None:
+        result.voiced_sec = round(activity.voiced_sec, 2)
+        result.speech_ratio = activity.speech_ratio
+        result.longest_pause_sec = activity.longest_pause_sec
+        result.pauses = activity.pauses
+        result.mean_rms_dbfs = activity.mean_rms_dbfs
+        if approx_text_length_chars and activity.voiced_sec > 0:
+            result.chars_per_voiced_min = round(approx_text_length_chars / activity.voiced_sec * 60.0, 1)
+        if activity.voiced_sec == 0:
+            result.note = "음성이 감지되지 않았습니다. 녹음 볼륨을 확인하세요."
+    return result
+
+
+def optional_transcribe(source: AudioSource) -> Optional[str]:
     """Try to transcribe using OpenAI (if key set) or local whisper/faster-whisper if installed.
     Returns None if unavailable or on error.
     """
-    # 1) Try OpenAI via LLMProvider
-    provider = LLMProvider()
-    if provider.enabled:
-        text = provider.transcribe_audio(file_path)
-        if text:
-            return text
-
-    # 2) Try local whisper
-    try:
-        import whisper  # type: ignore
+    result = transcribe_with_timestamps(source)
+    return result.text if result and result.text else None
 
-        model = whisper.load_model("base")
-        result = model.transcribe(file_path, fp16=False, language="ko")
-        txt = result.get("text") if isinstance(result, dict) else None
-        if txt:
-            return txt.strip()
-    except Exception:
-        pass
 
-    # 3) Try faster-whisper
-    try:
-        from faster_whisper import WhisperModel  # type: ignore
-
-        model = WhisperModel("base")
-        segments, info = model.transcribe(file_path, language="ko")
-        txt_parts: List[str] = []
-        for seg in segments:
-            txt_parts.append(seg.text)
-        if txt_parts:
-            return " ".join(txt_parts).strip()
-    except Exception:
-        pass
-
-    return None 
\ No newline at end of file
+def transcribe_with_timestamps(source: AudioSource) -> Optional[Transcript]:
+    """Chunked transcription with per-segment timestamps (see ``transcription``).
+
+    Long recordings are split at pauses and transcribed in parallel. Each chunk goes through
+    the backend chain (OpenAI models when a key is set, then local models kept warm per
+    process); backends that keep failing are skipped until their cool-down ends.
+    """
+    return transcribe_recording(source)
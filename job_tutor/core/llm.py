@@ -1,22 +1,114 @@
 from __future__ import annotations
+import asyncio
+import contextlib
 import os
-from typing import Any, Optional
+import random
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .cache import ResponseCache, cache_key, get_response_cache
+
+
+CHAT_MODEL = "gpt-4o-mini"
+# Transcription models in order of preference (whisper-1 also returns segment timestamps).
+TRANSCRIBE_MODELS = ("gpt-4o-mini-transcribe", "whisper-1")
+COVER_LETTER_SYSTEM = "You are an expert Korean career coach. Provide concise, actionable feedback."
+CODING_HINT_SYSTEM = (
+    "You are a helpful coding interview tutor. Respond in Korean with hints first, "
+    "then a reference answer only if asked."
+)
+INTERVIEW_SYSTEM = (
+    "You are a tough but fair interviewer. Respond in Korean with realistic follow-ups and targeted feedback."
+)
+
+# Process-wide registry of SDK clients keyed by API key. Each OpenAI() client owns an
+# HTTP connection pool, so reusing it keeps keep-alive connections (and TLS sessions)
+# warm across Streamlit reruns instead of rebuilding them on every call.
+_clients: Dict[str, Any] = {}
+_providers: Dict[str, "LLMProvider"] = {}
+_registry_lock = threading.Lock()
+
+
+def _shared_client(api_key: str) -> Any:
+    with _registry_lock:
+        client = _clients.get(api_key)
+        if client is None:
+            from openai import OpenAI  # type: ignore
+
+            client = OpenAI(api_key=api_key)
+            _clients[api_key] = client
+        return client
+
+
+def get_provider() -> "LLMProvider":
+    """Return the shared provider for the current OPENAI_API_KEY.
+
+    The sidebar may change the key at runtime; a new key gets its own pooled client.
+    """
+    api_key = os.environ.get("OPENAI_API_KEY") or ""
+    with _registry_lock:
+        provider = _providers.get(api_key)
+    if provider is None:
+        provider = LLMProvider(api_key=api_key)
+        with _registry_lock:
+            provider = _providers.setdefault(api_key, provider)
+    return provider
+
+
+def close_providers() -> None:
+    """Close every pooled client and clear the registry (e.g. on shutdown or key rotation)."""
+    with _registry_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+        _providers.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+
+def _response_cache_or_none() -> Optional[ResponseCache]:
+    try:
+        return get_response_cache()
+    except Exception:
+        # Unwritable cache directory etc.: behave as if caching were off.
+        return None
+
+
+def _cache_get(cache: ResponseCache, key: str) -> Optional[str]:
+    try:
+        return cache.get(key)
+    except Exception:
+        # Locked or corrupt cache file: a miss, not a failed request.
+        return None
+
+
+def _cache_put(cache: ResponseCache, key: str, text: str) -> None:
+    try:
+        cache.put(key, text)
+    except Exception:
+        pass  # the reply is still returned, it just is not stored
 
 
 class LLMProvider:
     """Optional LLM provider. Uses OpenAI if OPENAI_API_KEY is set and SDK is available.
 
     Methods return None when provider is unavailable, so callers can safely fall back.
+    Prefer ``get_provider()``, which reuses one pooled client per API key.
     """
 
-    def __init__(self) -> None:
-        self._enabled = bool(os.environ.get("OPENAI_API_KEY"))
+    def __init__(self, api_key: Optional[str] = None) -> None:
+        if api_key is None:
+            api_key = os.environ.get("OPENAI_API_KEY") or ""
+        self._enabled = bool(api_key)
         self._client: Any = None
         if self._enabled:
             try:
-                from openai import OpenAI  # type: ignore
-
-                self._client = OpenAI()
+                self._client = _shared_client(api_key)
             except Exception:
                 # OpenAI SDK missing or misconfigured. Disable provider.
                 self._enabled = False
@@ -26,81 +118,460 @@ class LLMProvider:
     def enabled(self) -> bool:
         return self._enabled and self._client is not None
 
-    def cover_letter_feedback(self, prompt: str) -> Optional[str]:
+    def _complete(self, system: str, prompt: str, temperature: float, use_cache: bool) -> Optional[str]:
         if not self.enabled or self._client is None:
             return None
+        cache = _response_cache_or_none() if use_cache else None
+        key = cache_key(CHAT_MODEL, system, temperature, prompt) if cache else ""
+        if cache:
+            cached = _cache_get(cache, key)
+            if cached is not None:
+                return cached
         try:
             completion = self._client.chat.completions.create(  # type: ignore[attr-defined]
-                model="gpt-4o-mini",
+                model=CHAT_MODEL,
                 messages=[
-                    {"role": "system", "content": "You are an expert Korean career coach. Provide concise, actionable feedback."},
+                    {"role": "system", "content": system},
                     {"role": "user", "content": prompt},
                 ],
-                temperature=0.4,
+                temperature=temperature,
             )
-            return completion.choices[0].message.content or None
+            text = completion.choices[0].message.content or None
         except Exception:
             return None
+        if cache and text:
+            _cache_put(cache, key, text)
+        return text
+
+    def cover_letter_feedback(self, prompt: str, use_cache: bool = True) -> Optional[str]:
+        return self._complete(COVER_LETTER_SYSTEM, prompt, 0.4, use_cache)
+
+    def coding_hint(self, prompt: str, use_cache: bool = True) -> Optional[str]:
+        return self._complete(CODING_HINT_SYSTEM, prompt, 0.3, use_cache)
+
+    def interview_feedback(self, prompt: str, use_cache: bool = True) -> Optional[str]:
+        return self._complete(INTERVIEW_SYSTEM, prompt, 0.5, use_cache)
+
+    def transcribe_audio(self, file_path: str) -> Optional[str]:
+        """Optional audio transcription via OpenAI if enabled.
+        Returns text on success or None on failure/unavailable.
 
-    def coding_hint(self, prompt: str) -> Optional[str]:
+        The file is read once; the whisper-1 fallback reuses the same bytes. For health
+        tracking and local fallbacks use ``stt_chain.TranscriptionChain``.
+        """
         if not self.enabled or self._client is None:
             return None
         try:
-            completion = self._client.chat.completions.create(  # type: ignore[attr-defined]
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a helpful coding interview tutor. Respond in Korean with hints first, then a reference answer only if asked."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.3,
-            )
-            return completion.choices[0].message.content or None
-        except Exception:
+            with open(file_path, "rb") as f:
+                data = f.read()
+        except OSError:
             return None
+        for model in TRANSCRIBE_MODELS:
+            segments = self.transcribe_segments(data, os.path.basename(file_path), model=model, language=None)
+            if segments:
+                return " ".join(text for _, _, text in segments)
+        return None
 
-    def interview_feedback(self, prompt: str) -> Optional[str]:
+    def transcribe_segments(
+        self,
+        data: Any,
+        filename: str = "audio.wav",
+        model: str = "whisper-1",
+        language: Optional[str] = "ko",
+        timeout_sec: Optional[float] = None,
+        max_retries: Optional[int] = None,
+        raise_errors: bool = False,
+    ) -> Optional[List[Tuple[float, Optional[float], str]]]:
+        """Transcribe in-memory audio and return ``(start_sec, end_sec, text)`` segments.
+
+        Asks for ``verbose_json`` segment timestamps (whisper-1 supports them); a model that
+        only returns text yields one segment with ``end_sec=None``. None on failure/unavailable,
+        unless ``raise_errors`` is set (the SDK exception propagates, for health tracking).
+        ``max_retries`` overrides the SDK's own retries, e.g. 0 when the caller fails over.
+        """
         if not self.enabled or self._client is None:
+            if raise_errors:
+                raise RuntimeError("OpenAI provider is not enabled")
             return None
+        kwargs: Dict[str, Any] = {"model": model, "file": (filename, data)}
+        if language:
+            kwargs["language"] = language
+        if model == "whisper-1":
+            kwargs.update(response_format="verbose_json", timestamp_granularities=["segment"])
+        if timeout_sec is not None:
+            kwargs["timeout"] = timeout_sec
+        client = self._client if max_retries is None else self._client.with_options(max_retries=max_retries)
         try:
-            completion = self._client.chat.completions.create(  # type: ignore[attr-defined]
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are a tough but fair interviewer. Respond in Korean with realistic follow-ups and targeted feedback."},
-                    {"role": "user", "content": prompt},
-                ],
-                temperature=0.5,
-            )
-            return completion.choices[0].message.content or None
+            resp = client.audio.transcriptions.create(**kwargs)  # type: ignore[attr-defined]
         except Exception:
+            if raise_errors:
+                raise
             return None
+        segments = getattr(resp, "segments", None) or []
+        if segments:
+            return [
+                (float(_field(seg, "start")), float(_field(seg, "end")), str(_field(seg, "text") or "").strip())
+                for seg in segments
+            ]
+        text = getattr(resp, "text", None)
+        return [(0.0, None, text.strip())] if text else []
 
-    def transcribe_audio(self, file_path: str) -> Optional[str]:
-        """Optional audio transcription via OpenAI if enabled.
-        Returns text on success or None on failure/unavailable.
-        """
-        if not self.enabled or self._client is None:
+
+def _field(obj: Any, name: str) -> Any:
+    return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+
+
+# ---------------------------------------------------------------------------
+# Async batch scheduler
+# ---------------------------------------------------------------------------
+
+# Status codes worth retrying: timeouts, lock conflicts, rate limits and server-side errors.
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+DEFAULT_COMPLETION_TOKENS = 512
+
+
+@dataclass
+class LLMRequest:
+    prompt: str
+    system: str = COVER_LETTER_SYSTEM
+    temperature: float = 0.4
+    max_tokens: Optional[int] = None
+    tag: Any = None  # caller's identifier, echoed back on the result
+
+
+@dataclass
+class LLMResult:
+    request: LLMRequest
+    text: Optional[str]
+    error: Optional[str] = None
+    latency_sec: float = 0.0  # submit -> final answer, including queueing and backoff
+    queued_sec: float = 0.0  # concurrency slot + rate-limit waits + retry backoff
+    retries: int = 0
+    rate_limited: int = 0  # how many of the attempts were answered with 429
+    tokens: Optional[int] = None
+    cached: bool = False
+
+
+@dataclass
+class SchedulerStats:
+    requests: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    cached: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    latencies_sec: List[float] = field(default_factory=list)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies_sec:
             return None
+        ordered = sorted(self.latencies_sec)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def cover_letter_request(prompt: str, tag: Any = None) -> LLMRequest:
+    return LLMRequest(prompt=prompt, system=COVER_LETTER_SYSTEM, temperature=0.4, tag=tag)
+
+
+def interview_request(prompt: str, tag: Any = None) -> LLMRequest:
+    return LLMRequest(prompt=prompt, system=INTERVIEW_SYSTEM, temperature=0.5, tag=tag)
+
+
+def estimate_tokens(system: str, prompt: str, max_tokens: Optional[int] = None) -> int:
+    """Cheap upper-ish estimate without a tokenizer: ~4 ASCII chars or ~1 Hangul char per token."""
+    text = system + prompt
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars) + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+class TokenBucket:
+    """Continuously refilling budget of ``rate_per_min`` units per minute.
+
+    Holds at most ``burst_sec`` seconds' worth of budget, so a per-minute limit is not
+    spent in one burst at the start of the minute. A request larger than the capacity
+    waits for a full bucket and drives it negative instead of waiting forever.
+    """
+
+    def __init__(self, rate_per_min: float, burst_sec: float = 1.0) -> None:
+        self.rate_per_sec = float(rate_per_min) / 60.0
+        self.capacity = max(1.0, self.rate_per_sec * burst_sec)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+
+    def _loop_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until ``amount`` units are available and take them; returns seconds waited."""
+        if self.rate_per_sec <= 0:
+            return 0.0
+        started = time.monotonic()
+        async with self._loop_lock():  # FIFO: a large request is not starved by small ones
+            need = min(float(amount), self.capacity)
+            while True:
+                self._refill()
+                if self._tokens >= need:
+                    self._tokens -= amount
+                    return time.monotonic() - started
+                await asyncio.sleep((need - self._tokens) / self.rate_per_sec)
+
+    def adjust(self, delta: float) -> None:
+        """Correct an earlier estimate once the real cost is known (positive delta = charge more)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens - delta)
+
+
+def _retry_after_sec(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    for name in ("retry-after-ms", "retry-after"):
+        value = headers.get(name)
+        if value is None:
+            continue
         try:
-            with open(file_path, "rb") as f:
-                try:
-                    resp = self._client.audio.transcriptions.create(  # type: ignore[attr-defined]
-                        model="gpt-4o-mini-transcribe",
-                        file=f,
-                    )
-                    text = getattr(resp, "text", None)
-                    if text:
-                        return text
-                except Exception:
-                    pass
-            with open(file_path, "rb") as f2:
+            seconds = float(value)
+        except ValueError:
+            continue
+        return seconds / 1000.0 if name.endswith("ms") else seconds
+    return None
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    try:
+        import openai  # type: ignore
+    except Exception:
+        return isinstance(exc, (TimeoutError, ConnectionError))
+    return isinstance(exc, (openai.APIConnectionError, openai.APITimeoutError, TimeoutError, ConnectionError))
+
+
+async def _close_client(client: Any, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+    """Close an async client on the loop that created it, if that loop still runs elsewhere.
+
+    A client whose loop has already finished is closed here; its connections were bound to
+    that loop, so failures are ignored (the sockets are released with the client).
+    """
+    if loop is not None and loop.is_running() and loop is not asyncio.get_running_loop():
+        asyncio.run_coroutine_threadsafe(client.close(), loop)
+        return
+    with contextlib.suppress(Exception):
+        await client.close()
+
+
+class LLMScheduler:
+    """Run many chat completions concurrently within a concurrency cap and rate limits.
+
+    Requests wait for a concurrency slot and for budget from two token buckets
+    (requests/min and tokens/min) before being sent. 429s, timeouts, connection errors and
+    5xx responses are retried with full-jitter exponential backoff (honouring Retry-After,
+    which also pauses every other request briefly). Unlike ``LLMProvider``, failures are
+    reported on the result instead of being swallowed.
+
+        scheduler = LLMScheduler(max_concurrency=8, requests_per_min=500)
+        results = scheduler.run_sync([cover_letter_request(p) for p in prompts])
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        max_concurrency: int = 8,
+        requests_per_min: float = 500.0,
+        tokens_per_min: float = 200_000.0,
+        max_retries: int = 6,
+        base_delay_sec: float = 0.5,
+        max_delay_sec: float = 30.0,
+        timeout_sec: float = 60.0,
+        use_cache: bool = True,
+        model: str = CHAT_MODEL,
+    ) -> None:
+        if api_key is None:
+            api_key = os.environ.get("OPENAI_API_KEY") or ""
+        self._api_key = api_key
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay_sec = base_delay_sec
+        self.max_delay_sec = max_delay_sec
+        self.timeout_sec = timeout_sec
+        self.use_cache = use_cache
+        self.request_bucket = TokenBucket(requests_per_min)
+        self.token_bucket = TokenBucket(tokens_per_min)
+        self.stats = SchedulerStats()
+        self._stats_lock = threading.Lock()
+        self._pause_until = 0.0
+        # Async clients and semaphores belong to one event loop; rebuilt when the loop changes
+        # (the previous client is closed so its connection pool is not leaked).
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client: Any = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._bg_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bg_thread: Optional[threading.Thread] = None
+        self._bg_lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._api_key)
+
+    async def _loop_state(self) -> Tuple[Any, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            from openai import AsyncOpenAI  # type: ignore
+
+            stale, stale_loop = self._client, self._loop
+            # SDK retries are off: backoff and rate limiting are handled here.
+            self._client = AsyncOpenAI(api_key=self._api_key, max_retries=0, timeout=self.timeout_sec)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+            if stale is not None:
+                await _close_client(stale, stale_loop)
+        assert self._semaphore is not None
+        return self._client, self._semaphore
+
+    def _record(self, result: LLMResult) -> LLMResult:
+        with self._stats_lock:
+            s = self.stats
+            s.requests += 1
+            s.succeeded += result.text is not None
+            s.failed += result.text is None
+            s.cached += result.cached
+            s.retries += result.retries
+            s.rate_limited += result.rate_limited
+            s.latencies_sec.append(result.latency_sec)
+        return result
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        delay = random.uniform(0, min(self.max_delay_sec, self.base_delay_sec * (2 ** attempt)))
+        retry_after = _retry_after_sec(exc)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+            if getattr(exc, "status_code", None) == 429:
+                self._pause_until = max(self._pause_until, time.monotonic() + retry_after)
+        return delay
+
+    async def complete(self, request: LLMRequest) -> LLMResult:
+        started = time.monotonic()
+        result = LLMResult(request=request, text=None)
+        if not self.enabled:
+            result.error = "OPENAI_API_KEY가 설정되지 않았습니다"
+            return self._record(result)
+
+        cache = _response_cache_or_none() if self.use_cache else None
+        key = cache_key(self.model, request.system, request.temperature, request.prompt) if cache else ""
+        if cache:
+            cached = await asyncio.to_thread(_cache_get, cache, key)
+            if cached is not None:
+                result.text, result.cached = cached, True
+                result.latency_sec = time.monotonic() - started
+                return self._record(result)
+
+        client, semaphore = await self._loop_state()
+        estimate = estimate_tokens(request.system, request.prompt, request.max_tokens)
+        attempt = 0
+        while True:
+            async with semaphore:
+                wait_started = time.monotonic()
+                pause = self._pause_until - wait_started
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimate)
+                result.queued_sec += time.monotonic() - wait_started
                 try:
-                    resp = self._client.audio.transcriptions.create(  # type: ignore[attr-defined]
-                        model="whisper-1",
-                        file=f2,
+                    kwargs: Dict[str, Any] = {}
+                    if request.max_tokens:
+                        kwargs["max_tokens"] = request.max_tokens
+                    completion = await client.chat.completions.create(
+                        model=self.model,
+                        messages=[
+                            {"role": "system", "content": request.system},
+                            {"role": "user", "content": request.prompt},
+                        ],
+                        temperature=request.temperature,
+                        **kwargs,
                     )
-                    text = getattr(resp, "text", None)
-                    return text
-                except Exception:
-                    return None
-        except Exception:
-            return None 
\ No newline at end of file
+                except Exception as e:  # noqa: BLE001 - classified below
+                    if getattr(e, "status_code", None) == 429:
+                        result.rate_limited += 1
+                    if attempt >= self.max_retries or not _is_retryable(e):
+                        result.error = f"{type(e).__name__}: {e}"
+                        break
+                    delay = self._backoff(attempt, e)
+                    attempt += 1
+                    result.retries = attempt
+                else:
+                    result.text = completion.choices[0].message.content or None
+                    usage = getattr(completion, "usage", None)
+                    result.tokens = getattr(usage, "total_tokens", None)
+                    if result.tokens:
+                        self.token_bucket.adjust(result.tokens - estimate)
+                    if result.text is None:
+                        result.error = "빈 응답"
+                    break
+            # Back off outside the semaphore so a sleeping retry does not hold a slot.
+            result.queued_sec += delay
+            await asyncio.sleep(delay)
+
+        if cache and result.text:
+            await asyncio.to_thread(_cache_put, cache, key, result.text)
+        result.latency_sec = time.monotonic() - started
+        return self._record(result)
+
+    async def run(self, requests: Iterable[LLMRequest]) -> List[LLMResult]:
+        """Complete every request; results come back in input order."""
+        return list(await asyncio.gather(*(self.complete(r) for r in requests)))
+
+    def run_sync(self, requests: Iterable[LLMRequest]) -> List[LLMResult]:
+        """Blocking wrapper around ``run`` for scripts and threads without an event loop."""
+
+        async def _run() -> List[LLMResult]:
+            try:
+                return await self.run(requests)
+            finally:
+                await self.aclose()
+
+        return asyncio.run(_run())
+
+    def submit_threadsafe(self, request: LLMRequest) -> "Future[LLMResult]":
+        """Schedule from synchronous code; returns a concurrent.futures.Future.
+
+        The first call starts a private event loop on a daemon thread; ``close()`` stops it.
+        """
+        with self._bg_lock:
+            if self._bg_loop is None:
+                self._bg_loop = asyncio.new_event_loop()
+                self._bg_thread = threading.Thread(target=self._bg_loop.run_forever, name="llm-scheduler", daemon=True)
+                self._bg_thread.start()
+            loop = self._bg_loop
+        return asyncio.run_coroutine_threadsafe(self.complete(request), loop)
+
+    async def aclose(self) -> None:
+        client, loop = self._client, self._loop
+        self._client, self._loop, self._semaphore = None, None, None
+        if client is not None:
+            await _close_client(client, loop)
+
+    def close(self) -> None:
+        with self._bg_lock:
+            loop, thread = self._bg_loop, self._bg_thread
+            self._bg_loop = self._bg_thread = None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.aclose(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
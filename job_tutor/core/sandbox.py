@@ -0,0 +1,217 @@
+from __future__ import annotations
+import atexit
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+
+WORKER_SCRIPT = str(Path(__file__).with_name("_sandbox_worker.py"))
+
+# The warm pool relies on os.fork() inside the worker; elsewhere (Windows) callers
+# fall back to one cold interpreter per test case.
+POOL_SUPPORTED = hasattr(os, "fork") and sys.platform != "win32"
+
+
+@dataclass
+class RunOutput:
+    stdout: str
+    stderr: str
+    exit_code: int
+    timed_out: bool
+    memory_exceeded: bool = False
+    crashed: bool = False  # the case took its sandbox worker down
+    wall_ms: Optional[float] = None
+    cpu_ms: Optional[float] = None
+    peak_rss_kb: Optional[int] = None
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+class _Worker:
+    """One warm ``python -I -S -B`` process speaking the JSON-lines protocol."""
+
+    def __init__(self) -> None:
+        self._proc = subprocess.Popen(
+            [sys.executable, "-I", "-S", "-B", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            bufsize=1,
+        )
+        self.runs = 0
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def _call(self, msg: dict) -> dict:
+        try:
+            assert self._proc.stdin is not None and self._proc.stdout is not None
+            self._proc.stdin.write(json.dumps(msg) + "\n")
+            self._proc.stdin.flush()
+            line = self._proc.stdout.readline()
+        except (OSError, ValueError) as e:
+            raise WorkerCrashed(str(e)) from e
+        if not line:
+            raise WorkerCrashed("sandbox worker exited")
+        return json.loads(line)
+
+    def load(self, code: str) -> Optional[str]:
+        reply = self._call({"op": "load", "code": code})
+        return None if reply.get("ok") else reply.get("error", "load failed")
+
+    def run(self, stdin: str, timeout_sec: float, memory_limit_mb: Optional[int] = None) -> RunOutput:
+        reply = self._call({"op": "run", "stdin": stdin, "timeout": timeout_sec, "memory_limit_mb": memory_limit_mb})
+        if "error" in reply:
+            raise WorkerCrashed(reply["error"])
+        self.runs += 1
+        return RunOutput(
+            stdout=reply["stdout"],
+            stderr=reply["stderr"],
+            exit_code=int(reply["exit_code"]),
+            timed_out=bool(reply["timed_out"]),
+            memory_exceeded=bool(reply.get("memory_exceeded")),
+            wall_ms=reply.get("wall_ms"),
+            cpu_ms=reply.get("cpu_ms"),
+            peak_rss_kb=reply.get("peak_rss_kb"),
+        )
+
+    def close(self) -> None:
+        try:
+            if self._proc.stdin:
+                self._proc.stdin.close()
+            self._proc.wait(timeout=1)
+        except Exception:
+            self._proc.kill()
+
+
+class SandboxSession:
+    """A worker checked out of the pool with one submission loaded into it."""
+
+    def __init__(self, pool: "SandboxPool", code: str) -> None:
+        self._pool = pool
+        self._code = code
+        self._worker = pool._checkout()
+        self.load_error = self._worker.load(code)
+
+    def run(self, stdin: str, timeout_sec: float, memory_limit_mb: Optional[int] = None) -> RunOutput:
+        if self.load_error is not None:
+            return RunOutput("", self.load_error, 1, False)
+        try:
+            return self._worker.run(stdin, timeout_sec, memory_limit_mb)
+        except WorkerCrashed:
+            # The test case took its worker down (e.g. killed its parent):
+            # recycle the worker and report the case instead of retrying it.
+            self._worker.close()
+            self._worker = _Worker()
+            self.load_error = self._worker.load(self._code)
+            return RunOutput("", "Sandbox worker crashed", -9, False, crashed=True)
+
+    def close(self) -> None:
+        self._pool._checkin(self._worker)
+
+    def __enter__(self) -> "SandboxSession":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+class SandboxPool:
+    """Pool of pre-started sandbox workers.
+
+    A submission is sent to one worker once (compiled once); each test case then runs
+    in a forked child of that worker with its own stdin, timeout and rlimits. Workers
+    that die are replaced, and every worker is recycled after ``max_runs`` cases.
+    ``size`` workers are kept warm; concurrent sessions beyond that get extra workers
+    that are shut down when returned. ``reserve`` grows the warm set up to ``max_size``
+    (default: the CPU count, or ``size`` if larger).
+    """
+
+    def __init__(self, size: int = 2, max_runs: int = 500, max_size: Optional[int] = None) -> None:
+        self.size = max(1, size)
+        self.max_size = max(self.size, max_size if max_size is not None else (os.cpu_count() or 1))
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._closed = False
+        for _ in range(self.size):
+            self._idle.put(_Worker())
+
+    def _checkout(self) -> _Worker:
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            return _Worker()
+        if not worker.alive:
+            worker = _Worker()
+        return worker
+
+    def _checkin(self, worker: _Worker) -> None:
+        if self._closed or self._idle.qsize() >= self.size:
+            worker.close()
+            return
+        if not worker.alive or worker.runs >= self.max_runs:
+            worker.close()
+            worker = _Worker()
+        self._idle.put(worker)
+
+    def reserve(self, size: int) -> None:
+        """Keep at least ``size`` workers (at most ``max_size``) warm from now on."""
+        with self._lock:
+            size = min(size, self.max_size)
+            missing = size - self.size
+            if missing <= 0:
+                return
+            self.size = size
+        for _ in range(missing):
+            self._idle.put(_Worker())
+
+    def session(self, code: str) -> SandboxSession:
+        return SandboxSession(self, code)
+
+    def run(
+        self,
+        code: str,
+        stdins: List[str],
+        timeout_sec: float = 2.0,
+        memory_limit_mb: Optional[int] = None,
+    ) -> List[RunOutput]:
+        """Run ``code`` once per stdin string on one worker and return outputs in order."""
+        with self.session(code) as session:
+            return [session.run(stdin, timeout_sec, memory_limit_mb) for stdin in stdins]
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pool: Optional[SandboxPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sandbox_pool() -> Optional[SandboxPool]:
+    """Process-wide pool (created on first use), or None where forking is unavailable."""
+    global _pool
+    if not POOL_SUPPORTED:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            default_size = min(4, os.cpu_count() or 1)
+            _pool = SandboxPool(size=int(os.environ.get("JOB_TUTOR_SANDBOX_WORKERS", default_size)))
+            atexit.register(_pool.close)
+        return _pool
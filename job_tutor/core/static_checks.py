@@ -0,0 +1,360 @@
+from __future__ import annotations
+import ast
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+
+@dataclass
+class Finding:
+    rule: str
+    line: int
+    end_line: int
+    message: str
+    rationale: str
+
+
+# rule id -> (message, performance rationale)
+RULES: Dict[str, Tuple[str, str]] = {
+    "input-in-loop": (
+        "반복문 안에서 input()으로 입력을 읽습니다.",
+        "input()은 호출마다 프롬프트/인코딩 처리를 거쳐 sys.stdin.readline()보다 수 배 느립니다. "
+        "입력이 10^5줄 이상이면 이것만으로 시간 초과가 날 수 있으니 `input = sys.stdin.readline`을 쓰세요.",
+    ),
+    "list-pop-front": (
+        "반복문 안에서 리스트 앞쪽을 꺼내거나 삽입합니다 (pop(0)/insert(0, x)).",
+        "리스트 앞에서의 삭제/삽입은 나머지 원소를 모두 한 칸씩 옮기므로 O(n)이고, 반복문 안에서는 O(n^2)이 됩니다. "
+        "collections.deque의 popleft()/appendleft()는 O(1)입니다.",
+    ),
+    "list-membership": (
+        "반복문 안에서 리스트에 대해 `in` 검사를 합니다.",
+        "리스트의 `in`은 처음부터 끝까지 비교하는 O(n) 선형 탐색이라 반복문 안에서는 O(n*m)이 됩니다. "
+        "원소가 바뀌지 않는다면 반복문 밖에서 set으로 바꿔 평균 O(1)로 검사하세요.",
+    ),
+    "str-concat-in-loop": (
+        "반복문 안에서 문자열을 += 로 이어 붙입니다.",
+        "문자열은 불변이라 이어 붙일 때마다 전체를 새로 복사할 수 있어 최악 O(n^2)입니다. "
+        "조각을 리스트에 append한 뒤 마지막에 ''.join()으로 합치거나 print를 한 번에 하세요.",
+    ),
+    "deep-recursion": (
+        "재귀 함수가 있지만 sys.setrecursionlimit 설정이 없습니다.",
+        "CPython의 기본 재귀 한도는 1000이라 입력 크기에 비례해 깊어지는 재귀(DFS, 연결 리스트 탐색 등)는 "
+        "RecursionError로 실패합니다. sys.setrecursionlimit(10**6)을 설정하거나 스택을 쓰는 반복문으로 바꾸세요.",
+    ),
+    "unmemoized-recursion": (
+        "자기 자신을 여러 번 호출하는 재귀 함수에 메모이제이션이 없습니다.",
+        "같은 부분 문제를 반복해서 다시 계산하므로 호출 수가 지수적으로 늘어납니다 (예: 피보나치 O(2^n)). "
+        "@functools.lru_cache(None)/@cache를 붙이거나 dict 메모, 반복문 DP로 바꾸면 O(n)으로 줄어듭니다.",
+    ),
+}
+
+_LOOP_NODES = (ast.For, ast.AsyncFor, ast.While)
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_MEMO_DECORATORS = {"cache", "lru_cache"}
+_LIST_BUILDERS = {"list", "sorted"}
+_LIST_METHODS = {"split", "rsplit", "splitlines", "readlines"}
+
+
+def _call_name(node: ast.AST) -> Optional[str]:
+    """Name of a called function: `f(...)` -> "f", `a.b.f(...)` -> "f"."""
+    if isinstance(node, ast.Call):
+        node = node.func
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _value_kind(node: ast.AST) -> Optional[str]:
+    """Rough static type of an assigned value: "list", "str", "other" or None when unknown."""
+    if isinstance(node, (ast.List, ast.ListComp)):
+        return "list"
+    if isinstance(node, ast.Constant):
+        return "str" if isinstance(node.value, str) else "other"
+    if isinstance(node, ast.JoinedStr):
+        return "str"
+    if isinstance(node, (ast.Set, ast.SetComp, ast.Dict, ast.DictComp, ast.Tuple)):
+        return "other"
+    if isinstance(node, ast.Call):
+        name = _call_name(node)
+        if isinstance(node.func, ast.Name):
+            if name in _LIST_BUILDERS:
+                return "list"
+            if name == "str":
+                return "str"
+            if name in {"set", "frozenset", "dict", "tuple", "deque", "Counter", "defaultdict"}:
+                return "other"
+        elif name in _LIST_METHODS:
+            return "list"
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Mult):
+        # [0] * n
+        return _value_kind(node.left) if _value_kind(node.left) == "list" else None
+    return None
+
+
+class _Scope:
+    def __init__(self, name: Optional[str], node: Optional[ast.AST] = None) -> None:
+        self.name = name
+        self.node = node
+        self.kinds: Dict[str, str] = {}
+        self.self_calls = 0
+
+
+class PerfAnalyzer(ast.NodeVisitor):
+    """One pass over the module: loop-based complexity estimate plus performance anti-patterns."""
+
+    def __init__(self) -> None:
+        self.total_loops = 0
+        self.detected: List[str] = []
+        self.findings: List[Finding] = []
+        self.warnings: List[str] = []
+        self._loop_depth = 0
+        self._scopes: List[_Scope] = [_Scope(None)]
+        self._recursive: List[Tuple[Union[ast.FunctionDef, ast.AsyncFunctionDef], int]] = []
+        self._has_recursion_limit = False
+        self._reads_input = False
+        self._writes_output = False
+
+    # --- helpers -------------------------------------------------------
+
+    def _add(self, rule: str, node: ast.AST) -> None:
+        message, rationale = RULES[rule]
+        line = getattr(node, "lineno", 0)
+        end_line = getattr(node, "end_lineno", None) or line
+        self.findings.append(Finding(rule, line, end_line, message, rationale))
+
+    def _kind_of(self, name: str) -> Optional[str]:
+        # Function scope first, then module globals.
+        for scope in (self._scopes[-1], self._scopes[0]):
+            if name in scope.kinds:
+                return scope.kinds[name]
+        return None
+
+    def _bind(self, target: ast.AST, value: Optional[ast.AST]) -> None:
+        if not isinstance(target, ast.Name):
+            return
+        kind = _value_kind(value) if value is not None else None
+        scope = self._scopes[-1]
+        previous = scope.kinds.get(target.id)
+        # A name rebound to different kinds is ambiguous; stop guessing about it.
+        scope.kinds[target.id] = kind if previous in (None, kind) and kind else "other"
+
+    # --- loops ---------------------------------------------------------
+
+    def _visit_loop(self, node: ast.AST) -> None:
+        if isinstance(node, (ast.For, ast.While)):
+            self.total_loops += 1
+            if self._loop_depth >= 1:
+                self.detected.append("중첩 루프 감지")
+        if isinstance(node, ast.While) and isinstance(node.test, ast.Constant) and node.test.value is True:
+            if not any(isinstance(n, (ast.Break, ast.Return)) for n in ast.walk(node)):
+                self.warnings.append(f"무한 루프 가능성 (line {node.lineno}): 종료 조건을 확인하세요.")
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            # The iterable is evaluated once, outside the loop body.
+            self.visit(node.iter)
+            self._bind(node.target, None)
+            self._visit_body(node, ("target", "body", "orelse"))
+        else:
+            self._visit_body(node, ("test", "body", "orelse"))
+
+    def _visit_body(self, node: ast.AST, fields: Tuple[str, ...]) -> None:
+        self._loop_depth += 1
+        try:
+            for name in fields:
+                value = getattr(node, name, None)
+                if isinstance(value, list):
+                    for item in value:
+                        self.visit(item)
+                elif isinstance(value, ast.AST):
+                    self.visit(value)
+        finally:
+            self._loop_depth -= 1
+
+    visit_For = _visit_loop
+    visit_AsyncFor = _visit_loop
+    visit_While = _visit_loop
+
+    def _visit_comprehension(self, node: ast.AST) -> None:
+        generators = node.generators  # type: ignore[attr-defined]
+        self.visit(generators[0].iter)
+        self._loop_depth += 1
+        try:
+            for i, gen in enumerate(generators):
+                if i:
+                    self.visit(gen.iter)
+                for cond in gen.ifs:
+                    self.visit(cond)
+            for name in ("elt", "key", "value"):
+                child = getattr(node, name, None)
+                if child is not None:
+                    self.visit(child)
+        finally:
+            self._loop_depth -= 1
+
+    visit_ListComp = _visit_comprehension
+    visit_SetComp = _visit_comprehension
+    visit_DictComp = _visit_comprehension
+    visit_GeneratorExp = _visit_comprehension
+
+    # --- functions -----------------------------------------------------
+
+    def _visit_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> None:
+        for deco in node.decorator_list:
+            self.visit(deco)
+        scope = _Scope(node.name, node)
+        self._scopes.append(scope)
+        depth, self._loop_depth = self._loop_depth, 0
+        try:
+            for stmt in node.body:
+                self.visit(stmt)
+        finally:
+            self._loop_depth = depth
+            self._scopes.pop()
+        if scope.self_calls:
+            self.detected.append("재귀 사용")
+            self._recursive.append((node, scope.self_calls))
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+
+    # --- statements / expressions --------------------------------------
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.visit(node.value)
+        for target in node.targets:
+            if (
+                self._loop_depth
+                and isinstance(target, ast.Name)
+                and isinstance(node.value, ast.BinOp)
+                and isinstance(node.value.op, ast.Add)
+                and isinstance(node.value.left, ast.Name)
+                and node.value.left.id == target.id
+                and self._kind_of(target.id) == "str"
+            ):
+                self._add("str-concat-in-loop", node)
+                continue
+            self._bind(target, node.value)
+            if not isinstance(target, ast.Name):
+                self.visit(target)
+
+    def visit_AnnAssign(self, node: ast.AnnAssign) -> None:
+        if node.value is not None:
+            self.visit(node.value)
+            self._bind(node.target, node.value)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:
+        self.visit(node.value)
+        if (
+            self._loop_depth
+            and isinstance(node.op, ast.Add)
+            and isinstance(node.target, ast.Name)
+            and (self._kind_of(node.target.id) == "str" or _value_kind(node.value) == "str")
+            and self._kind_of(node.target.id) != "list"
+        ):
+            self._add("str-concat-in-loop", node)
+
+    def visit_Compare(self, node: ast.Compare) -> None:
+        self.generic_visit(node)
+        if not self._loop_depth:
+            return
+        for op, right in zip(node.ops, node.comparators):
+            if not isinstance(op, (ast.In, ast.NotIn)):
+                continue
+            if isinstance(right, ast.Name) and self._kind_of(right.id) == "list":
+                self._add("list-membership", node)
+            elif isinstance(right, ast.ListComp) or (
+                isinstance(right, ast.Call) and _value_kind(right) == "list"
+            ):
+                self._add("list-membership", node)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        self.generic_visit(node)
+        func = node.func
+        name = _call_name(func)
+
+        if name == "input" and isinstance(func, ast.Name):
+            self._reads_input = True
+            if self._loop_depth:
+                self._add("input-in-loop", node)
+        elif name in {"readline", "read", "readlines"} and "stdin" in ast.dump(func):
+            self._reads_input = True
+        elif name == "print" or (name == "write" and "stdout" in ast.dump(func)):
+            self._writes_output = True
+        elif name == "setrecursionlimit":
+            self._has_recursion_limit = True
+
+        if isinstance(func, ast.Name) and func.id.lower() in {"bfs", "dfs"}:
+            self.detected.append(f"{func.id.upper()} 호출 감지")
+
+        if isinstance(func, ast.Attribute) and self._loop_depth:
+            if (
+                func.attr == "pop"
+                and len(node.args) == 1
+                and isinstance(node.args[0], ast.Constant)
+                and node.args[0].value == 0
+            ) or (
+                func.attr == "insert"
+                and node.args
+                and isinstance(node.args[0], ast.Constant)
+                and node.args[0].value == 0
+            ):
+                owner = func.value
+                if not (isinstance(owner, ast.Name) and self._kind_of(owner.id) == "other"):
+                    self._add("list-pop-front", node)
+
+        scope = self._scopes[-1]
+        if scope.name is not None and (
+            (isinstance(func, ast.Name) and func.id == scope.name)
+            or (
+                isinstance(func, ast.Attribute)
+                and func.attr == scope.name
+                and isinstance(func.value, ast.Name)
+                and func.value.id in {"self", "cls"}
+            )
+        ):
+            scope.self_calls += 1
+
+    # --- results -------------------------------------------------------
+
+    def finish(self) -> None:
+        for func, self_calls in self._recursive:
+            if not self._has_recursion_limit:
+                self._add("deep-recursion", func)
+            if self_calls >= 2 and not _is_memoized(func):
+                self._add("unmemoized-recursion", func)
+        if self._reads_input and not self._writes_output:
+            self.warnings.append("입력을 받지만 출력을 하지 않을 수 있습니다. 출력 로직을 확인하세요.")
+        self.findings.sort(key=lambda f: (f.line, f.rule))
+
+    @property
+    def complexity_estimate(self) -> str:
+        if self.total_loops >= 2:
+            return "O(n^2) 이상 가능성"
+        if self.total_loops == 1:
+            return "O(n)~O(n log n) 가능성"
+        return "O(n) 또는 더 낮음"
+
+
+def _is_memoized(func: Union[ast.FunctionDef, ast.AsyncFunctionDef]) -> bool:
+    """@cache/@lru_cache, or a dict memo that is both checked with `in` and written by subscript."""
+    if any(_call_name(d) in _MEMO_DECORATORS for d in func.decorator_list):
+        return True
+    checked: Set[str] = set()
+    stored: Set[str] = set()
+    for node in ast.walk(func):
+        if isinstance(node, ast.Compare) and any(isinstance(op, (ast.In, ast.NotIn)) for op in node.ops):
+            checked.update(c.id for c in node.comparators if isinstance(c, ast.Name))
+        elif isinstance(node, ast.Subscript) and isinstance(node.ctx, ast.Store) and isinstance(node.value, ast.Name):
+            stored.add(node.value.id)
+        elif isinstance(node, ast.Call) and _call_name(node) == "get" and isinstance(node.func, ast.Attribute):
+            if isinstance(node.func.value, ast.Name):
+                checked.add(node.func.value.id)
+    return bool(checked & stored)
+
+
+def analyze_tree(tree: ast.AST) -> PerfAnalyzer:
+    analyzer = PerfAnalyzer()
+    analyzer.visit(tree)
+    analyzer.finish()
+    return analyzer
@@ -0,0 +1,341 @@
+"""Transcription backend chain with per-backend health tracking.
+
+The audio is read once into an ``AudioBuffer`` (or used in place when it is already in
+memory). Each backend in the chain receives the same bytes: OpenAI models stream them as
+the upload, and local models get a path (the original file, or a temp file written from
+the buffer and always removed afterwards).
+
+Every backend has a circuit breaker. After ``failure_threshold`` consecutive failures it
+is skipped for ``cooldown_sec``; after that, a single trial request decides whether it is
+closed again. Backends whose smoothed real-time factor (seconds of work per second of
+audio) exceeds ``slow_rtf`` are tried after the healthy, fast ones. Each call reports which
+backend served it, how long it took, and every attempt that failed or was skipped.
+
+    JOB_TUTOR_STT_CHAIN=openai:whisper-1,openai:gpt-4o-mini-transcribe,whisper,faster-whisper
+"""
+from __future__ import annotations
+
+import contextlib
+import os
+import tempfile
+import threading
+import time
+import wave
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterator, List, Optional, Sequence, Union
+
+from .audio import AudioSource, MemoryReader, as_buffer, open_wav
+from .llm import get_provider
+from .stt_models import TranscriptSegment, backend_installed, get_stt_manager
+
+
+# whisper-1 first: it is the OpenAI model that returns segment timestamps.
+DEFAULT_CHAIN = ("openai:whisper-1", "openai:gpt-4o-mini-transcribe", "whisper", "faster-whisper")
+FAILURE_THRESHOLD = 3
+COOLDOWN_SEC = 30.0
+SLOW_RTF = 1.5
+EWMA_ALPHA = 0.3
+# Remote requests time out after this many seconds plus this much per second of audio.
+API_TIMEOUT_BASE_SEC = 30.0
+API_TIMEOUT_PER_AUDIO_SEC = 1.0
+
+
+@dataclass
+class AudioBuffer:
+    """Audio bytes read at most once and shared by every backend attempt.
+
+    Built from a path, the file is read on the first upload only; a local model given the
+    path never reads it here. Built from a buffer (e.g. a memoryview of an upload), the
+    bytes are used in place and uploads stream from them without a copy.
+    """
+
+    data: Optional[Union[bytes, memoryview]] = None
+    filename: str = "audio.wav"
+    path: Optional[str] = None  # a file on disk with the same content, if there is one
+
+    @classmethod
+    def from_file(cls, file_path: str) -> "AudioBuffer":
+        return cls(None, os.path.basename(file_path), file_path)
+
+    @classmethod
+    def from_source(cls, source: AudioSource, filename: str = "audio.wav") -> "AudioBuffer":
+        source = as_buffer(source)
+        if isinstance(source, memoryview):
+            return cls(source, filename)
+        return cls.from_file(os.fspath(source))
+
+    def view(self) -> memoryview:
+        if self.data is None:
+            with open(self.path or "", "rb") as f:
+                self.data = f.read()
+        return memoryview(self.data)
+
+    def reader(self) -> MemoryReader:
+        """A fresh file object over the bytes (one per upload attempt)."""
+        return MemoryReader(self.view())
+
+    @property
+    def duration_sec(self) -> Optional[float]:
+        source: AudioSource = self.view() if self.data is not None or self.path is None else self.path
+        try:
+            with open_wav(source) as wf:
+                return wf.getnframes() / float(wf.getframerate() or 1)
+        except (OSError, wave.Error, EOFError):
+            return None
+
+    @contextlib.contextmanager
+    def as_path(self) -> Iterator[str]:
+        """Yield a file path holding the audio; a temp file is removed on exit, even on error."""
+        if self.path is not None and os.path.exists(self.path):
+            yield self.path
+            return
+        suffix = os.path.splitext(self.filename)[1] or ".wav"
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self.view())
+            yield tmp_path
+        finally:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+
+
+@dataclass
+class BackendHealth:
+    state: str = "closed"  # closed / open / half-open
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ewma_latency_sec: Optional[float] = None
+    ewma_rtf: Optional[float] = None
+    open_until: float = 0.0  # monotonic time
+    last_error: Optional[str] = None
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown_sec: float = COOLDOWN_SEC,
+        slow_rtf: float = SLOW_RTF,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+        self.slow_rtf = slow_rtf
+        self.health = BackendHealth()
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a request may go to this backend now (claims the half-open trial slot)."""
+        with self._lock:
+            h = self.health
+            if h.state == "open" and time.monotonic() >= h.open_until:
+                h.state = "half-open"
+            if h.state == "closed":
+                return True
+            if h.state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self.health.state == "open" and time.monotonic() < self.health.open_until
+
+    @property
+    def slow(self) -> bool:
+        h = self.health
+        return h.ewma_rtf is not None and h.successes >= 3 and h.ewma_rtf > self.slow_rtf
+
+    def record_success(self, elapsed_sec: float, audio_sec: Optional[float]) -> None:
+        with self._lock:
+            h = self.health
+            h.successes += 1
+            h.consecutive_failures = 0
+            h.state = "closed"
+            self._trial_in_flight = False
+            h.ewma_latency_sec = _ewma(h.ewma_latency_sec, elapsed_sec)
+            if audio_sec:
+                h.ewma_rtf = _ewma(h.ewma_rtf, elapsed_sec / audio_sec)
+
+    def record_failure(self, error: str) -> None:
+        with self._lock:
+            h = self.health
+            h.failures += 1
+            h.consecutive_failures += 1
+            h.last_error = error
+            if h.state == "half-open" or h.consecutive_failures >= self.failure_threshold:
+                h.state = "open"
+                h.open_until = time.monotonic() + self.cooldown_sec
+            self._trial_in_flight = False
+
+    def snapshot(self) -> BackendHealth:
+        with self._lock:
+            return replace(self.health)
+
+
+def _ewma(previous: Optional[float], value: float) -> float:
+    return value if previous is None else (1 - EWMA_ALPHA) * previous + EWMA_ALPHA * value
+
+
+class TranscriptionBackend:
+    name: str = ""
+    remote: bool = False
+
+    def available(self) -> bool:
+        raise NotImplementedError
+
+    def transcribe(self, audio: AudioBuffer, language: Optional[str]) -> List[TranscriptSegment]:
+        """Segments relative to the start of ``audio`` (empty for silence); raises on failure."""
+        raise NotImplementedError
+
+
+class OpenAITranscriptionBackend(TranscriptionBackend):
+    remote = True
+
+    def __init__(self, model: str):
+        self.model = model
+        self.name = f"openai:{model}"
+
+    def available(self) -> bool:
+        return get_provider().enabled
+
+    def transcribe(self, audio: AudioBuffer, language: Optional[str]) -> List[TranscriptSegment]:
+        duration = audio.duration_sec
+        timeout = API_TIMEOUT_BASE_SEC + API_TIMEOUT_PER_AUDIO_SEC * (duration or 0.0)
+        segments = get_provider().transcribe_segments(
+            audio.reader(),
+            audio.filename,
+            model=self.model,
+            language=language,
+            timeout_sec=timeout,
+            max_retries=0,  # the chain fails over instead of re-uploading to the same model
+            raise_errors=True,
+        ) or []
+        end = duration or 0.0
+        return [TranscriptSegment(start, e if e is not None else end, text) for start, e, text in segments if text]
+
+
+class LocalTranscriptionBackend(TranscriptionBackend):
+    def __init__(self, backend: str):
+        self.name = backend
+
+    def available(self) -> bool:
+        return backend_installed(self.name)
+
+    def transcribe(self, audio: AudioBuffer, language: Optional[str]) -> List[TranscriptSegment]:
+        with audio.as_path() as path:
+            result = get_stt_manager().transcribe(path, language=language, backends=(self.name,), allow_empty=True)
+        if result is None:
+            raise RuntimeError(f"{self.name} failed to load or run")
+        return result.segments
+
+
+def make_backend(name: str) -> TranscriptionBackend:
+    if name.startswith("openai:"):
+        return OpenAITranscriptionBackend(name.split(":", 1)[1])
+    return LocalTranscriptionBackend(name)
+
+
+@dataclass
+class Attempt:
+    backend: str
+    ok: bool
+    elapsed_sec: float
+    error: Optional[str] = None  # "circuit open" when skipped
+
+
+@dataclass
+class ChainResult:
+    segments: List[TranscriptSegment]
+    backend: Optional[str]  # backend that served the request; None if every attempt failed
+    elapsed_sec: float  # time spent in that backend
+    total_sec: float  # including failed attempts
+    attempts: List[Attempt] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return " ".join(seg.text for seg in self.segments).strip()
+
+
+class TranscriptionChain:
+    def __init__(
+        self,
+        backends: Sequence[TranscriptionBackend],
+        failure_threshold: int = FAILURE_THRESHOLD,
+        cooldown_sec: float = COOLDOWN_SEC,
+        slow_rtf: float = SLOW_RTF,
+    ):
+        self.backends = list(backends)
+        self.breakers: Dict[str, CircuitBreaker] = {
+            b.name: CircuitBreaker(failure_threshold, cooldown_sec, slow_rtf) for b in self.backends
+        }
+
+    def candidates(self, remote: Optional[bool] = None) -> List[TranscriptionBackend]:
+        """Available backends in try order: configured order, slow ones moved to the end."""
+        usable = [
+            b for b in self.backends
+            if (remote is None or b.remote == remote) and b.available()
+        ]
+        return sorted(usable, key=lambda b: self.breakers[b.name].slow)
+
+    def preferred(self, remote: Optional[bool] = None) -> Optional[TranscriptionBackend]:
+        """First candidate whose circuit is not open (without claiming a trial)."""
+        for b in self.candidates(remote):
+            if not self.breakers[b.name].is_open:
+                return b
+        return None
+
+    def transcribe(
+        self,
+        audio: AudioBuffer,
+        language: Optional[str] = "ko",
+        remote: Optional[bool] = None,
+    ) -> ChainResult:
+        """Try backends in order until one succeeds (``backend`` is None if none did).
+
+        A backend that answers with no segments heard no speech: that is a successful,
+        empty result, not a failure, so silent recordings never open a breaker.
+        """
+        started = time.perf_counter()
+        duration = audio.duration_sec
+        attempts: List[Attempt] = []
+        for backend in self.candidates(remote):
+            breaker = self.breakers[backend.name]
+            if not breaker.allow():
+                attempts.append(Attempt(backend.name, False, 0.0, "circuit open"))
+                continue
+            t0 = time.perf_counter()
+            try:
+                segments = backend.transcribe(audio, language)
+            except Exception as e:
+                elapsed = time.perf_counter() - t0
+                error = f"{type(e).__name__}: {e}"[:200]
+                breaker.record_failure(error)
+                attempts.append(Attempt(backend.name, False, round(elapsed, 3), error))
+                continue
+            elapsed = time.perf_counter() - t0
+            breaker.record_success(elapsed, duration)
+            attempts.append(Attempt(backend.name, True, round(elapsed, 3)))
+            return ChainResult(segments, backend.name, round(elapsed, 3), round(time.perf_counter() - started, 3), attempts)
+        return ChainResult([], None, 0.0, round(time.perf_counter() - started, 3), attempts)
+
+    def health(self) -> Dict[str, BackendHealth]:
+        return {name: breaker.snapshot() for name, breaker in self.breakers.items()}
+
+
+_chain: Optional[TranscriptionChain] = None
+_chain_lock = threading.Lock()
+
+
+def get_transcription_chain() -> TranscriptionChain:
+    """Process-wide chain (breaker state is shared by every request in the process)."""
+    global _chain
+    with _chain_lock:
+        if _chain is None:
+            configured = os.environ.get("JOB_TUTOR_STT_CHAIN")
+            names = [n.strip() for n in configured.split(",") if n.strip()] if configured else list(DEFAULT_CHAIN)
+            _chain = TranscriptionChain([make_backend(n) for n in names])
+        return _chain
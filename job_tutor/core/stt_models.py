@@ -0,0 +1,324 @@
+"""Local speech-to-text models, loaded once per process and kept warm.
+
+Loading Whisper weights takes seconds (more for larger sizes), often longer than
+transcribing a short interview answer. ``get_stt_manager()`` keeps one model instance per
+(backend, size, device, compute type) for the lifetime of the process, so only the first
+transcription pays for the load; Streamlit reruns and later uploads reuse it.
+
+Defaults come from the environment and can be changed at runtime with ``configure``:
+
+    JOB_TUTOR_STT_MODEL=base          # tiny / base / small / medium / large-v3
+    JOB_TUTOR_STT_COMPUTE_TYPE=int8   # faster-whisper only: int8 / int16 / float32
+    JOB_TUTOR_STT_DEVICE=cpu
+    JOB_TUTOR_STT_PRELOAD=1           # load the model when the app starts
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+# Tried in this order; the first backend that loads and returns text wins.
+BACKENDS = ("whisper", "faster-whisper")
+MODEL_SIZES = ("tiny", "base", "small", "medium", "large-v3")
+COMPUTE_TYPES = ("int8", "int16", "float32")
+DEFAULT_SIZE = "base"
+DEFAULT_COMPUTE_TYPE = "int8"
+DEFAULT_DEVICE = "cpu"
+_MODULES = {"whisper": "whisper", "faster-whisper": "faster_whisper"}
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    backend: str
+    size: str = DEFAULT_SIZE
+    device: str = DEFAULT_DEVICE
+    compute_type: str = DEFAULT_COMPUTE_TYPE
+
+    @property
+    def label(self) -> str:
+        return f"{self.backend}:{self.size} ({self.device}, {self.compute_type})"
+
+
+@dataclass
+class ModelTimings:
+    load_sec: Optional[float] = None
+    first_sec: Optional[float] = None  # first transcription after the load (includes warm-up)
+    calls: int = 0
+    total_sec: float = 0.0
+    last_sec: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def warm_mean_sec(self) -> Optional[float]:
+        """Mean duration of the transcriptions after the first one."""
+        if self.calls < 2 or self.first_sec is None:
+            return None
+        return round((self.total_sec - self.first_sec) / (self.calls - 1), 3)
+
+
+@dataclass
+class TranscriptSegment:
+    start_sec: float
+    end_sec: float
+    text: str
+
+
+@dataclass
+class LocalTranscript:
+    text: str
+    spec: ModelSpec
+    load_sec: float  # 0 when the model was already warm
+    transcribe_sec: float
+    first: bool  # first transcription served by this model instance
+    segments: List[TranscriptSegment] = field(default_factory=list)
+
+
+Loader = Callable[[ModelSpec], Any]
+Runner = Callable[[Any, str, Optional[str]], List[TranscriptSegment]]
+
+
+@dataclass(frozen=True)
+class _Backend:
+    load: Loader
+    run: Runner
+    thread_safe: bool  # False: transcriptions on one instance are serialized
+
+
+def _load_whisper(spec: ModelSpec) -> Any:
+    import whisper  # type: ignore
+
+    return whisper.load_model(spec.size, device=spec.device)
+
+
+def _run_whisper(model: Any, path: str, language: Optional[str]) -> List[TranscriptSegment]:
+    result = model.transcribe(path, fp16=False, language=language)
+    if not isinstance(result, dict):
+        return []
+    return [
+        TranscriptSegment(float(seg["start"]), float(seg["end"]), str(seg["text"]).strip())
+        for seg in result.get("segments") or []
+        if str(seg.get("text") or "").strip()
+    ]
+
+
+def _load_faster_whisper(spec: ModelSpec) -> Any:
+    from faster_whisper import WhisperModel  # type: ignore
+
+    return WhisperModel(spec.size, device=spec.device, compute_type=spec.compute_type)
+
+
+def _run_faster_whisper(model: Any, path: str, language: Optional[str]) -> List[TranscriptSegment]:
+    segments, _info = model.transcribe(path, language=language)
+    # ``segments`` is a lazy generator: decoding happens while it is consumed.
+    return [TranscriptSegment(float(seg.start), float(seg.end), seg.text.strip()) for seg in segments if seg.text.strip()]
+
+
+_backends: Dict[str, _Backend] = {
+    "whisper": _Backend(_load_whisper, _run_whisper, thread_safe=False),
+    "faster-whisper": _Backend(_load_faster_whisper, _run_faster_whisper, thread_safe=True),
+}
+
+
+def register_backend(name: str, load: Loader, run: Runner, thread_safe: bool = False) -> None:
+    """Add or replace a local backend (e.g. a different runtime or a stub for benchmarks)."""
+    _backends[name] = _Backend(load, run, thread_safe)
+
+
+def backend_installed(backend: str) -> bool:
+    module = _MODULES.get(backend)
+    if module is None:
+        return backend in _backends
+    return importlib.util.find_spec(module) is not None
+
+
+class STTModelManager:
+    """Process-wide cache of loaded local STT models.
+
+    Each spec is loaded at most once: concurrent first callers wait on a per-spec lock
+    instead of loading the weights twice, and a load that fails (package missing, unknown
+    size, out of memory) is remembered so later calls skip it immediately. openai-whisper
+    runs in float32 on CPU; ``compute_type`` applies to faster-whisper.
+    """
+
+    def __init__(
+        self,
+        size: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        device: Optional[str] = None,
+        backends: Sequence[str] = BACKENDS,
+    ):
+        self.size = size or os.environ.get("JOB_TUTOR_STT_MODEL") or DEFAULT_SIZE
+        self.compute_type = compute_type or os.environ.get("JOB_TUTOR_STT_COMPUTE_TYPE") or DEFAULT_COMPUTE_TYPE
+        self.device = device or os.environ.get("JOB_TUTOR_STT_DEVICE") or DEFAULT_DEVICE
+        self.backends = tuple(backends)
+        self._lock = threading.Lock()
+        self._spec_locks: Dict[ModelSpec, threading.Lock] = {}
+        self._models: Dict[ModelSpec, Any] = {}
+        self._failed: Dict[ModelSpec, str] = {}
+        self._timings: Dict[ModelSpec, ModelTimings] = {}
+
+    def configure(
+        self,
+        size: Optional[str] = None,
+        compute_type: Optional[str] = None,
+        device: Optional[str] = None,
+    ) -> None:
+        """Change the defaults for later calls; already loaded models stay cached until ``unload``."""
+        with self._lock:
+            self.size = size or self.size
+            self.compute_type = compute_type or self.compute_type
+            self.device = device or self.device
+
+    def spec(self, backend: str) -> ModelSpec:
+        with self._lock:
+            spec = ModelSpec(backend, self.size, self.device, self.compute_type)
+        if backend == "whisper":
+            spec = replace(spec, compute_type="float32")
+        return spec
+
+    def available(self) -> List[str]:
+        """Configured backends whose package is installed."""
+        return [b for b in self.backends if b in _backends and backend_installed(b)]
+
+    def _spec_lock(self, spec: ModelSpec) -> threading.Lock:
+        with self._lock:
+            return self._spec_locks.setdefault(spec, threading.Lock())
+
+    def _timing(self, spec: ModelSpec) -> ModelTimings:
+        with self._lock:
+            return self._timings.setdefault(spec, ModelTimings())
+
+    def load(self, spec: ModelSpec) -> Tuple[Optional[Any], float]:
+        """Return (model, seconds spent loading now); (None, 0) if the spec cannot be loaded."""
+        with self._lock:
+            model = self._models.get(spec)
+            if model is not None or spec in self._failed:
+                return model, 0.0
+        backend = _backends.get(spec.backend)
+        if backend is None:
+            return None, 0.0
+        with self._spec_lock(spec):
+            with self._lock:  # another caller may have finished loading while we waited
+                model = self._models.get(spec)
+                if model is not None or spec in self._failed:
+                    return model, 0.0
+            timing = self._timing(spec)
+            started = time.perf_counter()
+            try:
+                model = backend.load(spec)
+            except Exception as e:
+                with self._lock:
+                    self._failed[spec] = f"{type(e).__name__}: {e}"
+                    timing.error = self._failed[spec]
+                return None, 0.0
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._models[spec] = model
+                timing.load_sec = round(elapsed, 3)
+            return model, elapsed
+
+    def transcribe(
+        self,
+        file_path: str,
+        language: Optional[str] = "ko",
+        backends: Optional[Sequence[str]] = None,
+        allow_empty: bool = False,
+    ) -> Optional[LocalTranscript]:
+        """Transcribe with the first backend that loads and returns text; None if none does.
+
+        With ``allow_empty``, a backend that runs but hears no speech returns an empty
+        transcript instead of passing the file to the next one.
+        """
+        for name in backends or self.backends:
+            if not backend_installed(name):
+                continue
+            spec = self.spec(name)
+            model, load_sec = self.load(spec)
+            if model is None:
+                continue
+            backend = _backends[name]
+            started = time.perf_counter()
+            try:
+                if backend.thread_safe:
+                    segments = backend.run(model, file_path, language)
+                else:
+                    with self._spec_lock(spec):
+                        segments = backend.run(model, file_path, language)
+            except Exception as e:
+                self._timing(spec).error = f"{type(e).__name__}: {e}"
+                continue
+            elapsed = time.perf_counter() - started
+            timing = self._timing(spec)
+            with self._lock:
+                first = timing.calls == 0
+                timing.calls += 1
+                timing.total_sec += elapsed
+                timing.last_sec = round(elapsed, 3)
+                if first:
+                    timing.first_sec = round(elapsed, 3)
+            text = " ".join(seg.text for seg in segments).strip()
+            if text or allow_empty:
+                return LocalTranscript(text, spec, round(load_sec, 3), round(elapsed, 3), first, segments)
+        return None
+
+    def preload(self, background: bool = True) -> Optional[threading.Thread]:
+        """Load the first installed backend's model now, so the first upload does not wait for it.
+
+        With ``background=True`` the load runs on a daemon thread (returned); a transcription
+        that arrives meanwhile waits on the same per-spec lock rather than loading again.
+        """
+
+        def run() -> None:
+            for name in self.available():
+                model, _ = self.load(self.spec(name))
+                if model is not None:
+                    return
+
+        if not background:
+            run()
+            return None
+        thread = threading.Thread(target=run, name="stt-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def unload(self, spec: Optional[ModelSpec] = None) -> None:
+        """Drop one (or every) cached model and its failure record; the next call reloads it."""
+        with self._lock:
+            specs = [spec] if spec is not None else list(self._models) + list(self._failed)
+            for s in specs:
+                self._models.pop(s, None)
+                self._failed.pop(s, None)
+                self._timings.pop(s, None)
+
+    def loaded(self) -> List[ModelSpec]:
+        with self._lock:
+            return list(self._models)
+
+    def stats(self) -> List[Tuple[ModelSpec, ModelTimings]]:
+        with self._lock:
+            return [(spec, replace(t)) for spec, t in self._timings.items()]
+
+
+_manager: Optional[STTModelManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_stt_manager() -> STTModelManager:
+    """Return the process-wide manager, created on first use from the environment."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = STTModelManager()
+        return _manager
+
+
+def preload_from_env() -> Optional[threading.Thread]:
+    """Start a background preload when ``JOB_TUTOR_STT_PRELOAD`` is set to a true value."""
+    if os.environ.get("JOB_TUTOR_STT_PRELOAD", "").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    return get_stt_manager().preload(background=True)
@@ -0,0 +1,324 @@
+"""Chunked, parallel transcription of long interview recordings.
+
+A single upload of a long practice session hits the API's 25 MB limit and a single local
+decode runs serially for minutes. ``transcribe_recording`` instead:
+
+1. finds pauses in one streaming pass (``audio.analyze_speech_activity``) and cuts the
+   recording at pauses near ``target_sec`` (hard cut at ``max_sec`` if nobody pauses),
+2. pads every chunk with ``overlap_sec`` of audio on each side so words cut at a boundary
+   appear whole in at least one chunk,
+3. transcribes chunks concurrently through the backend chain (``stt_chain``): a thread
+   pool when the preferred backend is the OpenAI API (I/O bound), a process pool for
+   local Whisper models (CPU bound; each worker keeps its model warm),
+4. shifts segment timestamps by the chunk offset and stitches them: a segment belongs to
+   the chunk whose cut range contains its midpoint, and words repeated at the seam of
+   text-only segments are dropped.
+"""
+from __future__ import annotations
+
+import atexit
+import bisect
+import os
+import re
+import struct
+import threading
+import time
+import wave
+from collections import Counter
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+from .audio import AudioSource, PauseSegment, analyze_speech_activity, as_buffer, open_wav
+from .stt_chain import Attempt, AudioBuffer, get_transcription_chain
+from .stt_models import TranscriptSegment, get_stt_manager
+
+
+CHUNK_TARGET_SEC = 45.0
+CHUNK_MAX_SEC = 60.0
+CHUNK_OVERLAP_SEC = 1.0
+# The API rejects files over 25 MB; keep chunks comfortably below it.
+API_MAX_BYTES = 24 * 1024 * 1024
+API_WORKERS = 4
+# Longest run of repeated words looked for at a chunk seam.
+SEAM_MAX_WORDS = 8
+_WORD_NORMALIZE = re.compile(r"[^\w]+")
+
+
+@dataclass
+class AudioChunk:
+    index: int
+    start_sec: float  # audio sent, including overlap
+    end_sec: float
+    cut_start_sec: float  # segments whose midpoint falls in [cut_start, cut_end) are kept
+    cut_end_sec: float
+
+
+@dataclass
+class ChunkResult:
+    index: int
+    backend: Optional[str]  # backend that served the chunk; None if it failed everywhere
+    elapsed_sec: float
+    attempts: List[Attempt] = field(default_factory=list)
+
+
+@dataclass
+class Transcript:
+    text: str
+    segments: List[TranscriptSegment]
+    backend: str  # backend that served most chunks
+    chunks: int
+    failed_chunks: List[int] = field(default_factory=list)
+    elapsed_sec: float = 0.0
+    audio_sec: float = 0.0
+    served: List[ChunkResult] = field(default_factory=list)
+
+
+def plan_chunks(
+    duration_sec: float,
+    pauses: Sequence[PauseSegment],
+    target_sec: float = CHUNK_TARGET_SEC,
+    max_sec: float = CHUNK_MAX_SEC,
+    overlap_sec: float = CHUNK_OVERLAP_SEC,
+) -> List[AudioChunk]:
+    """Cut points at the longest pause in ``[pos + target/2, pos + max]``, else at ``pos + max``."""
+    mids = [(p.start_sec + p.end_sec) / 2.0 for p in pauses]
+    cuts = [0.0]
+    pos = 0.0
+    while duration_sec - pos > max_sec:
+        lo = bisect.bisect_left(mids, pos + target_sec / 2.0)
+        hi = bisect.bisect_right(mids, pos + max_sec)
+        if lo < hi:
+            best = max(range(lo, hi), key=lambda i: (pauses[i].duration_sec, -abs(mids[i] - pos - target_sec)))
+            pos = mids[best]
+        else:
+            pos += max_sec
+        cuts.append(round(pos, 3))
+    cuts.append(duration_sec)
+    return [
+        AudioChunk(
+            index=i,
+            start_sec=max(0.0, round(a - overlap_sec, 3)),
+            end_sec=min(duration_sec, round(b + overlap_sec, 3)),
+            cut_start_sec=a,
+            cut_end_sec=b,
+        )
+        for i, (a, b) in enumerate(zip(cuts, cuts[1:]))
+    ]
+
+
+def _wav_header(channels: int, sampwidth: int, rate: int, data_bytes: int) -> bytes:
+    """44-byte PCM WAV header."""
+    block = channels * sampwidth
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF", 36 + data_bytes, b"WAVE",
+        b"fmt ", 16, 1, channels, rate, rate * block, block, sampwidth * 8,
+        b"data", data_bytes,
+    )
+
+
+def read_wav_slice(source: AudioSource, start_sec: float, end_sec: float) -> bytes:
+    """A standalone WAV (header + PCM) holding ``[start_sec, end_sec)`` of ``source``."""
+    with open_wav(source) as wf:
+        rate = wf.getframerate()
+        first = int(start_sec * rate)
+        count = max(0, int(end_sec * rate) - first)
+        wf.setpos(min(first, wf.getnframes()))
+        frames = wf.readframes(count)
+        header = _wav_header(wf.getnchannels(), wf.getsampwidth(), rate, len(frames))
+    return header + frames
+
+
+def _normalized_words(text: str) -> List[str]:
+    return [_WORD_NORMALIZE.sub("", w).lower() for w in text.split()]
+
+
+def _drop_repeated_prefix(previous: str, text: str, max_words: int = SEAM_MAX_WORDS) -> str:
+    """Remove the longest run of words that ends ``previous`` and also starts ``text``."""
+    prev = _normalized_words(previous)[-max_words:]
+    words = text.split()
+    head = _normalized_words(" ".join(words[:max_words]))
+    # Never drop the whole segment: identical consecutive sentences can be genuine.
+    for k in range(min(len(prev), len(head), len(words) - 1), 0, -1):
+        if prev[-k:] == head[:k] and any(head[:k]):
+            return " ".join(words[k:])
+    return text
+
+
+def stitch_segments(
+    chunks: Sequence[AudioChunk],
+    results: Sequence[Optional[List[TranscriptSegment]]],
+) -> List[TranscriptSegment]:
+    """Merge per-chunk segments (already in absolute time) into one ordered list."""
+    merged: List[TranscriptSegment] = []
+    last = len(chunks) - 1
+    for chunk, segments in zip(chunks, results):
+        for seg in segments or []:
+            mid = (seg.start_sec + seg.end_sec) / 2.0
+            owned = chunk.cut_start_sec <= mid < chunk.cut_end_sec or (chunk.index == last and mid >= chunk.cut_start_sec)
+            if not owned:
+                continue
+            text = seg.text
+            if merged and seg.start_sec < merged[-1].end_sec:
+                # Overlapping audio transcribed twice: drop the words already emitted.
+                text = _drop_repeated_prefix(merged[-1].text, text)
+            if text:
+                merged.append(TranscriptSegment(round(seg.start_sec, 3), round(seg.end_sec, 3), text))
+    return merged
+
+
+def _shift(
+    segments: Sequence[Tuple[float, Optional[float], str]],
+    chunk: AudioChunk,
+) -> List[TranscriptSegment]:
+    offset = chunk.start_sec
+    return [
+        TranscriptSegment(offset + start, offset + (end if end is not None else chunk.end_sec - chunk.start_sec), text)
+        for start, end, text in segments
+        if text
+    ]
+
+
+def _chunk_job(
+    source: AudioSource,
+    chunk: AudioChunk,
+    language: Optional[str],
+    remote: Optional[bool],
+    whole_file: bool = False,
+) -> Tuple[Optional[List[TranscriptSegment]], ChunkResult]:
+    """Transcribe one chunk through this process's backend chain.
+
+    The whole recording is passed through untouched (path or in-memory view); a chunk is
+    sliced into its own small WAV buffer.
+    """
+    if whole_file:
+        audio = AudioBuffer.from_source(source)
+    else:
+        audio = AudioBuffer(read_wav_slice(source, chunk.start_sec, chunk.end_sec), f"chunk-{chunk.index}.wav")
+    result = get_transcription_chain().transcribe(audio, language, remote=remote)
+    if result.backend is None:
+        return None, ChunkResult(chunk.index, None, 0.0, result.attempts)
+    segments = _shift([(s.start_sec, s.end_sec, s.text) for s in result.segments], chunk)
+    return segments, ChunkResult(chunk.index, result.backend, result.elapsed_sec, result.attempts)
+
+
+def _init_local_worker(size: str, compute_type: str, device: str) -> None:
+    manager = get_stt_manager()
+    manager.configure(size=size, compute_type=compute_type, device=device)
+    manager.preload(background=False)
+
+
+# One pool of local-model workers per configuration, reused across recordings so each
+# worker process loads its model once (same idea as the sandbox pool).
+_local_pool: Optional[ProcessPoolExecutor] = None
+_local_pool_key: Optional[Tuple[str, str, str, int]] = None
+_local_pool_lock = threading.Lock()
+
+
+def _get_local_pool(workers: int) -> ProcessPoolExecutor:
+    global _local_pool, _local_pool_key
+    manager = get_stt_manager()
+    key = (manager.size, manager.compute_type, manager.device, workers)
+    with _local_pool_lock:
+        if _local_pool is None or _local_pool_key != key:
+            if _local_pool is not None:
+                _local_pool.shutdown(wait=False, cancel_futures=True)
+            _local_pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_local_worker, initargs=key[:3])
+            _local_pool_key = key
+        return _local_pool
+
+
+def shutdown_local_pool() -> None:
+    global _local_pool, _local_pool_key
+    with _local_pool_lock:
+        if _local_pool is not None:
+            _local_pool.shutdown(wait=False, cancel_futures=True)
+        _local_pool = None
+        _local_pool_key = None
+
+
+atexit.register(shutdown_local_pool)
+
+
+def transcribe_recording(
+    source: AudioSource,
+    backend: str = "auto",
+    language: Optional[str] = "ko",
+    max_workers: Optional[int] = None,
+    target_sec: float = CHUNK_TARGET_SEC,
+    max_sec: float = CHUNK_MAX_SEC,
+    overlap_sec: float = CHUNK_OVERLAP_SEC,
+) -> Optional[Transcript]:
+    """Transcribe a WAV with per-segment timestamps; None if no backend is available or all chunks fail.
+
+    ``backend`` is ``"openai"``, ``"local"`` or ``"auto"``. Each chunk goes through the
+    backend chain (``stt_chain``), so a failing or slow backend is skipped per chunk and
+    ``Transcript.served`` records who served each one. Recordings no longer than
+    ``max_sec`` are sent as one chunk, and so are WAVs that are not PCM. ``source`` may be a
+    path or an in-memory buffer; buffers are sliced in place and only spilled to a temp file
+    for local models.
+    """
+    started = time.perf_counter()
+    remote = {"openai": True, "local": False}.get(backend)
+    preferred = get_transcription_chain().preferred(remote)
+    if preferred is None:
+        return None
+    use_api = preferred.remote
+
+    source = as_buffer(source)
+    try:
+        with open_wav(source) as wf:
+            bytes_per_sec = wf.getframerate() * wf.getnchannels() * wf.getsampwidth()
+            duration = wf.getnframes() / float(wf.getframerate() or 1)
+            if use_api and bytes_per_sec:
+                max_sec = min(max_sec, API_MAX_BYTES / bytes_per_sec - 2 * overlap_sec)
+                target_sec = min(target_sec, max_sec)
+            if duration > max_sec:
+                wf.rewind()
+                pauses = analyze_speech_activity(wf).pauses
+            else:
+                pauses = []
+    except (wave.Error, EOFError):
+        # Not a PCM WAV the ``wave`` module can read (e.g. IEEE float): it cannot be scanned
+        # for pauses or sliced, so the backends get the file as it is, in one piece.
+        duration = 0.0
+        chunks = [AudioChunk(0, 0.0, 0.0, 0.0, 0.0)]
+    else:
+        chunks = plan_chunks(duration, pauses, target_sec, max_sec, overlap_sec)
+    whole = len(chunks) == 1
+
+    if use_api:
+        workers = min(len(chunks), max_workers or API_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stt-api") as pool:
+            outcomes = list(pool.map(lambda c: _chunk_job(source, c, language, remote, whole), chunks))
+    else:
+        workers = min(len(chunks), max_workers if max_workers is not None else max(1, (os.cpu_count() or 1) // 2))
+        if workers <= 1:
+            # In-process: reuses the warm model of this process, no worker start-up.
+            outcomes = [_chunk_job(source, c, language, False, whole) for c in chunks]
+        else:
+            # Worker processes need a path: an in-memory recording is written to one temp
+            # file for the duration of the run (removed even if a worker fails).
+            n = len(chunks)
+            local_pool: Executor = _get_local_pool(workers)
+            with AudioBuffer.from_source(source).as_path() as path:
+                outcomes = list(local_pool.map(_chunk_job, [path] * n, chunks, [language] * n, [False] * n))
+
+    results = [segments for segments, _ in outcomes]
+    served = [info for _, info in outcomes]
+    failed = [c.index for c, r in zip(chunks, results) if r is None]
+    if len(failed) == len(chunks):
+        return None
+    segments = stitch_segments(chunks, results)
+    counts = Counter(info.backend for info in served if info.backend)
+    return Transcript(
+        text=" ".join(seg.text for seg in segments).strip(),
+        segments=segments,
+        backend=counts.most_common(1)[0][0],
+        chunks=len(chunks),
+        failed_chunks=failed,
+        elapsed_sec=round(time.perf_counter() - started, 3),
+        audio_sec=round(duration, 3),
+        served=served,
+    )